@@ -0,0 +1,143 @@
+"""times font autofitting for a board load and a window resize, cold and warm
+
+    python benchmarks/autofit.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QWidget, QGridLayout
+from PyQt6.QtGui import QFontMetrics
+
+from jparty import utils
+from jparty.style import MyLabel
+
+CATEGORIES = [
+    ["POTENT POTABLES", "WORLD CAPITALS", "19TH CENTURY NOVELISTS",
+     "BEFORE & AFTER", "RHYME TIME", "SCIENCE"],
+    ["U.S. PRESIDENTS", "OPERA", "WORDS FROM GREEK",
+     "THE BODY HUMAN", "STARTS WITH \"Q\"", "POP MUSIC"],
+]
+MONIES = [[200, 400, 600, 800, 1000], [400, 800, 1200, 1600, 2000]]
+DISPLAY_SIZES = [(1280, 720), (1920, 1080)]
+
+
+def linear_autofitsize(self, stepsize=1):
+    """the search AutosizeWidget used before, for reference"""
+    font = self.font()
+    ml, mt, mr, md = self.autosize_margins
+    rect = self.rect().adjusted(
+        int(self.width() * ml),
+        int(self.height() * mt),
+        int(-self.width() * mr),
+        int(-self.height() * md),
+    )
+    text = self.plaintext()
+    font.setPixelSize(int(self.initialSize()))
+    size = font.pixelSize()
+
+    def fullrect(font):
+        return QFontMetrics(font).boundingRect(rect, self.flags(), text)
+
+    if not rect.contains(fullrect(font)):
+        while size > 2:
+            size -= stepsize
+            font.setPixelSize(size)
+            if rect.contains(fullrect(font)):
+                return font.pixelSize()
+    return size
+
+
+class Board(QWidget):
+    def __init__(self, size):
+        super().__init__()
+        layout = QGridLayout(self)
+        self.cards = []
+        for row in range(6):
+            for col in range(6):
+                card = MyLabel("", lambda: self.height() * 0.06, self)
+                card.setAutosizeMargins(0.1 if row == 0 else 0.2)
+                layout.addWidget(card, row, col)
+                self.cards.append(card)
+        self.resize(*size)
+        self.show()
+
+    def load(self, r):
+        for col, category in enumerate(CATEGORIES[r]):
+            self.cards[col].setText(category)
+            for row, money in enumerate(MONIES[r]):
+                self.cards[6 * (row + 1) + col].setText(f"${money}")
+
+
+fit_time = 0.0
+
+
+def timed_autoresize(autoresize):
+    def wrapper(self):
+        global fit_time
+        start = time.perf_counter()
+        autoresize(self)
+        fit_time += time.perf_counter() - start
+
+    return wrapper
+
+
+def timed(f):
+    """milliseconds spent fitting text while running `f`"""
+    global fit_time
+    fit_time = 0.0
+    f()
+    return fit_time * 1000
+
+
+def board_load(app, boards):
+    def run():
+        for r in range(len(CATEGORIES)):
+            for board in boards:
+                board.load(r)
+        app.processEvents()
+
+    return run
+
+
+def window_resize(app, boards):
+    def run():
+        for board in boards:
+            w, h = board.width(), board.height()
+            steps = list(range(0, 200, 10))
+            for d in steps + steps[::-1]:
+                board.resize(w - d, h - d // 2)
+                app.processEvents()
+
+    return run
+
+
+def main():
+    app = QApplication(sys.argv)
+    utils.AutosizeWidget.autoresize = timed_autoresize(utils.AutosizeWidget.autoresize)
+    boards = [Board(size) for size in DISPLAY_SIZES]
+    app.processEvents()
+
+    fast = utils.AutosizeWidget.autofitsize
+    for name, scenario in [("board load", board_load), ("window resize", window_resize)]:
+        run = scenario(app, boards)
+
+        utils.AutosizeWidget.autofitsize = linear_autofitsize
+        linear = timed(run)
+        utils.AutosizeWidget.autofitsize = fast
+
+        utils.fit_pixel_size.cache_clear()
+        cold = timed(run)
+        warm = timed(run)
+        info = utils.fit_pixel_size.cache_info()
+        print(
+            f"{name:14} linear {linear:8.1f} ms   cold {cold:8.1f} ms   warm {warm:8.1f} ms"
+            f"   ({info.hits} hits, {info.misses} misses)"
+        )
+
+
+if __name__ == "__main__":
+    main()
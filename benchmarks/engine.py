@@ -0,0 +1,127 @@
+"""plays simulated games on the headless engine and reports games and events per second
+
+    python benchmarks/engine.py [games]
+"""
+import os
+import sys
+import time
+import random
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jparty.engine import (
+    Engine,
+    ManualClock,
+    Question,
+    Board,
+    FinalBoard,
+    GameData,
+    Player,
+    KEY_LEFT,
+    KEY_RIGHT,
+    KEY_SPACE,
+)
+from jparty.constants import MONIES, QUESTIONTIME, FJTIME
+
+PLAYERS = 3
+
+
+def make_data(rng):
+    rounds = []
+    for r, dds in enumerate((1, 2)):
+        dd = set(rng.sample([(c, row) for c in range(6) for row in range(5)], dds))
+        questions = [
+            Question((c, row), f"clue {c} {row}", f"answer {c} {row}", f"CATEGORY {c}",
+                     value=MONIES[r][row], dd=(c, row) in dd)
+            for c in range(6)
+            for row in range(5)
+        ]
+        rounds.append(Board([f"CATEGORY {c}" for c in range(6)], questions, dj=r == 1))
+    final = Question((0, 0), "final clue", "final answer", "FINAL CATEGORY")
+    rounds.append(FinalBoard("FINAL CATEGORY", final))
+    return GameData(rounds, "January 1, 2000", "simulated")
+
+
+def play_clue(engine, clock, rng, q):
+    engine.load_question(q)
+    if q.dd:
+        player = rng.choice(engine.players)
+        engine.set_dd_wager(player, rng.randint(5, engine.max_dd_wager(player)))
+        engine.press(rng.choice((KEY_LEFT, KEY_RIGHT)))
+        return
+
+    clock.advance(rng.uniform(1, 4))  # the host reads the clue
+    if rng.random() < 0.1:
+        engine.buzz(rng.choice(engine.players))  # too early: locked out
+    engine.press(KEY_SPACE)  # open responses
+    for player in rng.sample(engine.players, len(engine.players)):
+        clock.advance(rng.uniform(0.1, 1.5))
+        if engine.active_question is not q or not engine.accepting_responses:
+            break
+        engine.buzz(player)
+        if engine.answering_player is player:
+            engine.press(KEY_LEFT if rng.random() < 0.6 else KEY_RIGHT)
+    if engine.active_question is q:
+        clock.advance(QUESTIONTIME)  # stumped
+        engine.press(KEY_SPACE)  # back to the board
+
+
+def play_game(rng, players=None, subscribe=None):
+    """play a whole game between `players` (PLAYERS new ones by default); the number of events"""
+    clock = ManualClock()
+    engine = Engine(clock)
+    events = [0]
+
+    def count(name, *args):
+        events[0] += 1
+
+    engine.subscribe(count)
+    if subscribe is not None:
+        subscribe(engine)
+    engine.data = make_data(rng)
+    if players is None:
+        players = [Player(f"player {i}", None, None) for i in range(PLAYERS)]
+    engine.set_players(players)
+    engine.start_game()
+
+    for r in range(2):
+        board = engine.current_round
+        left = list(board.questions)
+        rng.shuffle(left)
+        for q in left:
+            play_clue(engine, clock, rng, q)
+        engine.press(KEY_SPACE)  # next round
+
+    for player in engine.players:
+        engine.wager(player, rng.randint(0, max(player.score, 0)))
+    engine.press(KEY_SPACE)  # show the final clue
+    engine.press(KEY_SPACE)  # open responses
+    for player in engine.players:
+        engine.answer(player, "what is something")
+    clock.advance(FJTIME)
+    for player in engine.players:
+        engine.press(KEY_SPACE)  # next player
+        engine.press(KEY_SPACE)  # show their answer
+        engine.press(rng.choice((KEY_LEFT, KEY_RIGHT)))
+    engine.press(KEY_SPACE)  # winner
+    assert "CLOSE_GAME" in engine.keystroke_manager.active()
+    engine.press(KEY_SPACE)  # close the game
+    return events[0]
+
+
+def main():
+    logging.disable(logging.INFO)
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = random.Random(0)
+    start = time.perf_counter()
+    events = sum(play_game(rng) for _ in range(games))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{games} games in {elapsed:.2f} s: {games / elapsed:,.0f} games/s, "
+        f"{events / games:,.0f} events per game, {events / elapsed:,.0f} events/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""plays a season of simulated games into a history database and times the leaderboard queries
+
+    python benchmarks/history.py [games] [league size]
+"""
+import os
+import sys
+import time
+import random
+import logging
+import sqlite3
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jparty.engine import Player
+from jparty.history import GameHistory
+
+from engine import play_game
+
+COLORS = ["#e6194b", "#3cb44b", "#ffe119", "#4363d8", "#f58231", "#911eb4", "#46f0f0", "#f032e6"]
+
+
+def timed(f, *args):
+    start = time.perf_counter()
+    result = f(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def season(path, games, league):
+    """play `games` games between members of a league of `league` into the database at `path`, and time its queries"""
+    rng = random.Random(0)
+    histories = []
+    members = [(f"member {i}", COLORS[i % len(COLORS)]) for i in range(league)]
+    played = flushed = 0.0
+    for _ in range(games):
+        players = [Player(name, color, None) for name, color in rng.sample(members, 3)]
+        start = time.perf_counter()
+        play_game(rng, players, lambda engine: histories.append(GameHistory(engine, path)))
+        played += time.perf_counter() - start
+        # one game at a time, as on a game night
+        start = time.perf_counter()
+        histories[-1].close()
+        flushed += time.perf_counter() - start
+
+    db = sqlite3.connect(path)
+    with db:
+        # spread the season over the year before today
+        db.execute("UPDATE games SET night = date('now', '-' || ((? - id) * 365 / ?) || ' days')", (games, games))
+    buzzes, judgements, results = (
+        db.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in ("buzzes", "judgements", "results")
+    )
+    db.close()
+    rows = sum(h.rows for h in histories)
+    assert rows == buzzes + judgements + results, "rows were lost"
+    print(
+        f"{games} games, {buzzes:,} buzzes, {judgements:,} judgements: played and queued in {played:.2f} s, "
+        f"{rows / played:,.0f} rows/s; written in {flushed / games * 1000:.1f} ms a game once it ended"
+    )
+
+    history = histories[-1]
+    board, ms = timed(history.leaderboard, "")
+    print(f"leaderboard, whole season ({len(board)} players): {ms:.1f} ms")
+    since = time.strftime("%Y-%m-%d", time.localtime(time.time() - 30 * 86400))
+    recent, ms = timed(history.leaderboard, since)
+    print(f"leaderboard, last 30 days ({len(recent)} players): {ms:.1f} ms")
+    total = 0
+    for row in board:
+        _, games_ms = timed(history.player_games, row["id"])
+        _, categories_ms = timed(history.player_categories, row["id"])
+        total += games_ms + categories_ms
+    print(f"each player's games and categories: {total / len(board):.1f} ms a player")
+
+
+def main():
+    logging.disable(logging.INFO)
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    league = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    # the query connection stays open, which Windows won't delete under
+    with tempfile.TemporaryDirectory(prefix="jparty-history-", ignore_cleanup_errors=True) as directory:
+        season(os.path.join(directory, "history.sqlite3"), games, league)
+
+
+if __name__ == "__main__":
+    main()
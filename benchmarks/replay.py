@@ -0,0 +1,354 @@
+"""replays a captured game night and reports how long each input took to handle
+
+    python benchmarks/replay.py night.jsonl [--speed 1|10|max] [--headless] [--json out.json] [--compare base.json]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jparty.capture import read_capture
+from jparty.engine import Engine, ManualClock, Player, KEY_TAB
+from jparty.gamepack import game_from_header
+from jparty.constants import MAXPLAYERS
+
+SPEEDS = {"1": 1.0, "10": 10.0, "max": None}
+
+
+class HeadlessReplay(object):
+    """replays inputs straight into an Engine"""
+
+    def __init__(self):
+        self.clock = ManualClock()
+        self.engine = Engine(self.clock)
+        self.accepting_players = True
+        self.connected_players = []
+        self.__connections = {}  # connection -> Player
+        self.__tokens = {}  # captured token -> Player
+
+    @property
+    def players(self):
+        return self.engine.players
+
+    def wait(self, seconds):
+        time.sleep(seconds)
+
+    def settle(self):
+        pass
+
+    def __player(self, token, color):
+        player = self.__tokens.get(token)
+        if player is not None and player in self.connected_players:
+            return player
+        for p in self.connected_players:
+            if color is not None and p.buzzercolor == color:
+                return p
+        return None
+
+    def message(self, connection, message):
+        player = self.__connections.get(connection)
+        if "BUZZ" in message:
+            if player is not None:
+                self.engine.buzz(player)
+            return
+        parsed = json.loads(message)
+        msg, text = parsed["message"], parsed["text"]
+        if msg == "NAME":
+            if self.accepting_players and len(self.connected_players) < MAXPLAYERS:
+                player = Player(text, parsed["buzzerColor"], None)
+                self.__connections[connection] = player
+                self.connected_players.append(player)
+                self.engine.set_players(self.connected_players)
+        elif msg == "CHECK_IF_EXISTS":
+            player = self.__player(text, parsed.get("buzzerColor"))
+            if player is not None:
+                self.__connections[connection] = player
+        elif msg == "WAGER":
+            self.engine.wager(player, int(text))
+        elif msg == "ANSWER":
+            self.engine.answer(player, text)
+
+    def token(self, connection, token):
+        self.__tokens[token] = self.__connections[connection]
+
+    def start(self, pack):
+        self.accepting_players = False
+        self.engine.data = game_from_header(pack)
+        self.engine.start_game()
+
+    def key(self, key):
+        self.engine.press(key)
+
+    def pick(self, index):
+        self.engine.load_question(self.engine.current_round.get_question(*index))
+
+    def dd_wager(self, player, wager):
+        self.engine.set_dd_wager(self.engine.players[player], wager)
+
+    def score(self, player, score):
+        self.engine.set_score(self.engine.players[player], score)
+
+    def remove(self, player):
+        self.engine.remove_player(self.engine.players[player])
+
+    def close(self):
+        pass
+
+
+class OffscreenReplay(object):
+    """replays inputs into the whole app, on the offscreen Qt platform"""
+
+    def __init__(self):
+        from types import SimpleNamespace
+
+        if "QT_QPA_PLATFORM" not in os.environ:
+            # two screens, like a game night: the host's and the board
+            screens = [
+                {"name": name, "x": x, "y": 0, "width": 1920, "height": 1080, "logicalDpiX": 96, "logicalDpiY": 96}
+                for name, x in (("host", 0), ("board", 1920))
+            ]
+            with open("screens.json", "w") as f:
+                json.dump({"screens": screens}, f)
+            os.environ["QT_QPA_PLATFORM"] = f"offscreen:configfile={os.path.abspath('screens.json')}"
+
+        from PyQt6.QtCore import QTimer, QEventLoop
+        from PyQt6.QtWidgets import QApplication
+
+        from jparty.style import JPartyStyle
+        from jparty.game import Game, KEYS
+        from jparty.controller import BuzzerController, BuzzerSocketHandler
+        from jparty.main_display import DisplayWindow, HostDisplayWindow
+        from jparty.animation import animator
+        from jparty.timers import timer_service
+
+        class ReplaySocket(BuzzerSocketHandler):
+            """a phone's websocket, without the socket"""
+
+            def __init__(self, controller, connection):
+                self.application = SimpleNamespace(controller=controller)
+                self.request = SimpleNamespace(remote_ip="replay")
+                self.controller = controller
+                self.connection = connection
+                self.player = None
+
+            def send(self, msg, text=""):
+                pass
+
+            def close(self, code=None, reason=None):
+                pass
+
+        self.__socket = ReplaySocket
+        self.__timer = QTimer
+        self.__loop = QEventLoop
+
+        QApplication.setStyle(JPartyStyle())
+        self.app = QApplication(sys.argv[:1])
+        animator()
+        timer_service()
+
+        self.game = Game()
+        self.clock = ManualClock()
+        self.game.engine.clock = self.clock
+        # the controller reads tornado's options from the command line, which is ours
+        sys.argv = sys.argv[:1]
+        self.controller = BuzzerController(self.game)  # not started: the phones are replayed
+        self.game.setBuzzerController(self.controller)
+        self.main_window = DisplayWindow(self.game)
+        self.host_window = HostDisplayWindow(self.game)
+        self.game.setDisplays(self.host_window, self.main_window)
+
+        self.__keys = {key: qt_key for qt_key, key in KEYS.items()}
+        self.__sockets = {}  # connection -> ReplaySocket
+        self.__tokens = {}  # captured token -> replayed token
+        self.settle()
+
+    @property
+    def players(self):
+        return self.game.players
+
+    def wait(self, seconds):
+        loop = self.__loop()
+        self.__timer.singleShot(int(seconds * 1000), loop.quit)
+        loop.exec()
+
+    def settle(self):
+        self.app.processEvents()
+
+    def message(self, connection, message):
+        socket = self.__sockets.get(connection)
+        if socket is None:
+            socket = self.__sockets[connection] = self.__socket(self.controller, connection)
+        if "CHECK_IF_EXISTS" in message:
+            parsed = json.loads(message)
+            parsed["text"] = self.__tokens.get(parsed["text"], parsed["text"])
+            message = json.dumps(parsed)
+        socket.on_message(message)
+
+    def token(self, connection, token):
+        self.__tokens[token] = self.__sockets[connection].player.token.hex()
+
+    def start(self, pack):
+        self.game.data = game_from_header(pack)
+        self.game.start_game()
+
+    def key(self, key):
+        if key != KEY_TAB:  # the stats box would wait for someone to close it
+            self.game.key_pressed(self.__keys[key])
+
+    def pick(self, index):
+        self.game.load_question(self.game.current_round.get_question(*index))
+
+    def dd_wager(self, player, wager):
+        self.game.set_dd_wager(self.game.players[player], wager)
+
+    def score(self, player, score):
+        self.game.set_score(self.game.players[player], score)
+
+    def remove(self, player):
+        self.game.remove_player(self.game.players[player])
+
+    def close(self):
+        """finish writing to the temporary directory, as the app does when it quits"""
+        self.game.journal.close()
+        self.game.history.close()
+
+
+def label(record):
+    """what the report calls an input"""
+    kind = record["kind"]
+    if kind == "message":
+        message = record["message"]
+        return "buzz" if "BUZZ" in message else json.loads(message)["message"].lower()
+    if kind == "key":
+        return f"key {record['key']}"
+    return kind
+
+
+def replay(target, records, speed):
+    """feed `records` to `target`; the latency of each input, in seconds, by label"""
+    latencies = {}
+
+    def timed(name, f, *args):
+        start = time.perf_counter()
+        f(*args)
+        target.settle()
+        latencies.setdefault(name, []).append(time.perf_counter() - start)
+
+    last = 0.0
+    for record in records:
+        gap = max(0.0, record["t"] - last)
+        last = record["t"]
+        if speed is not None and gap > 0:
+            target.wait(gap / speed)
+        deadline = target.clock.next_deadline()
+        if deadline is not None and deadline <= target.clock.now() + gap:
+            timed("timer", target.clock.advance, gap)
+        else:
+            target.clock.advance(gap)
+
+        kind = record["kind"]
+        if kind == "message":
+            timed(label(record), target.message, record["connection"], record["message"])
+        elif kind == "token":
+            target.token(record["connection"], record["token"])
+        elif kind == "start":
+            timed("start", target.start, record["pack"])
+        elif kind == "key":
+            timed(label(record), target.key, record["key"])
+        elif kind == "pick":
+            timed("pick", target.pick, record["index"])
+        elif kind == "dd_wager":
+            timed("dd_wager", target.dd_wager, record["player"], record["wager"])
+        elif kind == "score":
+            timed("score", target.score, record["player"], record["score"])
+        elif kind == "remove":
+            timed("remove", target.remove, record["player"])
+    return latencies
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def summarize(latencies):
+    summary = {}
+    for name, values in sorted(latencies.items()):
+        values = sorted(v * 1000 for v in values)
+        summary[name] = {
+            "n": len(values),
+            "mean": sum(values) / len(values),
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "p99": percentile(values, 99),
+            "max": values[-1],
+        }
+    return summary
+
+
+def print_summary(summary, base=None):
+    print(f"{'input':<20}{'n':>6}{'mean':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  (ms)")
+    for name, s in summary.items():
+        line = f"{name:<20}{s['n']:>6}" + "".join(f"{s[k]:>9.3f}" for k in ("mean", "p50", "p90", "p99", "max"))
+        if base is not None and name in base:
+            b = base[name]
+            line += f"   p50 {s['p50'] / b['p50'] if b['p50'] else 0:.2f}x  p99 {s['p99'] / b['p99'] if b['p99'] else 0:.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="replay a captured game night and time each input")
+    parser.add_argument("capture", help="a capture recorded with run.py --capture=<file>")
+    parser.add_argument("--speed", choices=SPEEDS, default="max", help="how fast to replay, against the night")
+    parser.add_argument("--headless", action="store_true", help="replay into the engine alone, without Qt")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--compare", help="a report written by --json, to compare against")
+    args = parser.parse_args()
+
+    records = read_capture(args.capture)
+    if not any(r["kind"] == "start" for r in records):
+        sys.exit(f"{args.capture} has no game start to replay")
+    base = None
+    if args.compare:
+        with open(args.compare) as f:
+            base = json.load(f)["inputs"]
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    logging.disable(logging.INFO)
+    home = os.getcwd()
+    directory = tempfile.TemporaryDirectory(prefix="jparty-replay-", ignore_cleanup_errors=True)
+    os.chdir(directory.name)
+    try:
+        target = HeadlessReplay() if args.headless else OffscreenReplay()
+
+        start = time.perf_counter()
+        latencies = replay(target, records, SPEEDS[args.speed])
+        elapsed = time.perf_counter() - start
+        target.close()
+        summary = summarize(latencies)
+
+        mode = "headless" if args.headless else "offscreen"
+        pace = "max speed" if args.speed == "max" else f"{args.speed}x"
+        print(
+            f"replayed {len(records)} inputs ({records[-1]['t']:.0f} s of play) {mode} "
+            f"at {pace} in {elapsed:.2f} s"
+        )
+        print("scores: " + ", ".join(f"{p.name} ${p.score}" for p in target.players))
+        print_summary(summary, base)
+        if json_path:
+            with open(json_path, "w") as f:
+                json.dump({"capture": args.capture, "mode": mode, "speed": args.speed, "inputs": summary}, f, indent=1)
+    finally:
+        os.chdir(home)
+        directory.cleanup()
+    sys.stdout.flush()
+    # the app's video server thread never returns
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
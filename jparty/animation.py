@@ -0,0 +1,151 @@
+"""keyframe timelines, all driven by one animation timer on the GUI thread"""
+from PyQt6.QtCore import Qt, QObject, QTimer, pyqtSignal
+
+import time
+import logging
+import threading
+from functools import partial
+
+from jparty.constants import ANIMATION_FRAME
+
+
+class Timeline(object):
+    def __init__(self, loop=False):
+        self.loop = loop
+        self.duration = 0.0
+        self.keyframes = []  # (offset in seconds, callback), in order
+
+    def at(self, offset, callback, *args):
+        """call `callback(*args)` `offset` seconds after the animation starts"""
+        i = len(self.keyframes)
+        while i > 0 and self.keyframes[i - 1][0] > offset:
+            i -= 1
+        self.keyframes.insert(i, (offset, partial(callback, *args)))
+        self.duration = max(self.duration, offset)
+        return self
+
+    def then(self, delay, callback, *args):
+        """call `callback(*args)` `delay` seconds after the end of the timeline so far"""
+        return self.at(self.duration + delay, callback, *args)
+
+    def wait(self, delay):
+        """extend the timeline by `delay` seconds, e.g. before a loop starts over"""
+        self.duration += delay
+        return self
+
+
+class Animation(object):
+    def __init__(self, timeline, name=None):
+        self.timeline = timeline
+        self.name = name
+        self.start = time.monotonic()
+        self.cancelled = False
+        self.fired = 0
+        self.late = 0  # keyframes that fired more than a frame late
+        self.max_lateness = 0.0
+        self.__index = 0
+
+    def cancel(self):
+        """stop before the next keyframe. Safe to call from any thread"""
+        self.cancelled = True
+
+    @property
+    def finished(self):
+        return self.cancelled or self.__index >= len(self.timeline.keyframes)
+
+    def due(self):
+        """monotonic time of the next keyframe, or None if there is none"""
+        if self.finished:
+            return None
+        return self.start + self.timeline.keyframes[self.__index][0]
+
+    def fire(self, now):
+        offset, callback = self.timeline.keyframes[self.__index]
+        lateness = now - (self.start + offset)
+        self.__index += 1
+        if self.__index == len(self.timeline.keyframes) and self.timeline.loop:
+            if self.timeline.duration > 0:
+                self.start += self.timeline.duration
+                self.__index = 0
+
+        self.fired += 1
+        self.max_lateness = max(self.max_lateness, lateness)
+        if lateness > ANIMATION_FRAME:
+            self.late += 1
+        callback()
+
+
+class Animator(QObject):
+    __play_requested = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.__animations = []
+        self.__timer = QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.__timer.timeout.connect(self.__tick)
+        # queued when play() is called off the GUI thread
+        self.__play_requested.connect(self.__add)
+
+    def play(self, timeline, name=None):
+        """start `timeline` now and return its `Animation`. Safe to call from any thread"""
+        animation = Animation(timeline, name)
+        self.__play_requested.emit(animation)
+        return animation
+
+    @property
+    def running(self):
+        """the number of animations still playing"""
+        return sum(1 for a in self.__animations if not a.finished)
+
+    def __add(self, animation):
+        self.__animations.append(animation)
+        self.__schedule()
+
+    def __tick(self):
+        now = time.monotonic()
+        for animation in list(self.__animations):
+            while True:
+                due = animation.due()
+                if due is None or due > now:
+                    break
+                try:
+                    animation.fire(now)
+                except Exception:
+                    logging.exception(f"animation {animation.name or ''} failed")
+                    animation.cancel()
+        self.__schedule()
+
+    def __schedule(self):
+        for animation in [a for a in self.__animations if a.finished]:
+            self.__animations.remove(animation)
+            self.__finished(animation)
+        dues = [a.due() for a in self.__animations]
+        if not dues:
+            self.__timer.stop()
+            return
+        delay = max(0.0, min(dues) - time.monotonic())
+        self.__timer.start(int(round(delay * 1000)))
+
+    def __finished(self, animation):
+        if animation.name is None:
+            return
+        logging.info(
+            f"{animation.name}: {animation.fired} keyframes, {animation.late} dropped frames, "
+            f"latest {animation.max_lateness * 1000:.1f} ms late"
+            + (" (cancelled)" if animation.cancelled else "")
+        )
+
+
+_animator = None
+_animator_lock = threading.Lock()
+
+
+def animator():
+    """the shared animator. Create it on the GUI thread first"""
+    global _animator
+    with _animator_lock:
+        if _animator is None:
+            _animator = Animator()
+        return _animator
@@ -0,0 +1,290 @@
+"""an archive of every downloaded game, with a word index over its clues for building custom games"""
+import os
+import re
+import random
+import logging
+import datetime
+import threading
+from array import array
+from collections import defaultdict
+
+from jparty.engine import Question, Board, FinalBoard, GameData
+from jparty.gamepack import write_pack, read_header
+from jparty.constants import ARCHIVE_DIR, PACK_EXTENSION, MONIES
+
+# relative chance of a daily double landing on each row, top to bottom
+DD_ROW_WEIGHTS = [1, 9, 26, 39, 25]
+
+_token_re = re.compile(r"[a-z0-9]+")
+_unsafe_re = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def tokenize(text):
+    return _token_re.findall(text.lower().replace("'", ""))
+
+
+def parse_date(text):
+    """return the proleptic ordinal of a game date, or 0 if it can't be read"""
+    for fmt in ("%B %d, %Y", "%Y-%m-%d", "%m/%d/%Y"):
+        try:
+            return datetime.datetime.strptime(text.strip(), fmt).toordinal()
+        except (ValueError, AttributeError):
+            pass
+    return 0
+
+
+def archive_path(game_id):
+    return os.path.join(ARCHIVE_DIR, _unsafe_re.sub("_", str(game_id)) + PACK_EXTENSION)
+
+
+def archive_game(game_id, data):
+    """store a downloaded game in the archive, without its media"""
+    try:
+        os.makedirs(ARCHIVE_DIR, exist_ok=True)
+        write_pack(data, archive_path(game_id), include_media=False)
+    except OSError:
+        logging.error(f"Cannot archive game {game_id}", exc_info=True)
+
+
+class ClueIndex(object):
+    FINAL_ROUND = 2
+
+    def __init__(self, directory=ARCHIVE_DIR):
+        self.directory = directory
+        self.__lock = threading.Lock()
+        self.__files = set()
+
+        # one entry per clue
+        self.games = []
+        self.texts = []
+        self.answers = []
+        self.categories = []
+        self.image_links = []
+        self.video_links = []
+        self.values = array("i")
+        self.dates = array("i")
+        self.rounds = array("b")
+        self.rows = array("b")
+
+        self.words = defaultdict(lambda: array("I"))
+        self.category_words = defaultdict(lambda: array("I"))
+
+    def __len__(self):
+        return len(self.texts)
+
+    def refresh(self):
+        """index any archived games that aren't indexed yet"""
+        if not os.path.isdir(self.directory):
+            return
+        with self.__lock:
+            for filename in sorted(os.listdir(self.directory)):
+                if not filename.endswith(PACK_EXTENSION) or filename in self.__files:
+                    continue
+                try:
+                    header = read_header(os.path.join(self.directory, filename))
+                except (OSError, ValueError):
+                    logging.info(f"skipping unreadable archive file {filename}")
+                    continue
+                self.__files.add(filename)
+                self.add_game(filename[: -len(PACK_EXTENSION)], header)
+
+    def add_game(self, game_id, header):
+        date = parse_date(header["date"])
+        for i_round, r in enumerate(header["rounds"]):
+            round_num = ClueIndex.FINAL_ROUND if r["final"] else min(i_round, 1)
+            for q in r["questions"]:
+                self.add_clue(game_id, q, date, round_num)
+
+    def add_clue(self, game_id, q, date, round_num):
+        clue_id = len(self.texts)
+        self.games.append(game_id)
+        self.texts.append(q["text"])
+        self.answers.append(q["answer"])
+        self.categories.append(q["category"])
+        self.image_links.append(q["image_link"])
+        self.video_links.append(q["video_link"])
+        self.values.append(max(q["value"], 0))
+        self.dates.append(date)
+        self.rounds.append(round_num)
+        self.rows.append(q["index"][1])
+
+        category_tokens = set(tokenize(q["category"]))
+        for word in set(tokenize(q["text"]) + tokenize(q["answer"])) | category_tokens:
+            self.words[word].append(clue_id)
+        for word in category_tokens:
+            self.category_words[word].append(clue_id)
+
+    def __match(self, postings, text):
+        """ids of clues containing every word of `text` according to `postings`"""
+        tokens = tokenize(text)
+        if not tokens:
+            return None
+        lists = sorted((postings.get(t, ()) for t in tokens), key=len)
+        result = set(lists[0])
+        for ids in lists[1:]:
+            result.intersection_update(ids)
+        return result
+
+    def search(
+        self,
+        keywords=None,
+        category=None,
+        min_value=None,
+        max_value=None,
+        start_date=None,
+        end_date=None,
+        round_num=None,
+    ):
+        """return the sorted ids of clues matching every given criterion. Dates are `datetime.date`s"""
+        with self.__lock:
+            candidates = None
+            for postings, text in ((self.words, keywords), (self.category_words, category)):
+                if text:
+                    ids = self.__match(postings, text)
+                    candidates = ids if candidates is None else candidates & ids
+
+            if candidates is None:
+                candidates = range(len(self.texts))
+
+            start = start_date.toordinal() if start_date is not None else None
+            end = end_date.toordinal() if end_date is not None else None
+
+            values, dates, rounds = self.values, self.dates, self.rounds
+            return sorted(
+                i
+                for i in candidates
+                if (min_value is None or values[i] >= min_value)
+                and (max_value is None or values[i] <= max_value)
+                and (start is None or (dates[i] and dates[i] >= start))
+                and (end is None or (dates[i] and dates[i] <= end))
+                and (round_num is None or rounds[i] == round_num)
+            )
+
+    def question(self, clue_id, index, value, dd=False):
+        return Question(
+            index,
+            self.texts[clue_id],
+            self.answers[clue_id],
+            self.categories[clue_id],
+            self.image_links[clue_id],
+            self.video_links[clue_id],
+            None,
+            value,
+            dd,
+        )
+
+
+def parse_query(text):
+    """
+    turn a query typed on the welcome screen into `ClueIndex.search` arguments, e.g.
+    `rivers cat:geography value:400-1200 date:1990-2005`
+    """
+    kwargs = {}
+    keywords = []
+    for part in text.split():
+        key, _, arg = part.partition(":")
+        lo, _, hi = arg.partition("-")
+        if key == "cat" and arg:
+            kwargs["category"] = " ".join(filter(None, [kwargs.get("category"), arg]))
+        elif key == "value" and arg:
+            kwargs["min_value"] = int(lo) if lo else None
+            kwargs["max_value"] = int(hi or lo) if (hi or lo) else None
+        elif key == "date" and arg:
+            kwargs["start_date"] = datetime.date(int(lo), 1, 1) if lo else None
+            kwargs["end_date"] = datetime.date(int(hi or lo), 12, 31) if (hi or lo) else None
+        else:
+            keywords.append(part)
+    kwargs["keywords"] = " ".join(keywords)
+    return kwargs
+
+
+def _place_daily_doubles(count):
+    """choose `count` (column, row) daily double positions in distinct columns"""
+    columns = random.sample(range(Board.size[0]), count)
+    rows = random.choices(range(Board.size[1]), weights=DD_ROW_WEIGHTS, k=count)
+    return set(zip(columns, rows))
+
+
+def _build_board(index, groups, round_num):
+    dds = _place_daily_doubles(1 if round_num == 0 else 2)
+    categories = []
+    questions = []
+    for col, clue_ids in enumerate(groups):
+        categories.append(index.categories[clue_ids[0]])
+        for row, clue_id in enumerate(clue_ids):
+            questions.append(
+                index.question(clue_id, (col, row), MONIES[round_num][row], (col, row) in dds)
+            )
+    return Board(categories, questions, dj=(round_num == 1))
+
+
+def build_game(index, description="", **query):
+    """
+    assemble a full custom game from the clues matching `query`.
+    Matching clues are grouped by their original category, and a category can
+    fill a column if it has a clue in the value range: those clues go in first
+    and the rest of the category fills the column. Categories with the most
+    clues in range are used first. Returns None if there aren't enough.
+    """
+    n_columns = Board.size[0]
+    n_rows = Board.size[1]
+    query.pop("round_num", None)
+    # a category has one clue of each value, so few would have a whole column in a narrow range
+    min_value = query.pop("min_value", None)
+    max_value = query.pop("max_value", None)
+    matches = index.search(**query)
+
+    def in_range(i):
+        value = index.values[i]
+        return (min_value is None or value >= min_value) and (max_value is None or value <= max_value)
+
+    groups = defaultdict(list)
+    finals = []
+    for i in matches:
+        if index.rounds[i] == ClueIndex.FINAL_ROUND:
+            finals.append(i)
+        else:
+            groups[(index.games[i], index.rounds[i], index.categories[i])].append(i)
+
+    ranked = []
+    for ids in groups.values():
+        hits = sum(map(in_range, ids))
+        if len(ids) >= n_rows and hits:
+            chosen = sorted(ids, key=lambda i: not in_range(i))[:n_rows]
+            ranked.append((hits, sorted(chosen, key=lambda i: (index.rows[i], index.values[i]))))
+    if len(ranked) < 2 * n_columns:
+        logging.info(f"only {len(ranked)} categories match query {query}")
+        return None
+    random.shuffle(ranked)
+    ranked.sort(key=lambda c: c[0], reverse=True)
+    columns = [column for _, column in ranked[: 2 * n_columns]]
+    random.shuffle(columns)
+
+    if not finals:
+        finals = index.search(round_num=ClueIndex.FINAL_ROUND)
+        if not finals:
+            return None
+    final_id = random.choice(finals)
+    final_category = index.categories[final_id]
+
+    boards = [
+        _build_board(index, columns[:n_columns], 0),
+        _build_board(index, columns[n_columns : 2 * n_columns], 1),
+        FinalBoard(final_category, index.question(final_id, (0, 0), -1)),
+    ]
+    today = datetime.date.today().strftime("%B %d, %Y")
+    return GameData(boards, today, f"Custom game: {description}" if description else "Custom game")
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def clue_index():
+    """the shared index over ARCHIVE_DIR, refreshed with any newly archived games"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ClueIndex()
+    _index.refresh()
+    return _index
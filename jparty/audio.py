@@ -0,0 +1,300 @@
+"""theme sounds decoded once, and a mixer thread that plays cues from memory"""
+import simpleaudio as sa
+
+import time
+import wave
+import queue
+import logging
+import threading
+from array import array
+
+from jparty.utils import resource_path
+from jparty.config import config
+from jparty.constants import DUCK_VOLUME, MAX_VOICES
+
+SOUNDS = [
+    "intro.wav",
+    "final.wav",
+    "board_fill.wav",
+    "dd.wav",
+    "ding.wav",
+    "stumped.wav",
+    "applause.wav",
+]
+
+
+class Sound(object):
+    def __init__(self, audio_data, num_channels, bytes_per_sample, sample_rate):
+        self.num_channels = num_channels
+        self.bytes_per_sample = bytes_per_sample
+        self.sample_rate = sample_rate
+        self.frame_bytes = num_channels * bytes_per_sample
+        self.__lock = threading.Lock()
+        self.__data = {1.0: audio_data}  # volume -> samples
+
+    @classmethod
+    def from_wave_file(cls, path):
+        with wave.open(path, "rb") as w:
+            return cls(
+                w.readframes(w.getnframes()),
+                w.getnchannels(),
+                w.getsampwidth(),
+                w.getframerate(),
+            )
+
+    def __len__(self):
+        return len(self.__data[1.0])
+
+    @property
+    def duration(self):
+        return len(self) / (self.frame_bytes * self.sample_rate)
+
+    def data(self, volume=1.0):
+        """the samples scaled to `volume`, computed once per volume"""
+        with self.__lock:
+            if volume not in self.__data:
+                self.__data[volume] = self.__scale(self.__data[1.0], volume)
+            return self.__data[volume]
+
+    def __scale(self, data, volume):
+        if self.bytes_per_sample != 2:
+            logging.info(f"cannot change the volume of {8 * self.bytes_per_sample} bit audio")
+            return data
+        samples = array("h")
+        samples.frombytes(data)
+        return array("h", [int(s * volume) for s in samples]).tobytes()
+
+    def play(self, volume=1.0, offset=0):
+        """start playing from byte `offset` and return the simpleaudio play object"""
+        return sa.play_buffer(
+            self.data(volume)[offset:],
+            self.num_channels,
+            self.bytes_per_sample,
+            self.sample_rate,
+        )
+
+
+class AudioBank(object):
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__themes = {}  # theme -> {name: Sound}
+        self.__sounds = {}
+        self.theme = None
+
+    def preload(self, theme):
+        """decode every sound of `theme` without switching to it"""
+        with self.__lock:
+            if theme in self.__themes:
+                return self.__themes[theme]
+
+        sounds = {}
+        start = time.perf_counter()
+        for name in SOUNDS:
+            path = resource_path(name, theme)
+            try:
+                sounds[name] = Sound.from_wave_file(path)
+            except (OSError, wave.Error):
+                logging.info(f"cannot load sound {path}")
+        logging.info(
+            f"loaded {len(sounds)} {theme} sounds in {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+
+        with self.__lock:
+            return self.__themes.setdefault(theme, sounds)
+
+    def load(self, theme=None):
+        """switch to the sounds of `theme` (the configured theme by default)"""
+        if theme is None:
+            theme = config().get('theme')
+        sounds = self.preload(theme)
+        with self.__lock:
+            self.__sounds = sounds
+            self.theme = theme
+
+        # scale the music for ducking ahead of time, so ducking never waits for it. Only the
+        # theme in use: scaling is pure Python, about 100 ms a megabyte, and holds the GIL
+        music = [sounds[name] for name in ("intro.wav", "final.wav") if name in sounds]
+        threading.Thread(
+            target=lambda: [s.data(DUCK_VOLUME) for s in music], daemon=True
+        ).start()
+
+    def get(self, name):
+        with self.__lock:
+            return self.__sounds.get(name)
+
+
+class AudioMixer(object):
+    def __init__(self, bank, max_voices=MAX_VOICES):
+        self.bank = bank
+        self.max_voices = max_voices
+        self.music = None
+        self.__queue = queue.SimpleQueue()
+        self.__voices = []
+        self.__duck_until = None
+
+        # cue-to-sound latency, in seconds
+        self.cues = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+        threading.Thread(target=self.__run, name="mixer", daemon=True).start()
+
+    def play(self, name, volume=1.0, duck=True):
+        """queue the sound `name`. Returns immediately"""
+        self.__queue.put((time.perf_counter(), name, volume, duck))
+
+    def __run(self):
+        while True:
+            timeout = None
+            if self.__duck_until is not None:
+                timeout = max(0.0, self.__duck_until - time.monotonic())
+            try:
+                cued, name, volume, duck = self.__queue.get(timeout=timeout)
+            except queue.Empty:
+                self.__duck_until = None
+                if self.music is not None:
+                    self.music.duck(False)
+                continue
+            self.__start(cued, name, volume, duck)
+
+    def __start(self, cued, name, volume, duck):
+        sound = self.bank.get(name)
+        if sound is None:
+            logging.info(f"no sound {name} in the audio bank")
+            return
+
+        self.__voices = [v for v in self.__voices if v.is_playing()]
+        if len(self.__voices) >= self.max_voices:
+            self.__voices.pop(0).stop()
+
+        try:
+            self.__voices.append(sound.play(volume))
+        except Exception as e:
+            logging.info(f"cannot play {name}: {e}")
+            return
+
+        latency = time.perf_counter() - cued
+        self.cues += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        logging.debug(f"played {name} {latency * 1000:.1f} ms after its cue")
+
+        if duck and self.music is not None:
+            self.music.duck(True)
+            until = time.monotonic() + sound.duration
+            self.__duck_until = max(self.__duck_until or 0.0, until)
+
+    def report(self):
+        if self.cues == 0:
+            return
+        logging.info(
+            f"played {self.cues} sound cues, latency mean "
+            f"{self.total_latency / self.cues * 1000:.1f} ms, max {self.max_latency * 1000:.1f} ms"
+        )
+
+
+class SongPlayer(object):
+    def __init__(self, bank=None, mixer=None):
+        super().__init__()
+        self.__bank = bank or audio_bank()
+        self.__lock = threading.Lock()
+        self.__sound = None
+        self.__play_obj = None
+        self.__repeating = False
+        self.__ducked = False
+        self.__generation = 0
+        self.__segment = (0.0, 0)  # (monotonic start time, byte offset) of what's playing
+        (mixer or audio_mixer()).music = self
+
+    def play(self, repeat=False):
+        self.__start("intro.wav", repeat)
+
+    def final(self, repeat=False):
+        self.__start("final.wav", repeat)
+
+    def stop(self):
+        with self.__lock:
+            self.__repeating = False
+            self.__generation += 1
+            if self.__play_obj is not None:
+                self.__play_obj.stop()
+                self.__play_obj = None
+
+    def duck(self, ducked):
+        """lower the music (or bring it back), continuing from where it is"""
+        with self.__lock:
+            if ducked == self.__ducked:
+                return
+            self.__ducked = ducked
+            if self.__play_obj is None or not self.__play_obj.is_playing():
+                return
+            started, offset = self.__segment
+            frames = int((time.monotonic() - started) * self.__sound.sample_rate)
+            position = offset + frames * self.__sound.frame_bytes
+            if position >= len(self.__sound):
+                return
+            self.__play_obj.stop()
+            self.__play_from(position)
+
+    def __start(self, name, repeat):
+        self.stop()
+        with self.__lock:
+            self.__sound = self.__bank.get(name)
+            if self.__sound is None:
+                logging.info(f"no music {name} in the audio bank")
+                return
+            self.__repeating = repeat
+            self.__play_from(0)
+            if repeat:
+                threading.Thread(
+                    target=self.__repeat, args=(self.__generation,), daemon=True
+                ).start()
+
+    def __play_from(self, offset):
+        volume = DUCK_VOLUME if self.__ducked else 1.0
+        self.__play_obj = self.__sound.play(volume, offset)
+        self.__segment = (time.monotonic(), offset)
+
+    def __repeat(self, generation):
+        while True:
+            play_obj = self.__play_obj
+            if play_obj is None:
+                break
+            play_obj.wait_done()
+            with self.__lock:
+                if generation != self.__generation or not self.__repeating:
+                    break
+                if play_obj is not self.__play_obj:
+                    # restarted at another volume by duck()
+                    continue
+                self.__play_from(0)
+
+
+_audio_bank = None
+_audio_mixer = None
+_audio_lock = threading.Lock()
+
+
+def audio_bank():
+    """the shared bank of decoded sounds, loaded on first use"""
+    global _audio_bank
+    with _audio_lock:
+        if _audio_bank is None:
+            _audio_bank = AudioBank()
+            _audio_bank.load()
+        return _audio_bank
+
+
+def audio_mixer():
+    """the shared mixer that plays sound cues"""
+    global _audio_mixer
+    bank = audio_bank()
+    with _audio_lock:
+        if _audio_mixer is None:
+            _audio_mixer = AudioMixer(bank)
+        return _audio_mixer
+
+
+def play_sound(name, volume=1.0, duck=True):
+    """cue the sound `name` of the current theme"""
+    audio_mixer().play(name, volume, duck)
@@ -1,18 +1,13 @@
 from PyQt6.QtWidgets import QWidget, QGridLayout
 from PyQt6.QtGui import (
     QFont,
-    QFontDatabase,
     QPalette
 )
-import time
-import threading
-import random
-import simpleaudio as sa
 
 from jparty.game import Board
 from jparty.style import MyLabel, CARDPAL, board_tile_color, board_tile_highlighted_color, board_text_color
-from jparty.constants import CATEGORY_REVEAL_TIME, QUESTION_REVEAL_TIME, BEFORE_REVEAL_WAIT_TIME
-from jparty.utils import resource_path
+from jparty.theme import theme, theme_registry
+from jparty.animation import Timeline, animator
 
 
 class CardLabel(QWidget):
@@ -21,9 +16,13 @@ class CardLabel(QWidget):
 
         self.label = MyLabel(text, self.startFontSize, parent=self)
         self.label.setAutosizeMargins(0.1)
-        self.label.setFont(QFont(QFontDatabase.applicationFontFamilies(0)))
-        self.setPalette(CARDPAL)
         self.setAutoFillBackground(True)
+        self.reskin(theme())
+        theme_registry().changed.connect(self.reskin)
+
+    def reskin(self, theme):
+        self.label.setFont(QFont(theme.board_font))
+        self.setPalette(CARDPAL)
 
     def startFontSize(self):
         return self.height() * 0.6
@@ -48,9 +47,12 @@ class QuestionCard(CardLabel):
         self.game = game
         self.__question = question
         super().__init__(self.__moneytext())
+        self.label.setAutosizeMargins(0.2)
+
+    def reskin(self, theme):
+        super().reskin(theme)
         # Board text color from theme (QColor) -> use .name() to get hex for stylesheet
         self.label.setStyleSheet(f"color: {board_text_color.name()}")
-        self.label.setAutosizeMargins(0.2)
 
     @property
     def question(self):
@@ -115,6 +117,7 @@ class BoardWidget(QWidget):
 
         self.questionwidget = None
         self.question_labels = []
+        self.__fill = None
 
         self.grid_layout = QGridLayout()
 
@@ -139,45 +142,59 @@ class BoardWidget(QWidget):
                     self.grid_layout.addWidget(label, y, x)
 
         self.setLayout(self.grid_layout)
+        game.model.round_loaded.connect(self.load_round)
+        game.model.card_removed.connect(self.remove_card)
         self.show()
 
     def load_round(self, round):
         gl = self.grid_layout
+        model = self.game.model
 
-        sa.WaveObject.from_wave_file(resource_path("board_fill.wav")).play()
-
-        category_delay = BEFORE_REVEAL_WAIT_TIME + 8 * QUESTION_REVEAL_TIME
-
+        fill = Timeline()
         for x in range(Board.size[0]):
             for y in range(Board.size[1], -1, -1):
                 if y == 0:
                     # Categories
                     gl.itemAtPosition(y, x).widget().setText("")
-                    threading.Thread(target=self.set_category, args=(x, y, round.categories[x], category_delay + x * CATEGORY_REVEAL_TIME)).start()
+                    fill.at(model.reveal_time(x, y), self.set_category, x, y, round.categories[x])
                 else:
                     # Questions
                     q = round.get_question(x, y - 1)
                     gl.itemAtPosition(y, x).widget().question = None
-                    threading.Thread(target=self.set_question, args=(x, y, q, random.randint(0, 5) * QUESTION_REVEAL_TIME + BEFORE_REVEAL_WAIT_TIME)).start()
+                    fill.at(model.reveal_time(x, y), self.set_question, x, y, q)
+
+        self.stop_fill()
+        self.__fill = animator().play(fill, f"board fill ({self.window().windowTitle()})")
+
+    def stop_fill(self):
+        if self.__fill is not None:
+            self.__fill.cancel()
+            self.__fill = None
 
     def resizeEvent(self, event):
         self.grid_layout.setSpacing(self.width() // 150)
+        if event is not None:
+            self.window().update_image_target()
 
-    def set_category(self, x, y, text, delay):
-        time.sleep(delay)
+    def set_category(self, x, y, text):
         gl = self.grid_layout
         gl.itemAtPosition(y, x).widget().setText(text)
-    
-    def set_question(self, x, y, question, delay):
-        time.sleep(delay)
+
+    def set_question(self, x, y, question):
         gl = self.grid_layout
         gl.itemAtPosition(y, x).widget().question = question
 
+    def remove_card(self, q):
+        for label in self.question_labels:
+            if label.question is q:
+                label.question = None
+
     @property
     def board(self):
         return self.game.current_round
 
     def clear(self):
+        self.stop_fill()
         gl = self.grid_layout
         for x in range(Board.size[0]):
             for y in range(Board.size[1] + 1):
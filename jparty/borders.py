@@ -3,9 +3,8 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
 from PyQt6.QtCore import Qt, QSize
 
 
-from jparty.utils import resource_path
-import time
-from threading import Thread, current_thread
+from jparty.theme import scaled_pixmap
+from jparty.animation import Timeline, animator
 
 
 class Borders(object):
@@ -13,6 +12,7 @@ class Borders(object):
         super().__init__()
         self.left = self.create_widget(parent, -1)
         self.right = self.create_widget(parent, 1)
+        self.__flash = None
 
     def __iter__(self):
         return iter([self.left, self.right])
@@ -20,16 +20,15 @@ class Borders(object):
     def create_widget(self, parent, d):
         return BorderWidget(parent, d)
 
-    def __flash(self):
-        self.lights(False)
-        time.sleep(0.2)
-        self.lights(True)
-        time.sleep(0.2)
-        self.lights(False)
-
     def flash(self):
-        self.__flash_thread = Thread(target=self.__flash, name="flash")
-        self.__flash_thread.start()
+        if self.__flash is not None:
+            self.__flash.cancel()
+        self.__flash = animator().play(
+            Timeline()
+            .at(0.0, self.lights, False)
+            .then(0.2, self.lights, True)
+            .then(0.2, self.lights, False)
+        )
 
     def lights(self, val):
         for b in self:
@@ -39,23 +38,32 @@ class Borders(object):
 class HostBorders(Borders):
     def __init__(self, parent):
         super().__init__(parent)
-        self.__active_thread = None
+        self.__active_hints = None
 
     def create_widget(self, parent, d):
         return HostBorderWidget(parent, d)
 
+    def show_hints(self, key):
+        for b in self:
+            b.show_hints(key)
+
+    def hide_hints(self, key):
+        for b in self:
+            b.hide_hints(key)
+
     def __flash_hints(self, key):
-        while self.__active_thread == current_thread():
-            for b in self:
-                b.show_hints(key)
-            time.sleep(0.5)
-            for b in self:
-               b.hide_hints(key)
-            time.sleep(0.5)
-
-    def buzz_hint(self):
-        self.__buzz_hint_thread = Thread(target=self.__buzz_hint, name="buzz_hint")
-        self.__buzz_hint_thread.start()
+        self.__stop_hints()
+        self.__active_hints = animator().play(
+            Timeline(loop=True)
+            .at(0.0, self.show_hints, key)
+            .at(0.5, self.hide_hints, key)
+            .wait(0.5)
+        )
+
+    def __stop_hints(self):
+        if self.__active_hints is not None:
+            self.__active_hints.cancel()
+            self.__active_hints = None
 
     def arrowhints(self, val):
         for b in self:
@@ -63,29 +71,17 @@ class HostBorders(Borders):
             b.update()
 
         if val:
-            self.__active_thread = Thread(
-                target=self.__flash_hints, args=("arrow",), name="arrow_hints"
-            )
-            self.__active_thread.start()
+            self.__flash_hints("arrow")
         else:
-            self.__active_thread = None
-            for b in self:
-                b.hide_hints("arrow")
+            self.__stop_hints()
+            self.hide_hints("arrow")
 
     def spacehints(self, val):
         if val:
-            self.__active_thread = Thread(
-                target=self.__flash_hints, args=("space",), name="space_hints"
-            )
-            self.__active_thread.start()
+            self.__flash_hints("space")
         else:
-            self.__active_thread = None
-            for b in self:
-                b.hide_hints("space")
-
-    def closeEvent(self, event):
-        super().closeEvent(event)
-        self.__active_hint = None
+            self.__stop_hints()
+            self.hide_hints("space")
 
 
 class BorderWidget(QWidget):
@@ -120,10 +116,8 @@ class HostBorderWidget(BorderWidget):
         self.setLayout(self.layout)
 
         self.__hint_images = {
-            "space": QPixmap(resource_path("space.png")),
-            "arrow": QPixmap(
-                resource_path(("right" if d == 1 else "left") + "-arrow.png")
-            ),
+            "space": "space.png",
+            "arrow": ("right" if d == 1 else "left") + "-arrow.png",
         }
 
         self.colors = False
@@ -131,10 +125,11 @@ class HostBorderWidget(BorderWidget):
 
     def show_hints(self, key):
         self.hint_label.setPixmap(
-            self.__hint_images[key].scaled(
+            scaled_pixmap(
+                self.__hint_images[key],
                 self.size() * 0.9,
+                self.devicePixelRatioF(),
                 Qt.AspectRatioMode.KeepAspectRatio,
-                transformMode=Qt.TransformationMode.SmoothTransformation,
             )
         )
 
@@ -0,0 +1,90 @@
+"""each player's buzz statistics, updated as each buzz is timed"""
+from array import array
+
+from jparty.constants import REACTION_BIN, REACTION_BINS
+
+TIMINGS = {"first": 0, "early": 1, "late": 2}
+
+
+class PlayerStats(object):
+    """one player's buzzes this game"""
+
+    __slots__ = ("counts", "fastest", "reactions", "total", "histogram")
+
+    def __init__(self):
+        self.counts = array("L", [0] * len(TIMINGS))
+        self.fastest = None  # of the first buzzes
+        self.reactions = 0  # first and late buzzes, timed from the clue opening
+        self.total = 0.0
+        self.histogram = array("L", [0] * (REACTION_BINS + 1))  # the last bin holds anything slower
+
+    def add(self, delay, timing):
+        self.counts[TIMINGS[timing]] += 1
+        if timing == "early":
+            return
+        if timing == "first" and (self.fastest is None or delay < self.fastest):
+            self.fastest = delay
+        self.reactions += 1
+        self.total += delay
+        self.histogram[min(int(delay / REACTION_BIN), REACTION_BINS)] += 1
+
+    def count(self, timing):
+        return self.counts[TIMINGS[timing]]
+
+    def mean(self):
+        return self.total / self.reactions if self.reactions else None
+
+    def percentile(self, p):
+        """the reaction time `p` percent of buzzes were at least as fast as, to within REACTION_BIN"""
+        if not self.reactions:
+            return None
+        rank = max(1, round(p / 100 * self.reactions))
+        seen = 0
+        for i, n in enumerate(self.histogram):
+            seen += n
+            if seen >= rank:
+                return (i + 1) * REACTION_BIN
+        return (REACTION_BINS + 1) * REACTION_BIN
+
+
+class BuzzStats(object):
+    """every player's PlayerStats for the game `engine` is running"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.__players = {}  # Player -> PlayerStats
+        self.__listeners = []
+        engine.subscribe(self.__event)
+
+    def subscribe(self, listener):
+        """call `listener(player)` when a player's stats change, or `listener(None)` when they all may have"""
+        self.__listeners.append(listener)
+
+    def __changed(self, player):
+        for listener in self.__listeners:
+            listener(player)
+
+    def get(self, player):
+        stats = self.__players.get(player)
+        if stats is None:
+            stats = self.__players[player] = PlayerStats()
+        return stats
+
+    def __event(self, name, *args):
+        if name == "time_buzz":
+            player, delay, timing = args
+            self.get(player).add(delay, timing)
+            self.__changed(player)
+        elif name == "update_score":
+            self.__changed(args[0])
+        elif name == "start":
+            self.__players = {}
+            for player in self.engine.players:
+                stats = self.get(player)
+                for buzz in player.buzz_delays:
+                    stats.add(buzz["delay"], buzz["timing"])
+            self.__changed(None)
+        elif name in ("players_updated", "game_closed"):
+            if name == "game_closed":
+                self.__players = {}
+            self.__changed(None)
@@ -0,0 +1,81 @@
+"""records a game night's input, for benchmarks/replay.py to replay"""
+import json
+import time
+import logging
+import itertools
+import threading
+
+from tornado.options import define, options
+
+define("capture", default="", help="record the game's input to this file, for benchmarks/replay.py", type=str)
+
+CAPTURE_VERSION = 1
+
+
+class Capture(object):
+    def __init__(self, path):
+        self.path = path
+        self.enabled = bool(path)
+        self.records = 0
+        self.__lock = threading.Lock()
+        self.__file = None
+        self.__start = None
+        self.__connections = itertools.count()
+
+    def connection(self):
+        """a new id for a websocket connection"""
+        return next(self.__connections)
+
+    def record(self, kind, **fields):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self.__lock:
+            if self.__file is None:
+                self.__start = now
+                self.__file = open(self.path, "w", encoding="utf-8")
+                self.__write({"kind": "capture", "version": CAPTURE_VERSION, "date": time.strftime("%Y-%m-%d %H:%M:%S")})
+                logging.info(f"capturing input to {self.path}")
+            self.__write({"t": now - self.__start, "kind": kind, **fields})
+            self.records += 1
+
+    def __write(self, record):
+        self.__file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.__file.flush()
+
+    def close(self):
+        with self.__lock:
+            if self.__file is not None:
+                self.__file.close()
+                self.__file = None
+                logging.info(f"captured {self.records} inputs to {self.path}")
+
+
+def read_capture(path):
+    """the inputs captured in `path`, in order, without the header. A torn last line is dropped"""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if record["kind"] == "capture":
+                if record["version"] > CAPTURE_VERSION:
+                    raise ValueError(f"{path} was captured by a newer version of JParty")
+                continue
+            records.append(record)
+    return records
+
+
+_capture = None
+_capture_lock = threading.Lock()
+
+
+def capture():
+    """the capture of this run, enabled by the --capture option"""
+    global _capture
+    with _capture_lock:
+        if _capture is None:
+            _capture = Capture(options.capture)
+        return _capture
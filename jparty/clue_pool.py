@@ -0,0 +1,101 @@
+"""clue widgets built while the board is idle, for the clues likeliest to be picked next"""
+from PyQt6.QtCore import QObject, QTimer
+
+import time
+import logging
+from collections import OrderedDict
+
+from jparty.config import config
+from jparty.theme import theme_registry
+from jparty.image_cache import image_cache
+from jparty.constants import CLUE_POOL_SIZE, CLUE_BUILD_INTERVAL
+
+
+class ClueWidgetPool(QObject):
+    def __init__(self, window, size=CLUE_POOL_SIZE):
+        super().__init__(window)
+        self.window = window
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.__built = OrderedDict()  # id(Question) -> hidden widget, likeliest first
+        self.__wanted = []  # Questions to build, likeliest first
+
+        # one widget per tick, so a click on the board never waits long
+        self.__timer = QTimer(self)
+        self.__timer.setInterval(int(CLUE_BUILD_INTERVAL * 1000))
+        self.__timer.timeout.connect(self.__build_next)
+
+        # widgets built for another theme or image setting are stale
+        theme_registry().changed.connect(self.clear)
+        config().changed.connect(self.__config_changed)
+
+    def prepare(self, questions):
+        """build widgets for the likeliest of `questions` (likeliest first) while idle"""
+        self.__wanted = [q for q in questions if not q.complete][: self.size]
+        wanted = {id(q) for q in self.__wanted}
+        for key in list(self.__built):
+            if key not in wanted:
+                self.__discard(key)
+        if self.__wanted:
+            self.__timer.start()
+        else:
+            self.__timer.stop()
+
+    def take(self, question):
+        """the hidden widget built for `question`, or None. Building pauses until the next prepare"""
+        self.__timer.stop()
+        self.__wanted = []
+        widget = self.__built.pop(id(question), None)
+        if widget is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return widget
+
+    def clear(self, *args):
+        """drop every built widget, e.g. when the round changes"""
+        self.__timer.stop()
+        self.__wanted = []
+        for key in list(self.__built):
+            self.__discard(key)
+
+    def __config_changed(self, key, value):
+        if key == 'showtextwithimages':
+            self.clear()
+
+    def __discard(self, key):
+        self.__built.pop(key).deleteLater()
+
+    def __buildable(self, q):
+        if q.video_link is not None:
+            return False
+        if q.image_link is None or q.image_content == b"Not Found":
+            return True
+        return image_cache().get(q.image_link, self.window.image_target_size()) is not None
+
+    def __build_next(self):
+        # don't compete with an open clue; the next prepare starts again
+        if self.window.question_widget is not None:
+            self.__timer.stop()
+            return
+        for q in self.__wanted:
+            if id(q) not in self.__built and self.__buildable(q):
+                break
+        else:
+            self.__timer.stop()
+            return
+
+        start = time.perf_counter()
+        widget = self.window.create_question_widget(q)
+        widget.setVisible(False)
+        widget.setGeometry(self.window.board_widget.geometry())
+        # lay out, fit and paint offscreen, so showing the widget finds everything cached
+        widget.grab()
+        self.__built[id(q)] = widget
+        logging.info(
+            f"{self.window.windowTitle()}: built clue {q.index} in {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+
+    def report(self):
+        logging.info(f"{self.window.windowTitle()}: clue pool {self.hits} hits, {self.misses} misses")
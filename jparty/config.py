@@ -0,0 +1,131 @@
+"""config.json, read once and validated; changes are announced through `changed`"""
+from PyQt6.QtCore import QObject, QFileSystemWatcher, pyqtSignal
+
+import os
+import json
+import logging
+import threading
+
+from jparty.constants import DEFAULT_CONFIG, CONFIG_PATH
+
+CHOICES = {
+    'showtextwithimages': ('Only show text', 'Only show image', 'Show both'),
+    'allownegative': ('True', 'False'),
+    'allownegativeinfinal': ('True', 'False'),
+}
+
+
+def validate(key, value):
+    """`value` converted to the type of its default, or the default if it isn't valid"""
+    default = DEFAULT_CONFIG[key]
+    try:
+        value = type(default)(value)
+    except (TypeError, ValueError):
+        logging.info(f"invalid setting {key}={value!r}, using {default!r}")
+        return default
+    if key in CHOICES and value not in CHOICES[key]:
+        logging.info(f"invalid setting {key}={value!r}, using {default!r}")
+        return default
+    return value
+
+
+class Config(QObject):
+    changed = pyqtSignal(str, object)  # key, new value
+
+    def __init__(self, path=CONFIG_PATH):
+        super().__init__()
+        self.path = os.path.abspath(path)
+        self.reads = 0  # times the file was read from disk
+        self.__lock = threading.Lock()
+        self.__values = dict(DEFAULT_CONFIG)
+        self.__written = None
+        self.__watcher = None
+        self.__load()
+
+    def __read(self):
+        try:
+            with open(self.path, 'r') as f:
+                self.reads += 1
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.info(f"cannot read {self.path}: {e}")
+            return None
+        if not isinstance(data, dict):
+            logging.info(f"{self.path} does not hold settings, ignoring it")
+            return None
+        return data
+
+    def __load(self):
+        data = self.__read()
+        if data is None:
+            return {}
+        values = dict(DEFAULT_CONFIG)
+        for key, value in data.items():
+            if key in DEFAULT_CONFIG:
+                values[key] = validate(key, value)
+        with self.__lock:
+            changes = {k: v for k, v in values.items() if self.__values.get(k) != v}
+            self.__values = values
+        return changes
+
+    def get(self, key, default=None):
+        with self.__lock:
+            return self.__values.get(key, default)
+
+    def __getitem__(self, key):
+        with self.__lock:
+            return self.__values[key]
+
+    def update(self, **values):
+        """validate and save `values`, notifying subscribers of what changed"""
+        with self.__lock:
+            new = dict(self.__values)
+            for key, value in values.items():
+                new[key] = validate(key, value)
+            changes = {k: v for k, v in new.items() if self.__values.get(k) != v}
+            self.__values = new
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(new, f)
+        os.replace(tmp_path, self.path)
+        self.__written = os.stat(self.path).st_mtime_ns
+        self.__notify(changes)
+
+    def __notify(self, changes):
+        for key, value in changes.items():
+            logging.info(f"setting {key} changed to {value!r}")
+            self.changed.emit(key, value)
+
+    def watch(self):
+        """pick up edits made to the file while JParty runs. Needs a running QApplication"""
+        if self.__watcher is None:
+            self.__watcher = QFileSystemWatcher(self)
+            self.__watcher.fileChanged.connect(self.__file_changed)
+        if os.path.exists(self.path) and self.path not in self.__watcher.files():
+            self.__watcher.addPath(self.path)
+
+    def __file_changed(self, path):
+        # editors often replace the file, which drops it from the watcher
+        self.watch()
+        try:
+            if os.stat(self.path).st_mtime_ns == self.__written:
+                return  # our own write
+        except FileNotFoundError:
+            return
+        self.__notify(self.__load())
+
+
+_config = None
+_config_lock = threading.Lock()
+
+
+def config():
+    """the shared settings"""
+    global _config
+    with _config_lock:
+        if _config is None:
+            _config = Config()
+        return _config
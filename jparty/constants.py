@@ -5,14 +5,51 @@ MAXPLAYERS = 8
 PORT = 8080
 VIDEO_PORT = 8081
 VIDEO_PLAY_TIME = 10
+VIDEO_POOL_SIZE = 3
 BEFORE_REVEAL_WAIT_TIME = 1
 CATEGORY_REVEAL_TIME = 2
 QUESTION_REVEAL_TIME = 0.4
+PACK_EXTENSION = ".jparty"
+PACK_IMAGE_SIZE = (1920, 1080)
+ARCHIVE_DIR = "archive"
+IMAGE_TIMEOUT = 5
+PREFETCH_WORKERS = 4
+PREFETCH_HOST_CONCURRENCY = 2
+PREFETCH_HOST_INTERVAL = 0.5
+MEDIA_CACHE_DIR = "media_cache"
+MIN_MEDIA_CACHE_SIZE = 10  # MB
+MAX_MEDIA_CACHE_SIZE = 100000
+NEGATIVE_TTL_TIMEOUT = 6 * 60 * 60
+NEGATIVE_TTL_ERROR = 60
+NEGATIVE_TTL_INVALID = 7 * 24 * 60 * 60
+IMAGE_CACHE_BYTES = 256 * 1024 * 1024
+IMAGE_DECODE_WORKERS = 2
+IMAGE_DEADLINE = 3
+GUI_MONITOR_INTERVAL = 0.05
+INGEST_WORKERS = 2
+INGEST_JPEG_QUALITY = 85
+DUCK_VOLUME = 0.3
+MAX_VOICES = 8
+CONFIG_PATH = "config.json"
+PIXMAP_CACHE_ENTRIES = 128
+AUTOFIT_CACHE_ENTRIES = 4096
+ANIMATION_FRAME = 1 / 60
+SHADOW_CACHE_ENTRIES = 512
+CLUE_POOL_SIZE = 6
+CLUE_BUILD_INTERVAL = 0.05
+JOURNAL_PATH = "journal.jsonl"
+JOURNAL_FSYNC_INTERVAL = 0.25
+JOURNAL_COMPACT_RECORDS = 200
+REACTION_BIN = 0.01
+REACTION_BINS = 500
+HISTORY_PATH = "history.sqlite3"
+HISTORY_FLUSH_INTERVAL = 1.0
 
 DEFAULT_CONFIG = {
   'theme': 'Default',
   'showtextwithimages': 'Show both',
   'earlybuzztimeout': 500,
   'allownegative': 'True',
-  'allownegativeinfinal': 'True'
-}
\ No newline at end of file
+  'allownegativeinfinal': 'True',
+  'mediacachesize': 500
+}
@@ -13,7 +13,8 @@ from jparty.environ import root
 from jparty.game import Player
 from jparty.constants import MAXPLAYERS, PORT
 import json
-from jparty.utils import resource_path
+from jparty.theme import theme
+from jparty.capture import capture
 
 
 define("port", default=PORT, help="run on the given port", type=int)
@@ -39,13 +40,8 @@ class Application(tornado.web.Application):
 
 class WelcomeHandler(tornado.web.RequestHandler):
     def get(self):
-        # Load theme config so the buzzer web page can use theme colors
-        try:
-            with open(resource_path('theme_config.json'), 'r') as tf:
-                theme = json.load(tf)
-        except Exception:
-            theme = {}
-        theme_colors = theme.get('colors', theme)
+        # colors of the current theme, so the buzzer web page matches the board
+        theme_colors = theme().colors
         theme_json = json.dumps(theme_colors)
 
         self.render("index.html", messages=BuzzerSocketHandler.cache, theme=theme_colors, theme_json=theme_json)
@@ -59,12 +55,7 @@ class BuzzerHandler(tornado.web.RequestHandler):
         else:
             logging.info(f"cookie: {self.get_cookie('test')}")
         # Pass theme to play page too in case it's needed
-        try:
-            with open(resource_path('theme_config.json'), 'r') as tf:
-                theme = json.load(tf)
-        except Exception:
-            theme = {}
-        theme_colors = theme.get('colors', theme)
+        theme_colors = theme().colors
         theme_json = json.dumps(theme_colors)
         self.render("play.html", messages=BuzzerSocketHandler.cache, theme=theme_colors, theme_json=theme_json)
 
@@ -84,6 +75,7 @@ class BuzzerSocketHandler(tornado.websocket.WebSocketHandler):
 
     def open(self):
         self.set_nodelay(True)
+        self.connection = capture().connection()
 
     def send(self, msg, text=""):
         data = {"message": msg, "text": text}
@@ -112,6 +104,7 @@ class BuzzerSocketHandler(tornado.websocket.WebSocketHandler):
             self.send("EXISTS", tornado.escape.json_encode(p.state()))
 
     def on_message(self, message):
+        capture().record("message", connection=self.connection, message=message)
         # do this first to kill latency
         if "BUZZ" in message:
             logging.info(f"received buzzer press")
@@ -160,6 +153,7 @@ class BuzzerSocketHandler(tornado.websocket.WebSocketHandler):
             f"New Player: {self.player} {self.request.remote_ip} {self.player.token.hex()}"
         )
         self.send("TOKEN", self.player.token.hex())
+        capture().record("token", connection=self.connection, token=self.player.token.hex())
 
     def buzz(self):
         self.application.controller.buzz(self.player)
@@ -206,19 +200,20 @@ class BuzzerController:
 
     def restart(self):
         for p in self.connected_players:
-            p.waiter.close()
+            if p.waiter is not None:
+                p.waiter.close()
         self.connected_players = []
         self.accepting_players = True
 
     def buzz(self, player):
-        if self.game:
-            i_player = self.game.players.index(player)
-            self.game.buzz_trigger.emit(i_player)
-        else:
-            i_player = self.connected_players.index(player)
-            self.game.buzz_hint_trigger.emit(i_player)
+        if player not in self.game.players:
+            return  # rejoined a game that hasn't been resumed yet
+        i_player = self.game.players.index(player)
+        self.game.buzz_trigger.emit(i_player)
 
     def wager(self, player, amount):
+        if player not in self.game.players:
+            return
         i_player = self.game.players.index(player)
         self.game.wager_trigger.emit(i_player, amount)
 
@@ -245,7 +240,11 @@ class BuzzerController:
             return f"{localip}:{self.port}"
 
     def player_with_token(self, token, buzzerColor):
-        for p in self.connected_players:
+        players = self.connected_players
+        # phones of the game cut short last time get their players back, ready for it to be resumed
+        if self.game.resumable() is not None:
+            players = players + self.game.resumable().players
+        for p in players:
             logging.info(f"{p.token}, {token}")
             if p.token.hex() == token:
                 logging.info("PLAYER MATCH")
@@ -259,15 +258,19 @@ class BuzzerController:
         if players is None:
             players = self.connected_players
 
+        # players of a resumed game who haven't rejoined yet get the page when they do
         for p in players:
-            p.waiter.send("PROMPTWAGER", str(max(p.score, 0)))
             p.page = "wager"
+            if p.waiter is not None:
+                p.waiter.send("PROMPTWAGER", str(max(p.score, 0)))
 
     def prompt_answers(self):
         for p in self.connected_players:
-            p.waiter.send("PROMPTANSWER")
             p.page = "answer"
+            if p.waiter is not None:
+                p.waiter.send("PROMPTANSWER")
 
     def toolate(self):
         for p in self.connected_players:
-            p.waiter.send("TOOLATE")
+            if p.waiter is not None:
+                p.waiter.send("TOOLATE")
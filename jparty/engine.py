@@ -0,0 +1,944 @@
+"""the rules of the game, without Qt: an `Engine` reports everything that happens as events to its listeners"""
+import os
+import sys
+import time
+import heapq
+import logging
+import threading
+import itertools
+from array import array
+from dataclasses import dataclass
+from functools import partial
+
+from jparty.constants import FJTIME, QUESTIONTIME, DEFAULT_CONFIG
+
+# podium lights
+LIGHTS_OFF = "off"
+LIGHTS_ON = "on"
+LIGHTS_RUNNING = "running"  # counting down an answer
+LIGHTS_TIMED_OUT = "timed out"  # locked out for buzzing early
+
+# the host's keys
+KEY_LEFT = "left"
+KEY_RIGHT = "right"
+KEY_SPACE = "space"
+KEY_F5 = "f5"
+KEY_TAB = "tab"
+
+SONG_STOP = "stop"
+SONG_FINAL = "final"
+
+# events that change what the displays show, applied to the GameModel method of the same name.
+# The others are play_sound, song, the hints, player_removed, the wager and answer events,
+# too_late, final_judged, answer_judged, show_stats and game_closed
+DISPLAY_EVENTS = (
+    "start",
+    "reset",
+    "load_round",
+    "load_final",
+    "open_clue",
+    "reveal_clue",
+    "close_clue",
+    "preload_clues",
+    "players_updated",
+    "update_score",
+    "set_lights",
+    "hint_buzz",
+    "time_buzz",
+    "clear_buzz",
+    "set_in_control",
+    "set_border_lights",
+    "flash_borders",
+    "start_final_judgement",
+    "set_final_guess",
+    "set_final_wager",
+    "decide_final",
+)
+
+
+@dataclass(slots=True)
+class Question:
+    index: tuple
+    text: str
+    answer: str
+    category: str
+    image_link: str = None
+    video_link: str = None
+    image_content: str = None
+    value: int = -1
+    dd: bool = False
+    complete: bool = False
+
+
+class Board(object):
+    """
+    a round of clues in a fixed grid of `size` cells, column by column. Which
+    cells hold a clue and which have been played are bitmasks over the grid,
+    so finding a clue, checking whether the round is over and tallying what is
+    left on the board take the same time however far into the round it is
+    """
+
+    __slots__ = (
+        "categories",
+        "dj",
+        "questions",
+        "dd_indices",
+        "remaining_value",
+        "__cells",
+        "__values",
+        "__present",
+        "__done",
+    )
+    size = (6, 5)
+
+    def __init__(self, categories, questions, dj=False):
+        self.categories = categories
+        self.dj = dj
+        if not questions is None:
+            self.questions = questions
+        else:
+            self.questions = []
+
+        cols, rows = self.size
+        self.__cells = [None] * (cols * rows)
+        self.__values = array("i", bytes(4 * cols * rows))  # each card's value as dealt
+        self.__present = 0
+        self.__done = 0
+        self.remaining_value = 0
+        dd_indices = []
+        for q in self.questions:
+            cell = self.__cell(*q.index)
+            if cell is None:
+                logging.warning(f"clue {q.index} is off the board")
+                continue
+            self.__cells[cell] = q
+            self.__values[cell] = max(q.value, 0)
+            self.__present |= 1 << cell
+            if q.complete:
+                self.__done |= 1 << cell
+            else:
+                self.remaining_value += self.__values[cell]
+            if q.dd:
+                dd_indices.append(q.index)
+        self.dd_indices = tuple(dd_indices)
+
+    def __cell(self, i, j):
+        cols, rows = self.size
+        if 0 <= i < cols and 0 <= j < rows:
+            return i * rows + j
+        return None
+
+    def get_question(self, i, j):
+        cell = self.__cell(i, j)
+        return None if cell is None else self.__cells[cell]
+
+    def complete(self):
+        """whether every cell of the board has a clue"""
+        return self.__present == (1 << len(self.__cells)) - 1
+
+    def mark_complete(self, question):
+        """take `question` off the board"""
+        question.complete = True
+        cell = self.__cell(*question.index)
+        if not self.__done >> cell & 1:
+            self.__done |= 1 << cell
+            self.remaining_value -= self.__values[cell]
+
+    def cleared(self):
+        """whether every clue on the board has been played"""
+        return self.__done == self.__present
+
+    def remaining(self):
+        """the clues still on the board, column by column"""
+        left = self.__present & ~self.__done
+        questions = []
+        while left:
+            bit = left & -left
+            questions.append(self.__cells[bit.bit_length() - 1])
+            left ^= bit
+        return questions
+
+
+class FinalBoard(Board):
+    __slots__ = ("category", "question")
+    size = (1, 1)
+
+    def __init__(self, category, question):
+        super().__init__([category], [question], dj=False)
+        self.category = category
+        self.question = question
+
+
+@dataclass
+class GameData:
+    rounds: list
+    date: str
+    comments: str
+
+
+class Player(object):
+    def __init__(self, name, buzzerColor, waiter):
+        logging.info(f"Player init received buzzerColor: {buzzerColor}")
+        self.buzzercolor = buzzerColor
+        self.name = name
+        self.token = os.urandom(15)
+        self.score = 0
+        self.waiter = waiter
+        self.wager = None
+        self.finalanswer = ""
+        self.page = "buzz"
+        self.istimedout = False
+
+        # Stats
+        self.buzz_time = None
+        self.buzz_delays = []
+        self.stats = {
+            "correct": 0,
+            "incorrect": 0,
+            "revenue": 0,
+            "losses": 0,
+        }
+
+    def __hash__(self):
+        return int.from_bytes(self.token, sys.byteorder)
+
+    def state(self):
+        return {"page": self.page, "score": self.score}
+
+
+@dataclass
+class KeystrokeEvent:
+    key: str
+    func: callable
+    hint_setter: callable = None
+    active: bool = False
+    persistent: bool = False
+
+
+class KeystrokeManager(object):
+    def __init__(self):
+        super().__init__()
+        self.__events = {}
+
+    def addEvent(
+        self, ident, key, func, hint_setter=None, active=False, persistent=False
+    ):
+        self.__events[ident] = KeystrokeEvent(
+            key, func, hint_setter, active, persistent
+        )
+
+    def call(self, key):
+        """this is split in to two for loops so one execution doesnt cause another event to trigger"""
+        events_to_call = []
+        for ident, event in self.__events.items():
+            if event.active and event.key == key:
+                logging.info(f"Calling {ident}")
+                events_to_call.append(event)
+                if not event.persistent:
+                    self._deactivate(ident)
+
+        for event in events_to_call:
+            event.func()
+
+    def _activate(self, ident):
+        logging.info(f"Activating {ident}")
+        e = self.__events[ident]
+        e.active = True
+        if e.hint_setter:
+            e.hint_setter(True)
+
+    def _deactivate(self, ident):
+        e = self.__events[ident]
+        e.active = False
+        if e.hint_setter:
+            e.hint_setter(False)
+
+    def activate(self, *idents):
+        for ident in idents:
+            self._activate(ident)
+
+    def deactivate(self, *idents):
+        for ident in idents:
+            self._deactivate(ident)
+
+    def active(self):
+        """the idents of the events that a key would trigger now"""
+        return [ident for ident, event in self.__events.items() if event.active]
+
+
+class TimerEntry(object):
+    def __init__(self, deadline, callback):
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Clock(object):
+    """deadlines on a clock, earliest first. Subclasses tell the time with `now()` and run what falls due"""
+
+    def __init__(self):
+        self.__lock = threading.Lock()  # deadlines may be added from any thread
+        self.__heap = []  # (deadline, sequence, TimerEntry)
+        self.__sequence = itertools.count()
+
+    def call_at(self, deadline, callback):
+        """call `callback` at clock time `deadline`"""
+        entry = TimerEntry(deadline, callback)
+        with self.__lock:
+            heapq.heappush(self.__heap, (deadline, next(self.__sequence), entry))
+        self._scheduled()
+        return entry
+
+    def call_later(self, delay, callback):
+        """call `callback` in `delay` seconds"""
+        return self.call_at(self.now() + delay, callback)
+
+    def _scheduled(self):
+        """a deadline was added"""
+
+    def next_deadline(self):
+        with self.__lock:
+            while self.__heap and self.__heap[0][2].cancelled:
+                heapq.heappop(self.__heap)
+            return self.__heap[0][0] if self.__heap else None
+
+    def _pop_due(self, now):
+        """the earliest entry due by `now`, taken off the clock, or None"""
+        with self.__lock:
+            while self.__heap:
+                deadline, _, entry = self.__heap[0]
+                if not entry.cancelled and deadline > now:
+                    return None
+                heapq.heappop(self.__heap)
+                if not entry.cancelled:
+                    entry.cancelled = True  # fired entries can't fire again
+                    return entry
+            return None
+
+
+class ManualClock(Clock):
+    """a clock that only moves when `advance` is called, for running games headless"""
+
+    def __init__(self, start=0.0):
+        super().__init__()
+        self.time = start
+
+    def now(self):
+        return self.time
+
+    def advance(self, seconds):
+        """move time on by `seconds`, running every callback that falls due, in order"""
+        end = self.time + seconds
+        while True:
+            entry = self._pop_due(end)
+            if entry is None:
+                break
+            self.time = max(self.time, entry.deadline)
+            entry.callback()
+        self.time = end
+
+
+class Countdown(object):
+    """a countdown of `interval` seconds on `clock` that can be paused, calling `f` when it runs out"""
+
+    def __init__(self, clock, interval, f, *args, **kwargs):
+        super().__init__()
+        self.clock = clock
+        self.f = f
+        self.args = args
+        self.kwargs = kwargs
+        self.interval = interval
+        self.__remaining = interval
+        self.__started = None  # clock time of the last resume, while running
+        self.__entry = None
+        self.__cancelled = False
+
+    @property
+    def running(self):
+        return self.__entry is not None
+
+    @property
+    def remaining(self):
+        if self.__started is None:
+            return self.__remaining
+        return max(0.0, self.__remaining - (self.clock.now() - self.__started))
+
+    def start(self):
+        """wrapper for resume"""
+        self.resume()
+
+    def cancel(self):
+        """stop for good: the countdown can't be resumed afterwards"""
+        self.pause()
+        self.__cancelled = True
+
+    def pause(self):
+        if not self.running:
+            return
+        self.__entry.cancel()
+        self.__entry = None
+        self.__remaining = self.remaining
+        self.__started = None
+
+    def resume(self):
+        if self.running or self.__cancelled:
+            return
+        self.__started = self.clock.now()
+        self.__entry = self.clock.call_at(self.__started + self.__remaining, self.__expire)
+
+    def __expire(self):
+        self.__entry = None
+        self.__remaining = 0.0
+        self.__started = None
+        self.f(*self.args, **self.kwargs)
+
+
+class Engine(object):
+    def __init__(self, clock, config=DEFAULT_CONFIG):
+        self.clock = clock
+        self.config = config
+        self.__listeners = []
+
+        self.data = None
+
+        self.current_round = None
+        self.players = []
+
+        self.active_question = None
+        self.last_question = None  # the clue picked before, this round
+        self.accepting_responses = False
+        self.accepting_responses_time = None
+        self.answering_player = None
+        self.previous_answerer = []
+        self.timer = None
+        self.soliciting_player = False  # part of selecting who found a daily double
+        self.player_in_control = None
+
+        self.final_responses_closed = False
+        self.final_judged = []  # players whose final answer has been judged, in order
+        self.__sorted_players = None
+        self.__buzz_timed = set()  # players whose buzz was timed on the open clue
+
+        self.keystroke_manager = KeystrokeManager()
+        hints = {name: partial(self.emit, name) for name in ("arrowhints", "spacehints", "adminhints")}
+
+        self.keystroke_manager.addEvent(
+            "CORRECT_ANSWER", KEY_LEFT, self.correct_answer, hints["arrowhints"]
+        )
+        self.keystroke_manager.addEvent(
+            "INCORRECT_ANSWER", KEY_RIGHT, self.incorrect_answer, hints["arrowhints"]
+        )
+        self.keystroke_manager.addEvent(
+            "BACK_TO_BOARD", KEY_SPACE, self.back_to_board, hints["spacehints"]
+        )
+        self.keystroke_manager.addEvent(
+            "OPEN_RESPONSES", KEY_SPACE, self.open_responses, hints["spacehints"]
+        )
+        self.keystroke_manager.addEvent(
+            "NEXT_ROUND", KEY_SPACE, self.next_round, hints["spacehints"]
+        )
+        self.keystroke_manager.addEvent(
+            "OPEN_FINAL", KEY_SPACE, self.open_final, hints["spacehints"]
+        )
+        self.keystroke_manager.addEvent(
+            "CLOSE_GAME", KEY_SPACE, self.close_game, hints["spacehints"]
+        )
+        self.keystroke_manager.addEvent(
+            "FINAL_OPEN_RESPONSES",
+            KEY_SPACE,
+            self.final_open_responses,
+            hints["spacehints"],
+        )
+        self.keystroke_manager.addEvent(
+            "FINAL_NEXT_PLAYER",
+            KEY_SPACE,
+            self.final_next_player,
+            hints["spacehints"],
+        )
+        self.keystroke_manager.addEvent(
+            "FINAL_SHOW_ANSWER",
+            KEY_SPACE,
+            self.final_show_answer,
+            hints["spacehints"],
+        )
+        self.keystroke_manager.addEvent(
+            "FINAL_CORRECT_ANSWER",
+            KEY_LEFT,
+            self.final_correct_answer,
+            hints["arrowhints"],
+        )
+        self.keystroke_manager.addEvent(
+            "FINAL_INCORRECT_ANSWER",
+            KEY_RIGHT,
+            self.final_incorrect_answer,
+            hints["arrowhints"],
+        )
+        self.keystroke_manager.addEvent(
+            "ADMIN_SKIP_ROUND",
+            KEY_F5,
+            self.admin_skip_round,
+            hints["adminhints"],
+        )
+        self.keystroke_manager.activate("ADMIN_SKIP_ROUND")
+        self.keystroke_manager.addEvent(
+            "ADMIN_SHOW_STATS",
+            KEY_TAB,
+            self.show_stats,
+            hints["adminhints"],
+            persistent=True
+        )
+        self.keystroke_manager.activate("ADMIN_SHOW_STATS")
+
+    def subscribe(self, listener):
+        """call `listener(name, *args)` for every event"""
+        self.__listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.__listeners.remove(listener)
+
+    def emit(self, name, *args):
+        for listener in self.__listeners:
+            listener(name, *args)
+
+    def press(self, key):
+        """the host pressed `key`, one of the KEY_* names"""
+        self.keystroke_manager.call(key)
+
+    def show_stats(self):
+        self.emit("show_stats")
+
+    def valid_game(self):
+        return self.data is not None and all(b.complete() for b in self.data.rounds)
+
+    def start_game(self):
+        self.current_round = self.data.rounds[0]
+        self.emit("song", SONG_STOP)
+        self.emit("play_sound", "board_fill.wav")
+        self.emit("start", self.current_round)
+        self.preload_clues()
+
+    def resume(self, data, players, round_index, in_control=None, responses_closed=False, judged=()):
+        """
+        pick up a game part way through: `data` with its played clues marked
+        complete, `players` with their scores, on the board of round
+        `round_index`. In Final Jeopardy, the judgement carries on after the
+        `judged` players once responses were closed; before that, the wagers
+        not yet made are asked for again
+        """
+        self.data = data
+        self.current_round = data.rounds[round_index]
+        self.set_players(players)
+        final = isinstance(self.current_round, FinalBoard)
+        if final and (responses_closed or judged):
+            self.final_responses_closed = True
+            self.final_judged = list(judged)
+            if judged:
+                rest = [p for p in players if p not in judged]
+                self.__sorted_players = self.final_judged + sorted(rest, key=lambda x: x.score)
+        self.emit("song", SONG_STOP)
+
+        if not final:
+            self.emit("play_sound", "board_fill.wav")
+            self.emit("start", self.current_round)
+            self.set_player_in_control(in_control)
+            self.preload_clues()
+            if self.current_round.cleared():
+                self.keystroke_manager.activate("NEXT_ROUND")
+            return
+
+        # the last round's board, cleared, as the Final Jeopardy clue comes up
+        self.emit("start", data.rounds[round_index - 1])
+        self.emit("load_final", self.current_round.question)
+        if not self.final_responses_closed:
+            self.open_wagers()
+            return
+
+        self.emit("reveal_clue")
+        if judged:
+            self.emit("start_final_judgement")
+        self.keystroke_manager.activate("FINAL_NEXT_PLAYER")
+
+    def set_players(self, players):
+        self.players = players
+        self.emit("players_updated")
+
+    def remove_player(self, player):
+        self.players.remove(player)
+        self.emit("player_removed", player)
+        self.emit("players_updated")
+
+    def admin_skip_round(self):
+        if isinstance(self.current_round, FinalBoard):
+            return
+        self.next_round()
+        self.keystroke_manager.activate("ADMIN_SKIP_ROUND")
+
+    def upcoming_clues(self):
+        """the clues left in the round, the likeliest next pick first"""
+        if isinstance(self.current_round, FinalBoard):
+            return [self.current_round.question]
+
+        last = self.last_question
+
+        def likelihood(q):
+            # the next clue down the last category, then the cheapest clues from the left
+            follows = last is not None and q.index == (last.index[0], last.index[1] + 1)
+            return (not follows, q.index[1], q.index[0])
+
+        return sorted(self.current_round.remaining(), key=likelihood)
+
+    def preload_clues(self):
+        """get the likeliest next clues of the round ready, while the board is idle"""
+        self.emit("preload_clues", self.upcoming_clues())
+
+    def open_responses(self):
+        self.emit("set_border_lights", True)
+        self.accepting_responses = True
+        self.accepting_responses_time = self.clock.now()
+
+        # Set stats for players who buzzed early
+        for player in self.players:
+            if player.buzz_time is not None:
+                self.__time_buzz(player, self.clock.now() - player.buzz_time, "early")
+                player.buzz_time = None
+
+        if not self.timer:
+            self.timer = Countdown(self.clock, QUESTIONTIME, self.stumped)
+
+        self.timer.start()
+
+    def close_responses(self):
+        self.timer.pause()
+        self.accepting_responses = False
+        self.emit("set_border_lights", True)
+
+    def __time_buzz(self, player, delay, timing):
+        """how long after the clue opened `player` buzzed, once per clue"""
+        if player in self.__buzz_timed:
+            return
+        self.__buzz_timed.add(player)
+        # kept with the player for the end of game stats
+        player.buzz_delays.append({"delay": delay, "timing": timing})
+        self.emit("time_buzz", player, delay, timing)
+
+    def buzz(self, player):
+        if self.active_question is None:
+            self.emit("hint_buzz", player)
+            return
+
+        already_answered = False
+        player_already_timed_out = player.istimedout
+
+        # Check if player is already answering or timed out
+        if player_already_timed_out == True or self.answering_player is player:
+            return
+
+        if self.accepting_responses and self.answering_player is None:
+            # First buzz on time
+            self.__time_buzz(player, self.clock.now() - self.accepting_responses_time, "first")
+        elif not self.accepting_responses and self.answering_player is None:
+            # Buzzed in too early
+            player.buzz_time = self.clock.now()
+        else:
+            # Buzzed in after someone else
+            self.__time_buzz(player, self.clock.now() - self.accepting_responses_time, "late")
+
+        # Check if player already answered incorrectly
+        for prev_player in self.previous_answerer:
+            if prev_player is player:
+                already_answered = True
+
+        if not self.accepting_responses:
+            logging.info(f"player buzzed early")
+            self.lock_out(player)
+        elif not already_answered:
+            logging.info(f"buzz ({time.time():.6f} s)")
+            self.accepting_responses = False
+            self.timer.pause()
+            self.previous_answerer.append(player)
+            self.emit("set_lights", player, LIGHTS_RUNNING)
+
+            self.answering_player = player
+            self.keystroke_manager.activate("CORRECT_ANSWER", "INCORRECT_ANSWER")
+            self.emit("set_border_lights", False)
+        else:
+            pass
+
+    def lock_out(self, player):
+        """ignore the buzzer of `player` for a while, for buzzing in early"""
+        player.istimedout = True
+        self.emit("set_lights", player, LIGHTS_TIMED_OUT)
+        Countdown(
+            self.clock, self.config['earlybuzztimeout'] / 1000, self.end_lock_out, player
+        ).start()
+
+    def end_lock_out(self, player):
+        player.istimedout = False
+        if player in self.players:
+            self.emit("set_lights", player, LIGHTS_OFF)
+
+    def answer_given(self):
+        self.keystroke_manager.deactivate("CORRECT_ANSWER", "INCORRECT_ANSWER")
+        self.emit("set_lights", self.answering_player, LIGHTS_OFF)
+        self.answering_player = None
+
+    def back_to_board(self):
+        logging.info("back_to_board")
+        self.emit("close_clue")
+        self.timer = None
+        self.current_round.mark_complete(self.active_question)
+        self.last_question = self.active_question
+        self.active_question = None
+        self.previous_answerer = []
+        self.preload_clues()
+        if self.current_round.cleared():
+            logging.info("NEXT ROUND")
+            self.keystroke_manager.activate("NEXT_ROUND")
+            self.keystroke_manager.activate("ADMIN_SHOW_STATS")
+
+        # clear stats
+        self.__buzz_timed.clear()
+        for player in self.players:
+            player.buzz_time = None
+            self.emit("clear_buzz", player)
+
+    def set_player_in_control(self, new_player):
+        self.player_in_control = new_player
+        self.emit("set_in_control", new_player)
+
+    def next_round(self):
+        logging.info("next round")
+        i = self.data.rounds.index(self.current_round)
+        self.current_round = self.data.rounds[i + 1]
+        self.last_question = None
+        self.preload_clues()
+
+        if isinstance(self.current_round, FinalBoard):
+            self.set_player_in_control(None)
+
+            self.emit("load_final", self.current_round.question)
+            self.start_final()
+        else:
+            # Highlight player with least money to have control
+            losing_player = min(self.players, key=lambda p: p.score)
+            self.set_player_in_control(losing_player)
+
+            self.emit("play_sound", "board_fill.wav")
+            self.emit("load_round", self.current_round)
+
+    def start_final(self):
+        logging.info("start final")
+
+        if self.config.get('allownegativeinfinal', 'True') != 'True':
+            for player in self.players.copy():  # Use copy for iteration
+                if player.score < 0:
+                    self.remove_player(player)  # Remove from original list
+
+        self.open_wagers()
+
+    def open_wagers(self):
+        """ask for every Final Jeopardy wager not made yet"""
+        waiting = [p for p in self.players if p.wager is None]
+        for player in waiting:
+            self.emit("set_lights", player, LIGHTS_ON)
+        if waiting:
+            self.emit("wagers_opened", waiting)
+        else:
+            self.wagers_in()
+
+    def wager(self, player, amount):
+        player.wager = amount
+        self.emit("set_lights", player, LIGHTS_OFF)
+        self.emit("wager_made", player, amount)
+        logging.info(f"{player} wagered {amount}")
+        if all(p.wager is not None for p in self.players):
+            self.wagers_in()
+
+    def wagers_in(self):
+        self.emit("wagers_in")
+        self.keystroke_manager.activate("OPEN_FINAL")
+
+    def answer(self, player, guess):
+        player.finalanswer = guess
+        self.emit("final_answer_made", player)
+        logging.info(f"{player} guessed {guess}")
+
+    def final_open_responses(self):
+        self.emit("set_border_lights", True)
+        self.emit("answers_prompted")
+
+        self.emit("song", SONG_FINAL)
+
+        self.timer = Countdown(self.clock, FJTIME, self.final_finished_song)
+        self.timer.start()
+
+    def final_next_player(self):
+        for p in self.players:
+            self.emit("set_lights", p, LIGHTS_OFF)
+
+        if self.__sorted_players is None:
+            self.emit("start_final_judgement")
+            self.__sorted_players = sorted(self.players, key=lambda x: x.score)
+
+        elif len(self.final_judged) == len(self.players):
+            self.end_game()
+            return
+
+        self.answering_player = self.__sorted_players[len(self.final_judged)]
+
+        self.emit("set_lights", self.answering_player, LIGHTS_ON)
+
+        self.emit("set_final_guess", "")
+        self.emit("set_final_wager", "")
+
+        self.keystroke_manager.activate("FINAL_SHOW_ANSWER")
+
+    def final_show_answer(self):
+        answer = self.answering_player.finalanswer
+        if answer == "":
+            answer = "________"
+
+        self.emit("set_final_guess", answer)
+        self.keystroke_manager.activate(
+            "FINAL_CORRECT_ANSWER", "FINAL_INCORRECT_ANSWER"
+        )
+
+    def final_correct_answer(self):
+        ap = self.answering_player
+        self.set_score(ap, ap.score + ap.wager)
+        self.emit("answer_judged", ap, self.current_round.question, True, ap.wager)
+        self.final_judgement_given()
+
+    def final_incorrect_answer(self):
+        ap = self.answering_player
+        self.set_score(ap, ap.score - ap.wager)
+        self.emit("answer_judged", ap, self.current_round.question, False, ap.wager)
+        self.final_judgement_given()
+
+    def final_judgement_given(self):
+        self.keystroke_manager.deactivate(
+            "FINAL_CORRECT_ANSWER", "FINAL_INCORRECT_ANSWER"
+        )
+        self.emit("set_final_wager", str(self.answering_player.wager))
+        self.keystroke_manager.activate("FINAL_NEXT_PLAYER")
+        self.final_judged.append(self.answering_player)
+        self.emit("final_judged", self.answering_player)
+
+    def final_finished_song(self):
+        logging.info("Final song ended")
+        self.accepting_responses = False
+        self.final_responses_closed = True
+        self.emit("too_late")
+        self.emit("flash_borders")
+        self.keystroke_manager.activate("FINAL_NEXT_PLAYER")
+
+    def end_game(self):
+        top_score = max([p.score for p in self.players])
+        winners = [p for p in self.players if p.score == top_score]
+        for w in winners:
+            self.emit("set_lights", w, LIGHTS_ON)
+
+        self.emit("decide_final", winners)
+
+        self.emit("play_sound", "applause.wav")
+
+        logging.info("activate close game")
+        self.keystroke_manager.activate("CLOSE_GAME")
+
+    def close_game(self):
+        self.players = []
+        self.current_round = None
+        self.last_question = None
+        self.answering_player = None
+        self.timer = None
+        self.data = None
+        self.player_in_control = None
+        self.final_responses_closed = False
+        self.final_judged = []
+        self.__sorted_players = None
+        self.emit("reset")
+        self.emit("game_closed")
+
+    def max_dd_wager(self, player):
+        """the most `player` may wager on a Daily Double"""
+        if self.current_round is self.data.rounds[0]:
+            return max(player.score, 1000)
+        else:
+            return max(player.score, 2000)
+
+    def set_dd_wager(self, player, wager):
+        """`player` found the Daily Double and wagered `wager`"""
+        self.answering_player = player
+        self.soliciting_player = False
+        self.active_question.value = wager
+        self.emit("wager_made", player, wager)
+
+        self.keystroke_manager.activate("CORRECT_ANSWER", "INCORRECT_ANSWER")
+        self.emit("reveal_clue")
+
+    def load_question(self, q):
+        self.active_question = q
+        if q.dd:
+            logging.info("Daily double!")
+            self.emit("play_sound", "dd.wav")
+            self.soliciting_player = True
+        else:
+            self.keystroke_manager.activate("OPEN_RESPONSES")
+        self.emit("open_clue", q)
+
+    def open_final(self):
+        self.emit("reveal_clue")
+        self.emit("play_sound", "ding.wav")
+        self.keystroke_manager.activate("FINAL_OPEN_RESPONSES")
+
+    def correct_answer(self):
+        if self.timer:
+            self.timer.cancel()
+
+        # stats first, so the score update carries them
+        self.answering_player.stats["correct"] += 1
+        self.answering_player.stats["revenue"] += self.active_question.value
+        self.set_score(
+            self.answering_player,
+            self.answering_player.score + self.active_question.value,
+        )
+        self.emit("answer_judged", self.answering_player, self.active_question, True, self.active_question.value)
+        self.set_player_in_control(self.answering_player)
+        self.emit("set_border_lights", False)
+        self.answer_given()
+        self.back_to_board()
+
+    def incorrect_answer(self):
+        self.answering_player.stats["incorrect"] += 1
+        self.answering_player.stats["losses"] += self.active_question.value
+        if self.config.get('allownegative', 'True') == 'True':
+            self.set_score(
+                self.answering_player,
+                self.answering_player.score - self.active_question.value,
+            )
+        else:
+            self.set_score(
+                self.answering_player,
+                self.answering_player.score - 0,
+            )
+        self.emit("answer_judged", self.answering_player, self.active_question, False, self.active_question.value)
+
+        self.answer_given()
+        if self.active_question.dd:
+            self.back_to_board()
+        else:
+            self.open_responses()
+            self.timer.resume()
+
+    def stumped(self):
+        self.accepting_responses = False
+        self.emit("play_sound", "stumped.wav")
+        self.emit("flash_borders")
+        self.keystroke_manager.activate("BACK_TO_BOARD")
+
+    def set_score(self, player, score):
+        player.score = score
+        self.emit("update_score", player)
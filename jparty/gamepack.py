@@ -0,0 +1,162 @@
+"""single-file game packs: MAGIC, the header length, a JSON header, then the media blobs"""
+import os
+import json
+import mmap
+import struct
+import logging
+
+from jparty.engine import Question, Board, FinalBoard, GameData
+from jparty.media_cache import media_cache, RateLimited
+from jparty.ingest import ingester
+from jparty.constants import PACK_EXTENSION, PACK_IMAGE_SIZE
+
+MAGIC = b"JPARTYPK"
+PACK_VERSION = 1
+_HEADER_LEN = struct.Struct("<I")
+
+
+def is_pack(path):
+    return str(path).lower().endswith(PACK_EXTENSION) and os.path.isfile(path)
+
+
+def _fetch_image(question):
+    if question.image_content is not None:
+        return question.image_content
+    try:
+        return media_cache().fetch(question.image_link)
+    except RateLimited:
+        logging.info(f"rate limited fetching image for pack: {question.image_link}")
+        return None
+
+
+def _question_header(question, media):
+    return {
+        "index": list(question.index),
+        "text": question.text,
+        "answer": question.answer,
+        "category": question.category,
+        "value": question.value,
+        "dd": question.dd,
+        "image_link": question.image_link,
+        "video_link": question.video_link,
+        "media": media,
+    }
+
+
+def pack_header(data, add_media=lambda question: None):
+    """the JSON header of a pack of `data`; `add_media(question)` places a clue's image"""
+    rounds = []
+    for board in data.rounds:
+        if isinstance(board, FinalBoard):
+            rounds.append(
+                {
+                    "final": True,
+                    "categories": [board.category],
+                    "questions": [_question_header(board.question, add_media(board.question))],
+                }
+            )
+        else:
+            rounds.append(
+                {
+                    "final": False,
+                    "dj": board.dj,
+                    "categories": list(board.categories),
+                    "questions": [_question_header(q, add_media(q)) for q in board.questions],
+                }
+            )
+
+    return {
+        "version": PACK_VERSION,
+        "date": str(data.date),
+        "comments": str(data.comments),
+        "rounds": rounds,
+    }
+
+
+def write_pack(data, path, include_media=True):
+    """write `data` to a pack at `path`, fetching and normalizing any images"""
+    blobs = []
+    offset = 0
+
+    def add_media(question):
+        nonlocal offset
+        if not include_media or question.image_link is None:
+            return None
+        content = _fetch_image(question)
+        if content is None:
+            return None
+        content = ingester().ingest(content, PACK_IMAGE_SIZE)
+        if content is None:
+            return None
+        blobs.append(content)
+        media = [offset, len(content)]
+        offset += len(content)
+        return media
+
+    header = json.dumps(pack_header(data, add_media), separators=(",", ":")).encode("utf-8")
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LEN.pack(len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+    logging.info(f"wrote game pack {path} ({offset} bytes of media)")
+
+
+def read_header(path):
+    """read only the JSON header of a pack"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a JParty game pack")
+        (length,) = _HEADER_LEN.unpack(f.read(_HEADER_LEN.size))
+        return json.loads(f.read(length))
+
+
+def _question(q, media_view):
+    image_content = None
+    if q["media"] is not None and media_view is not None:
+        start, length = q["media"]
+        image_content = bytes(media_view[start : start + length])
+    return Question(
+        tuple(q["index"]),
+        q["text"],
+        q["answer"],
+        q["category"],
+        q["image_link"],
+        q["video_link"],
+        image_content,
+        q["value"],
+        q["dd"],
+    )
+
+
+def read_pack(path):
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a JParty game pack")
+        (length,) = _HEADER_LEN.unpack_from(mm, len(MAGIC))
+        media_start = len(MAGIC) + _HEADER_LEN.size + length
+        header = json.loads(mm[len(MAGIC) + _HEADER_LEN.size : media_start])
+        if header["version"] > PACK_VERSION:
+            raise ValueError(f"{path} was written by a newer version of JParty")
+
+        media_view = memoryview(mm)[media_start:]
+        try:
+            return game_from_header(header, media_view)
+        finally:
+            media_view.release()
+
+
+def game_from_header(header, media_view=None):
+    """the game in a pack header, with images sliced out of `media_view` if given"""
+    boards = []
+    for r in header["rounds"]:
+        questions = [_question(q, media_view) for q in r["questions"]]
+        if r["final"]:
+            boards.append(FinalBoard(r["categories"][0], questions[0]))
+        else:
+            boards.append(Board(r["categories"], questions, dj=r["dj"]))
+    return GameData(boards, header["date"], header["comments"])
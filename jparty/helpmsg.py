@@ -7,6 +7,8 @@ Welcome to JParty!
 - Press space immediately after reading the clue.
 - Adjudicate with the arrow keys.
 - Use the space bar to move through the rest of the game.
+- To build a game from previously played games, type ? and search words
+  into the Game ID box, e.g. "?rivers cat:geography value:400-1200 date:1990-2005".
 
 Some general Jeopardy rules:
 - Answering correctly gives you control of the board.
@@ -0,0 +1,302 @@
+"""every game's buzzes, judgements and results, kept in an SQLite database"""
+import os
+import time
+import queue
+import sqlite3
+import hashlib
+import logging
+import threading
+
+from jparty.constants import HISTORY_PATH, HISTORY_FLUSH_INTERVAL
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    identity TEXT UNIQUE NOT NULL,
+    name TEXT NOT NULL,
+    color TEXT
+);
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    night TEXT NOT NULL,
+    started REAL NOT NULL,
+    episode TEXT
+);
+CREATE TABLE IF NOT EXISTS buzzes (
+    game INTEGER NOT NULL REFERENCES games (id),
+    player INTEGER NOT NULL REFERENCES players (id),
+    round INTEGER NOT NULL,
+    category TEXT,
+    value INTEGER,
+    delay REAL NOT NULL,
+    timing TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS judgements (
+    game INTEGER NOT NULL REFERENCES games (id),
+    player INTEGER NOT NULL REFERENCES players (id),
+    round INTEGER NOT NULL,
+    category TEXT,
+    value INTEGER,
+    correct INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    game INTEGER NOT NULL REFERENCES games (id),
+    player INTEGER NOT NULL REFERENCES players (id),
+    score INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    PRIMARY KEY (game, player)
+);
+CREATE INDEX IF NOT EXISTS games_night ON games (night);
+CREATE INDEX IF NOT EXISTS buzzes_player ON buzzes (player, game, timing, delay);
+CREATE INDEX IF NOT EXISTS buzzes_game ON buzzes (game);
+CREATE INDEX IF NOT EXISTS buzzes_category ON buzzes (category);
+CREATE INDEX IF NOT EXISTS judgements_player ON judgements (player, game, correct, value, category);
+CREATE INDEX IF NOT EXISTS judgements_game ON judgements (game);
+CREATE INDEX IF NOT EXISTS judgements_category ON judgements (category);
+CREATE INDEX IF NOT EXISTS results_player ON results (player);
+"""
+
+# each player's totals, over the games from id :first on. Games are numbered in the order they are played
+LEADERBOARD = """
+SELECT p.id, p.name, p.color,
+       r.games, r.wins, r.best, r.total,
+       j.correct, j.incorrect, j.revenue,
+       b.first, b.reaction, b.fastest
+FROM players p
+JOIN (SELECT player, COUNT(*) AS games, SUM(won) AS wins, MAX(score) AS best, SUM(score) AS total
+      FROM results WHERE game >= :first
+      GROUP BY player) r ON r.player = p.id
+LEFT JOIN (SELECT player, SUM(correct) AS correct, SUM(1 - correct) AS incorrect,
+                  SUM(CASE WHEN correct THEN value ELSE 0 END) AS revenue
+           FROM judgements WHERE game >= :first
+           GROUP BY player) j ON j.player = p.id
+LEFT JOIN (SELECT player, SUM(timing = 'first') AS first,
+                  AVG(CASE WHEN timing != 'early' THEN delay END) AS reaction,
+                  MIN(CASE WHEN timing = 'first' THEN delay END) AS fastest
+           FROM buzzes WHERE game >= :first
+           GROUP BY player) b ON b.player = p.id
+ORDER BY r.wins DESC, r.total DESC
+"""
+
+# one player's games, newest first
+PLAYER_GAMES = """
+SELECT g.id, g.night, g.episode, r.score, r.won, j.correct, j.incorrect, b.reaction
+FROM results r
+JOIN games g ON g.id = r.game
+LEFT JOIN (SELECT game, SUM(correct) AS correct, SUM(1 - correct) AS incorrect
+           FROM judgements WHERE player = :player
+           GROUP BY game) j ON j.game = r.game
+LEFT JOIN (SELECT game, AVG(CASE WHEN timing != 'early' THEN delay END) AS reaction
+           FROM buzzes WHERE player = :player
+           GROUP BY game) b ON b.game = r.game
+WHERE r.player = :player
+ORDER BY g.started DESC
+"""
+
+# one player's judgements by category, most often played first
+PLAYER_CATEGORIES = """
+SELECT category, SUM(correct) AS correct, SUM(1 - correct) AS incorrect
+FROM judgements WHERE player = :player
+GROUP BY category
+ORDER BY COUNT(*) DESC, category
+"""
+
+
+def is_signature(name):
+    """whether a player's `name` is a signature drawn on their phone rather than text"""
+    return name[:21] == "data:image/png;base64"
+
+
+def identity(player):
+    """
+    who `player` is from game to game. A signature is drawn afresh every game,
+    so a player who signs is known by their buzzer color; one who types a name
+    is known by that name, whichever buzzer they pick
+    """
+    if is_signature(player.name) and player.buzzercolor:
+        return f"color:{player.buzzercolor}"
+    name = player.name
+    if not is_signature(name):
+        name = " ".join(name.split()).casefold()
+    return "name:" + hashlib.sha1(name.encode("utf-8")).hexdigest()[:16]
+
+
+def _connect(path):
+    db = sqlite3.connect(path)
+    db.row_factory = sqlite3.Row
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+class GameHistory(object):
+    """records the games `engine` runs to the database at `path`"""
+
+    def __init__(self, engine, path=HISTORY_PATH, flush_interval=HISTORY_FLUSH_INTERVAL):
+        self.engine = engine
+        self.path = os.path.abspath(path)
+        self.flush_interval = flush_interval
+        self.rows = 0
+        self.batches = 0
+
+        self.__recording = False
+        self.__resuming = False
+        self.__queue = queue.Queue()
+        self.__thread = None
+        self.__lock = threading.Lock()
+        self.__reader = None
+
+        engine.subscribe(self.__event)
+
+    def __event(self, name, *args):
+        engine = self.engine
+        if name == "start":
+            self.__recording = True
+            op = "resume" if self.__resuming else "game"
+            self.__resuming = False
+            self.__put(
+                op,
+                (time.strftime("%Y-%m-%d"), time.time(), engine.data.date if engine.data else None),
+            )
+        elif not self.__recording:
+            return
+        elif name == "time_buzz":
+            player, delay, timing = args
+            q = engine.active_question
+            self.__put(
+                "buzz",
+                (*self.__player(player), self.__round(), q and q.category, q and q.value, delay, timing),
+            )
+        elif name == "answer_judged":
+            player, q, correct, amount = args
+            self.__put("judgement", (*self.__player(player), self.__round(), q.category, amount, int(correct)))
+        elif name == "decide_final":
+            winners = args[0]
+            for player in engine.players:
+                self.__put("result", (*self.__player(player), player.score, int(player in winners)))
+        elif name == "game_closed":
+            self.__recording = False
+
+    def __player(self, player):
+        return identity(player), player.name, player.buzzercolor
+
+    def __round(self):
+        return self.engine.data.rounds.index(self.engine.current_round)
+
+    def __put(self, op, row):
+        with self.__lock:
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run, name="game history", daemon=True)
+                self.__thread.start()
+        self.__queue.put((op, row))
+
+    def __run(self):
+        db = None
+        players = {}  # identity -> id
+        game = None
+        while True:
+            # everything queued within flush_interval of the first row goes in one transaction
+            batch = [self.__queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1][0] != "close":
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.__queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            try:
+                if db is None:
+                    db = _connect(self.path)
+                    db.executescript(SCHEMA)
+                with db:
+                    for op, row in batch:
+                        if op in ("game", "resume"):
+                            last = None
+                            if op == "resume":
+                                # the game cut short is the last one recorded, unless it was cut before that
+                                last = db.execute(
+                                    "SELECT id FROM games WHERE id = (SELECT MAX(id) FROM games) AND episode IS ?",
+                                    (row[2],),
+                                ).fetchone()
+                            if last is not None:
+                                game = last[0]
+                            else:
+                                game = db.execute(
+                                    "INSERT INTO games (night, started, episode) VALUES (?, ?, ?)", row
+                                ).lastrowid
+                            continue
+                        if op == "close" or game is None:
+                            continue
+                        key, name, color, *values = row
+                        player = players.get(key)
+                        if player is None:
+                            db.execute(
+                                "INSERT INTO players (identity, name, color) VALUES (?, ?, ?) "
+                                "ON CONFLICT (identity) DO UPDATE SET name = excluded.name",
+                                (key, name, color),
+                            )
+                            player = players[key] = db.execute(
+                                "SELECT id FROM players WHERE identity = ?", (key,)
+                            ).fetchone()[0]
+                        if op == "buzz":
+                            db.execute("INSERT INTO buzzes VALUES (?, ?, ?, ?, ?, ?, ?)", (game, player, *values))
+                        elif op == "judgement":
+                            db.execute("INSERT INTO judgements VALUES (?, ?, ?, ?, ?, ?)", (game, player, *values))
+                        elif op == "result":
+                            db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", (game, player, *values))
+                        self.rows += 1
+                self.batches += 1
+            except sqlite3.Error as e:
+                logging.info(f"cannot write game history {self.path}: {e}")
+
+            if batch[-1][0] == "close":
+                if db is not None:
+                    db.close()
+                return
+
+    def resume(self):
+        """the next game to start is one picked back up from its journal, to be recorded as the same game"""
+        self.__resuming = True
+
+    def close(self):
+        """write out what is queued, e.g. when JParty quits"""
+        with self.__lock:
+            thread = self.__thread
+        if thread is None:
+            return
+        self.__queue.put(("close", None))
+        thread.join(timeout=5)
+
+    def report(self):
+        logging.info(f"game history: {self.rows} rows in {self.batches} batches")
+
+    # queries, from the thread that makes them (the GUI's)
+
+    def __query(self, sql, **params):
+        if not os.path.exists(self.path):
+            return []
+        try:
+            if self.__reader is None:
+                self.__reader = _connect(self.path)
+            return [dict(row) for row in self.__reader.execute(sql, params)]
+        except sqlite3.Error as e:
+            logging.info(f"cannot read game history {self.path}: {e}")
+            return []
+
+    def leaderboard(self, since=""):
+        """every player's totals over the games played on or after night `since` (YYYY-MM-DD), best first"""
+        first = self.__query("SELECT MIN(id) AS id FROM games WHERE night >= :since", since=since)
+        if not first or first[0]["id"] is None:
+            return []
+        return self.__query(LEADERBOARD, first=first[0]["id"])
+
+    def player_games(self, player):
+        """the games player id `player` finished, newest first"""
+        return self.__query(PLAYER_GAMES, player=player)
+
+    def player_categories(self, player):
+        """player id `player`'s right and wrong answers by category, most played first"""
+        return self.__query(PLAYER_CATEGORIES, player=player)
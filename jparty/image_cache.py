@@ -0,0 +1,130 @@
+"""clue images decoded and scaled for each display by a worker pool, never on the GUI thread"""
+from PyQt6.QtGui import QImageReader
+from PyQt6.QtCore import Qt, QObject, QBuffer, QIODevice, pyqtSignal
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from jparty.constants import IMAGE_CACHE_BYTES, IMAGE_DECODE_WORKERS
+
+
+def read_image(content, size):
+    """
+    decode `content` to fit in `size`. QImageReader releases the GIL while it
+    works and can decode JPEGs straight at a reduced scale, unlike
+    QImage.loadFromData, which would stall the GUI thread for the whole decode
+    """
+    buffer = QBuffer()
+    buffer.setData(content)
+    buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+    reader = QImageReader(buffer)
+    reader.setAutoTransform(True)
+    full_size = reader.size()
+    if full_size.isValid() and (
+        full_size.width() > size.width() or full_size.height() > size.height()
+    ):
+        reader.setScaledSize(full_size.scaled(size, Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    buffer.close()
+    return None if image.isNull() else image
+
+
+class ImageCache(QObject):
+    ready = pyqtSignal(str)  # url
+
+    def __init__(self, budget=IMAGE_CACHE_BYTES, workers=IMAGE_DECODE_WORKERS):
+        super().__init__()
+        self.budget = budget
+        self.__lock = threading.Lock()
+        self.__pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="decode")
+        self.__targets = {}
+        self.__sources = {}
+        self.__images = OrderedDict()  # (url, width, height) -> QImage, least recently used first
+        self.__size = 0
+
+    def set_target(self, name, size):
+        """register the size display `name` shows clue images at, and scale known images for it"""
+        if size.isEmpty():
+            return
+        with self.__lock:
+            if self.__targets.get(name) == size:
+                return
+            self.__targets[name] = size
+            sources = list(self.__sources.items())
+        for url, content in sources:
+            self.__pool.submit(self.__decode, url, content, [size])
+
+    def largest_target(self):
+        """the smallest (width, height) that holds the image of every display, or None before any registered"""
+        with self.__lock:
+            if not self.__targets:
+                return None
+            return (
+                max(size.width() for size in self.__targets.values()),
+                max(size.height() for size in self.__targets.values()),
+            )
+
+    def prepare(self, url, content):
+        """decode and scale `content` for every display in the background"""
+        with self.__lock:
+            self.__sources[url] = content
+            sizes = list(self.__targets.values())
+        if sizes:
+            self.__pool.submit(self.__decode, url, content, sizes)
+
+    def forget(self):
+        """drop every image, e.g. when a game is closed"""
+        with self.__lock:
+            self.__sources.clear()
+            self.__images.clear()
+            self.__size = 0
+
+    def get(self, url, size):
+        """the ready image of `url` for `size`, or None"""
+        key = (url, size.width(), size.height())
+        with self.__lock:
+            image = self.__images.get(key)
+            if image is not None:
+                self.__images.move_to_end(key)
+            return image
+
+    def request(self, url, content, size):
+        """decode and scale `content` for `size` in the background"""
+        with self.__lock:
+            self.__sources[url] = content
+        self.__pool.submit(self.__decode, url, content, [size])
+
+    def __decode(self, url, content, sizes):
+        for size in sizes:
+            image = read_image(content, size)
+            if image is None:
+                logging.info(f"cannot decode image {url}")
+                return
+            self.__insert((url, size.width(), size.height()), image)
+        self.ready.emit(url)
+
+    def __insert(self, key, image):
+        with self.__lock:
+            old = self.__images.pop(key, None)
+            if old is not None:
+                self.__size -= old.sizeInBytes()
+            self.__images[key] = image
+            self.__size += image.sizeInBytes()
+            while self.__size > self.budget and len(self.__images) > 1:
+                _, evicted = self.__images.popitem(last=False)
+                self.__size -= evicted.sizeInBytes()
+
+
+_image_cache = None
+_image_cache_lock = threading.Lock()
+
+
+def image_cache():
+    """the shared cache of decoded clue images"""
+    global _image_cache
+    with _image_cache_lock:
+        if _image_cache is None:
+            _image_cache = ImageCache()
+        return _image_cache
@@ -0,0 +1,98 @@
+"""validates, downscales and re-encodes downloaded images in a pool of worker processes"""
+from PyQt6.QtGui import QImageReader
+from PyQt6.QtCore import Qt, QSize, QBuffer, QByteArray, QIODevice
+
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from jparty.media_cache import sniff_mime
+from jparty.constants import PACK_IMAGE_SIZE, INGEST_WORKERS, INGEST_JPEG_QUALITY
+
+
+def transcode(content, max_size=PACK_IMAGE_SIZE):
+    """
+    validate `content`, shrink it to fit in `max_size` (width, height) and
+    re-encode it. Returns None if it is not an image
+    """
+    if sniff_mime(content) is None:
+        return None
+
+    buffer = QBuffer()
+    buffer.setData(content)
+    buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+    reader = QImageReader(buffer)
+    reader.setAutoTransform(True)
+    full_size = reader.size()
+    bound = QSize(*max_size)
+    scaled = full_size.isValid() and (
+        full_size.width() > bound.width() or full_size.height() > bound.height()
+    )
+    if scaled:
+        reader.setScaledSize(full_size.scaled(bound, Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    buffer.close()
+    if image.isNull():
+        return None
+
+    data = QByteArray()
+    out = QBuffer(data)
+    out.open(QIODevice.OpenModeFlag.WriteOnly)
+    if image.hasAlphaChannel():
+        image.save(out, "PNG")
+    else:
+        image.save(out, "JPG", INGEST_JPEG_QUALITY)
+    out.close()
+
+    if not scaled and len(data) >= len(content):
+        # already small enough, re-encoding would only lose quality
+        return content
+    return bytes(data)
+
+
+class MediaIngester(object):
+    def __init__(self, workers=INGEST_WORKERS):
+        self.workers = workers
+        self.__lock = threading.Lock()
+        self.__pool = None
+
+    def __executor(self):
+        with self.__lock:
+            if self.__pool is None:
+                # spawn rather than fork: forking a process that runs Qt threads is unsafe
+                self.__pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self.__pool
+
+    def ingest(self, content, max_size=PACK_IMAGE_SIZE):
+        """transcode `content` in a worker process and wait for the result. Returns None if it is not an image"""
+        try:
+            return self.__executor().submit(transcode, content, tuple(max_size)).result()
+        except BrokenProcessPool:
+            logging.info("media ingest pool died, restarting it")
+            with self.__lock:
+                self.__pool = None
+            return transcode(content, max_size)
+
+    def shutdown(self):
+        with self.__lock:
+            if self.__pool is not None:
+                self.__pool.shutdown(wait=False, cancel_futures=True)
+                self.__pool = None
+
+
+_ingester = None
+_ingester_lock = threading.Lock()
+
+
+def ingester():
+    """the shared media ingest pool"""
+    global _ingester
+    with _ingester_lock:
+        if _ingester is None:
+            _ingester = MediaIngester()
+        return _ingester
@@ -0,0 +1,44 @@
+"""measures how long the GUI thread's event loop was blocked, from how late a timer ticks"""
+from PyQt6.QtCore import QObject, QTimer
+
+import time
+import logging
+
+from jparty.constants import GUI_MONITOR_INTERVAL
+
+
+class GuiBlockMonitor(QObject):
+    def __init__(self, interval=GUI_MONITOR_INTERVAL, threshold=GUI_MONITOR_INTERVAL, parent=None):
+        super().__init__(parent)
+        self.interval = interval
+        self.threshold = threshold
+        self.blocked = 0.0  # seconds the event loop was late in total
+        self.stalls = 0
+        self.longest = 0.0
+        self.__last = None
+        self.__timer = QTimer(self)
+        self.__timer.timeout.connect(self.__tick)
+
+    def start(self):
+        self.__last = time.monotonic()
+        self.__timer.start(int(self.interval * 1000))
+
+    def stop(self):
+        self.__timer.stop()
+
+    def __tick(self):
+        now = time.monotonic()
+        lag = now - self.__last - self.interval
+        self.__last = now
+        if lag <= self.threshold:
+            return
+        self.blocked += lag
+        self.stalls += 1
+        self.longest = max(self.longest, lag)
+        logging.debug(f"GUI thread blocked for {lag * 1000:.0f} ms")
+
+    def report(self):
+        logging.info(
+            f"GUI thread blocked for {self.blocked:.2f} s in total "
+            f"({self.stalls} stalls, longest {self.longest * 1000:.0f} ms)"
+        )
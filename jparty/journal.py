@@ -0,0 +1,337 @@
+"""a journal of the game in progress, so it can be resumed after a crash"""
+import os
+import json
+import time
+import queue
+import logging
+import threading
+
+from jparty.engine import Player, FinalBoard
+from jparty.gamepack import pack_header, game_from_header
+from jparty.constants import JOURNAL_PATH, JOURNAL_FSYNC_INTERVAL, JOURNAL_COMPACT_RECORDS
+
+
+def _line(record):
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _token(player):
+    return None if player is None else player.token.hex()
+
+
+def _player_record(player):
+    return {
+        "token": player.token.hex(),
+        "name": player.name,
+        "color": player.buzzercolor,
+        "score": player.score,
+        "stats": player.stats,
+        "buzz_delays": player.buzz_delays,
+        "wager": player.wager,
+        "answer": player.finalanswer,
+    }
+
+
+def _player(record):
+    player = Player(record["name"], record["color"], None)
+    player.token = bytes.fromhex(record["token"])
+    player.score = record["score"]
+    player.stats = record["stats"]
+    player.buzz_delays = record["buzz_delays"]
+    player.wager = record["wager"]
+    player.finalanswer = record["answer"]
+    return player
+
+
+def snapshot(engine):
+    """the state of the game `engine` is running, as a journal record. An open clue counts as played"""
+    played = []
+    for i, board in enumerate(engine.data.rounds):
+        for q in board.questions:
+            if q.complete or q is engine.active_question:
+                played.append([i, *q.index])
+    return {
+        "type": "snapshot",
+        "round": engine.data.rounds.index(engine.current_round),
+        "played": played,
+        "players": [_player_record(p) for p in engine.players],
+        "in_control": _token(engine.player_in_control),
+        "responses_closed": engine.final_responses_closed,
+        "judged": [_token(p) for p in engine.final_judged],
+    }
+
+
+class JournalState(object):
+    """a journaled game, rebuilt from its records"""
+
+    def __init__(self, header):
+        self.data = game_from_header(header)
+        self.round = 0
+        self.responses_closed = False
+        self.records = 0
+        self.__players = {}  # token -> Player, in podium order
+        self.__in_control = None
+        self.__judged = []
+
+    @property
+    def players(self):
+        return list(self.__players.values())
+
+    @property
+    def in_control(self):
+        return self.__players.get(self.__in_control)
+
+    @property
+    def judged(self):
+        return [self.__players[t] for t in self.__judged if t in self.__players]
+
+    def summary(self):
+        board = self.data.rounds[self.round]
+        if isinstance(board, FinalBoard):
+            where = "Final Jeopardy"
+        elif board.dj:
+            where = "Double Jeopardy"
+        else:
+            where = "Jeopardy"
+        scores = ", ".join(f"{'-$' if p.score < 0 else '$'}{abs(p.score):,}" for p in self.__players.values())
+        return f"Unfinished game from {self.data.date}, in {where}: {scores}"
+
+    def __play(self, i, index):
+        board = self.data.rounds[i]
+        board.mark_complete(board.get_question(*index))
+
+    def apply(self, record):
+        self.records += 1
+        kind = record["type"]
+        if kind == "snapshot":
+            self.round = record["round"]
+            for i, *index in record["played"]:
+                self.__play(i, index)
+            self.__players = {p["token"]: _player(p) for p in record["players"]}
+            self.__in_control = record["in_control"]
+            self.responses_closed = record["responses_closed"]
+            self.__judged = list(record["judged"])
+            return
+        if kind == "open":
+            self.__play(self.round, record["index"])
+        elif kind == "round":
+            self.round = record["round"]
+        elif kind == "players":
+            self.__players = {t: self.__players[t] for t in record["tokens"] if t in self.__players}
+        elif kind == "control":
+            self.__in_control = record["player"]
+        elif kind == "closed":
+            self.responses_closed = True
+        elif kind == "judged":
+            self.__judged.append(record["player"])
+
+        player = self.__players.get(record.get("player"))
+        if player is None:
+            return
+        if kind == "score":
+            player.score = record["score"]
+            player.stats = record["stats"]
+        elif kind == "buzz":
+            player.buzz_delays.append({"delay": record["delay"], "timing": record["timing"]})
+        elif kind == "wager" and record["final"]:
+            player.wager = record["amount"]
+        elif kind == "answer":
+            player.finalanswer = record["answer"]
+
+
+def read_journal(path=JOURNAL_PATH):
+    """the unfinished game journaled at `path`, or None"""
+    start = time.perf_counter()
+    try:
+        with open(path, "rb") as f:
+            lines = f.read().split(b"\n")
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logging.info(f"cannot read game journal {path}: {e}")
+        return None
+
+    state = None
+    try:
+        # the last piece is empty, or a line torn by a crash
+        for line in lines[:-1]:
+            record = json.loads(line)
+            if state is None:
+                state = JournalState(record["pack"])
+            else:
+                state.apply(record)
+    except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+        logging.info(f"game journal {path} is damaged, not resuming it: {e!r}")
+        return None
+
+    if state is not None:
+        logging.info(
+            f"read game journal ({state.records} records) in {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+    return state
+
+
+class GameJournal(object):
+    """journals the games `engine` runs to `path`"""
+
+    def __init__(
+        self,
+        engine,
+        path=JOURNAL_PATH,
+        fsync_interval=JOURNAL_FSYNC_INTERVAL,
+        compact_records=JOURNAL_COMPACT_RECORDS,
+    ):
+        self.engine = engine
+        self.path = os.path.abspath(path)
+        self.fsync_interval = fsync_interval
+        self.compact_records = compact_records
+        self.records = 0
+        self.fsyncs = 0
+        self.snapshots = 0
+
+        self.__recording = False
+        self.__since_snapshot = 0
+        self.__header = None  # the game's line, kept for compaction
+        self.__queue = queue.Queue()
+        self.__thread = None
+        self.__lock = threading.Lock()
+
+        self.__handlers = {
+            "start": self.__start,
+            "game_closed": self.__discard,
+            "players_updated": lambda: self.__append(
+                {"type": "players", "tokens": [_token(p) for p in engine.players]}
+            ),
+            "open_clue": lambda q: self.__append({"type": "open", "index": list(q.index)}),
+            "load_round": lambda board: self.__round(),
+            "load_final": lambda question: self.__round(),
+            "set_in_control": lambda player: self.__append(
+                {"type": "control", "player": _token(player)}
+            ),
+            "time_buzz": lambda player, delay, timing: self.__append(
+                {"type": "buzz", "player": _token(player), "delay": delay, "timing": timing}
+            ),
+            "update_score": lambda player: self.__append(
+                {"type": "score", "player": _token(player), "score": player.score, "stats": player.stats}
+            ),
+            "wager_made": lambda player, amount: self.__append(
+                {
+                    "type": "wager",
+                    "player": _token(player),
+                    "amount": amount,
+                    "final": isinstance(engine.current_round, FinalBoard),
+                }
+            ),
+            "final_answer_made": lambda player: self.__append(
+                {"type": "answer", "player": _token(player), "answer": player.finalanswer}
+            ),
+            "too_late": lambda: self.__append({"type": "closed"}),
+            "final_judged": lambda player: self.__append({"type": "judged", "player": _token(player)}),
+        }
+        engine.subscribe(self.__event)
+
+    def __event(self, name, *args):
+        handler = self.__handlers.get(name)
+        if handler is not None and (self.__recording or name == "start"):
+            handler(*args)
+
+    def __start(self, board):
+        # a new game, or one resumed: either way the journal starts over from here
+        self.__header = _line({"type": "game", "pack": pack_header(self.engine.data)})
+        self.__recording = True
+        self.__compact()
+
+    def __discard(self):
+        self.__recording = False
+        self.__header = None
+        self.__put("discard")
+
+    def __round(self):
+        self.__append({"type": "round", "round": self.engine.data.rounds.index(self.engine.current_round)})
+
+    def __append(self, record):
+        self.records += 1
+        self.__since_snapshot += 1
+        self.__put("append", _line(record))
+        if self.__since_snapshot >= self.compact_records:
+            self.__compact()
+
+    def __compact(self):
+        self.__since_snapshot = 0
+        self.snapshots += 1
+        self.__put("rewrite", self.__header + _line(snapshot(self.engine)))
+
+    def __put(self, op, arg=None):
+        with self.__lock:
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run, name="game journal", daemon=True)
+                self.__thread.start()
+        self.__queue.put((op, arg))
+
+    def __rewrite(self, f, content):
+        if f is not None:
+            f.close()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as tmp:
+            tmp.write(content)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp_path, self.path)
+        self.fsyncs += 1
+        return open(self.path, "ab", buffering=0)
+
+    def __run(self):
+        f = None
+        synced = True
+        last_sync = time.monotonic()
+        while True:
+            # wait for the next record, or until the records written since the last fsync are due one
+            timeout = None if synced else max(0.0, last_sync + self.fsync_interval - time.monotonic())
+            try:
+                op, arg = self.__queue.get(timeout=timeout)
+            except queue.Empty:
+                op, arg = None, None
+
+            try:
+                if op == "append" and f is not None:
+                    f.write(arg)
+                    synced = False
+                elif op == "rewrite":
+                    f = self.__rewrite(f, arg)
+                    synced = True
+                    last_sync = time.monotonic()
+                elif op in ("discard", "close"):
+                    if f is not None:
+                        if op == "close" and not synced:
+                            os.fsync(f.fileno())
+                            self.fsyncs += 1
+                        f.close()
+                        f = None
+                    if op == "discard" and os.path.exists(self.path):
+                        os.remove(self.path)
+                    synced = True
+
+                if not synced and time.monotonic() >= last_sync + self.fsync_interval:
+                    os.fsync(f.fileno())
+                    self.fsyncs += 1
+                    synced = True
+                    last_sync = time.monotonic()
+            except OSError as e:
+                logging.info(f"cannot write game journal {self.path}: {e}")
+
+            if op == "close":
+                return
+
+    def close(self):
+        """write out and sync what is recorded, e.g. when JParty quits"""
+        with self.__lock:
+            thread = self.__thread
+        if thread is None:
+            return
+        self.__queue.put(("close", None))
+        thread.join(timeout=2)
+
+    def report(self):
+        logging.info(
+            f"game journal: {self.records} records, {self.snapshots} snapshots, {self.fsyncs} fsyncs"
+        )
@@ -1,4 +1,4 @@
-from PyQt6.QtGui import QFontDatabase, QFont
+from PyQt6.QtGui import QFont
 from PyQt6.QtWidgets import QApplication, QMessageBox
 
 import sys
@@ -11,8 +11,16 @@ from jparty.game import Game
 from jparty.controller import BuzzerController
 from jparty.main_display import DisplayWindow, HostDisplayWindow
 from jparty.style import JPartyStyle
-from jparty.utils import resource_path
+from jparty.theme import theme, theme_registry
+from jparty.animation import animator
+from jparty.timers import timer_service
+from jparty.shadow import shadow_cache
 from jparty.logger import qt_exception_hook
+from jparty.instrument import GuiBlockMonitor
+from jparty.ingest import ingester
+from jparty.audio import audio_mixer
+from jparty.config import config
+from jparty.capture import capture
 from jparty.constants import PORT
 
 
@@ -69,31 +77,19 @@ def main():
 
     QApplication.setStyle(JPartyStyle())
     app = QApplication(sys.argv)
+    config().watch()
 
     check_second_monitor()
     check_internet()
     app.setFont(QFont("Verdana"))
 
-    i_board = QFontDatabase.addApplicationFont(
-        resource_path("board_font.ttf")
-    )
-    i_question = QFontDatabase.addApplicationFont(
-        resource_path("question_font.ttf")
-    )
+    # fonts of the current theme now, images and sounds of every theme in the background
+    theme().load_fonts()
+    theme_registry().preload()
 
-    font_families = QFontDatabase.applicationFontFamilies(i_board)
-    if font_families:
-        font_family_name = font_families[0]
-        print(f"Loaded board font family name: {font_family_name}")
-    else:
-        print("Could not retrieve board font family name.")
-    
-    font_families = QFontDatabase.applicationFontFamilies(i_question)
-    if font_families:
-        font_family_name = font_families[0]
-        print(f"Loaded question font family name: {font_family_name}")
-    else:
-        print("Could not retrieve question font family name.")
+    # effects and timers may be started from other threads, so both services must live on this one
+    animator()
+    timer_service()
 
     game = Game()
 
@@ -119,13 +115,27 @@ def main():
 
     song_player = game.song_player
 
-
+    gui_monitor = GuiBlockMonitor()
+    gui_monitor.start()
 
     r=1 # fail by default
     try:
         r = app.exec()
     finally:
         logging.info("terminated")
+        gui_monitor.report()
+        audio_mixer().report()
+        timer_service().report()
+        theme_registry().pixmaps.report()
+        shadow_cache().report()
+        main_window.clue_pool.report()
+        host_window.clue_pool.report()
+        game.journal.close()
+        game.journal.report()
+        game.history.close()
+        game.history.report()
+        capture().close()
+        ingester().shutdown()
         if song_player:
             song_player.stop()
 
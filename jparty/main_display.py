@@ -1,5 +1,5 @@
 from PyQt6.QtGui import QColor, QPalette, QGuiApplication
-from PyQt6.QtCore import QMargins
+from PyQt6.QtCore import QMargins, QSize
 
 from PyQt6.QtWidgets import (
     QMainWindow,
@@ -8,6 +8,9 @@ from PyQt6.QtWidgets import (
     QHBoxLayout,
 )
 
+import time
+import logging
+
 from jparty.board_widget import BoardWidget
 from jparty.scoreboard import ScoreBoard, HostScoreBoard
 from jparty.borders import Borders, HostBorders
@@ -21,6 +24,10 @@ from jparty.question_widget import (
 )
 from jparty.final_display import FinalDisplay
 from jparty.welcome_widget import Welcome, QRWidget
+from jparty.image_cache import image_cache
+from jparty.video_pool import WebViewPool
+from jparty.clue_pool import ClueWidgetPool
+from jparty.constants import DEFAULT_CONFIG
 
 
 class DisplayWindow(QMainWindow):
@@ -53,11 +60,14 @@ class DisplayWindow(QMainWindow):
         self.newWidget.setLayout(self.main_layout)
 
         self.welcome_widget = self.create_start_menu()
+        self.video_pool = WebViewPool(self)
+        self.clue_pool = ClueWidgetPool(self)
 
         self.final_window = None
         self.final_display = None
 
         self.setCentralWidget(self.newWidget)
+        self.connect_model(game.model)
 
         monitor = QGuiApplication.screens()[self.monitor()].geometry()
 
@@ -73,6 +83,21 @@ class DisplayWindow(QMainWindow):
     def monitor(self):
         return 1
 
+    def connect_model(self, model):
+        model.game_started.connect(self.start_game)
+        model.game_reset.connect(self.restart)
+        model.clue_opened.connect(self.load_question)
+        model.clue_revealed.connect(self.show_question)
+        model.clue_closed.connect(self.hide_question)
+        model.clues_upcoming.connect(self.preload_clues)
+        model.border_lights_changed.connect(self.borders.lights)
+        model.border_flashed.connect(self.borders.flash)
+        model.final_loaded.connect(self.load_final)
+        model.final_judgement_started.connect(self.load_final_judgement)
+        model.final_guess_changed.connect(self.set_final_guess)
+        model.final_wager_changed.connect(self.set_final_wager)
+        model.final_decided.connect(self.show_final_result)
+
     def create_border_widget(self):
         return Borders(self)
 
@@ -104,6 +129,20 @@ class DisplayWindow(QMainWindow):
         if self.final_display is not None:
             self.final_display.setGeometry(fullrect)
 
+    def image_target_size(self):
+        """the largest size clue images are shown at on this display"""
+        board = self.board_widget.size()
+        mode = self.game.config.get('showtextwithimages', DEFAULT_CONFIG['showtextwithimages'])
+        height_fraction = 0.9 if mode == 'Only show image' else 0.5
+        return QSize(int(board.width() * 0.9), int(board.height() * height_fraction))
+
+    def update_image_target(self):
+        image_cache().set_target(self.windowTitle(), self.image_target_size())
+
+    def start_game(self):
+        self.hide_welcome_widgets()
+        self.update_image_target()
+
     def show_welcome_widgets(self):
         self.welcome_widget.setVisible(True)
         self.welcome_widget.setDisabled(False)
@@ -114,15 +153,28 @@ class DisplayWindow(QMainWindow):
         self.welcome_widget.setDisabled(True)
 
     def hide_question(self):
+        self.question_widget.release_video()
         self.board_widget.setVisible(True)
         self.board_layout.replaceWidget(self.question_widget, self.board_widget)
         self.question_widget.deleteLater()
         self.question_widget = None
 
     def load_question(self, q):
-        self.question_widget = self.create_question_widget(q)
+        start = time.perf_counter()
+        self.question_widget = self.clue_pool.take(q)
+        built = self.question_widget is not None
+        if not built:
+            self.question_widget = self.create_question_widget(q)
         self.board_widget.setVisible(False)
         self.board_layout.replaceWidget(self.board_widget, self.question_widget)
+        self.question_widget.setVisible(True)
+        logging.info(
+            f"{self.windowTitle()}: opened {'built ' if built else ''}clue in "
+            f"{(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+
+    def show_question(self):
+        self.question_widget.show_question()
 
     def load_final(self, q):
         self.question_widget = self.create_final_widget(q)
@@ -133,22 +185,33 @@ class DisplayWindow(QMainWindow):
         self.final_display = FinalDisplay(self.game, self)
         self.final_window = self.final_display.answer_widget
 
+    def set_final_guess(self, text):
+        self.final_window.guess_label.setText(text)
+
+    def set_final_wager(self, text):
+        self.final_window.wager_label.setText(text)
+
+    def show_final_result(self, winners):
+        if len(winners) == 1:
+            self.final_window.show_winner(winners[0])
+        else:
+            self.final_window.show_tie()
+
     def closeEvent(self, event):
         super().closeEvent(event)
         self.game.close()
 
     def player_widget(self, player):
-        for pw in self.scoreboard.player_widgets:
-            if pw.player is player:
-                return pw
+        return self.scoreboard.player_widget(player)
 
-    def remove_card(self, q):
-        for label in self.board_widget.question_labels:
-            if label.question is q:
-                label.question = None
+    def preload_clues(self, questions):
+        self.video_pool.preload(questions)
+        self.clue_pool.prepare(questions)
 
     def restart(self):
         self.hide_question()
+        self.video_pool.clear()
+        self.clue_pool.clear()
         self.final_display.close()
         self.final_display = None
         self.board_widget.clear()
@@ -186,7 +249,7 @@ class HostDisplayWindow(DisplayWindow):
         return HostFinalJeopardyWidget(q, self)
 
     def keyPressEvent(self, event):
-        self.game.keystroke_manager.call(event.key())
+        self.game.key_pressed(event.key())
 
     def hide_welcome_widgets(self):
         super().hide_welcome_widgets()
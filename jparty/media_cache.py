@@ -0,0 +1,278 @@
+"""a persistent cache of clue media, one blob per SHA-256, with an SQLite index and LRU eviction"""
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import requests
+
+from jparty.config import config
+from jparty.constants import (
+    MEDIA_CACHE_DIR,
+    IMAGE_TIMEOUT,
+    NEGATIVE_TTL_TIMEOUT,
+    NEGATIVE_TTL_ERROR,
+    NEGATIVE_TTL_INVALID,
+)
+
+IMAGE_SIGNATURES = [
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+]
+
+
+def sniff_mime(content):
+    """guess the MIME type of `content` from its first bytes. Returns None for anything but images"""
+    for signature, mime in IMAGE_SIGNATURES:
+        if content.startswith(signature):
+            return mime
+    if content[:4] == b"RIFF" and content[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+class RateLimited(Exception):
+    """the host asked us to slow down (HTTP 429)"""
+
+
+class MediaCache(object):
+    def __init__(self, directory=MEDIA_CACHE_DIR, budget=None):
+        self.directory = directory
+        self.budget = budget if budget is not None else self.configured_budget()
+        config().changed.connect(self.__config_changed)
+        self.__lock = threading.Lock()
+
+        # counters for this session
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        self.__db = sqlite3.connect(
+            os.path.join(directory, "index.db"), check_same_thread=False
+        )
+        self.__db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS media (
+                url TEXT PRIMARY KEY,
+                hash TEXT,
+                mime TEXT,
+                size INTEGER NOT NULL DEFAULT 0,
+                last_access REAL NOT NULL,
+                expires REAL
+            );
+            CREATE INDEX IF NOT EXISTS media_hash ON media (hash);
+            CREATE INDEX IF NOT EXISTS media_access ON media (last_access);
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            """
+        )
+        self.__db.commit()
+
+    @staticmethod
+    def configured_budget():
+        return config().get('mediacachesize') * 1024 * 1024
+
+    def __config_changed(self, key, value):
+        if key == 'mediacachesize':
+            self.budget = self.configured_budget()
+
+    def __blob_path(self, digest):
+        return os.path.join(self.directory, "objects", digest[:2], digest)
+
+    def __count(self, name, amount=1):
+        self.__db.execute(
+            "INSERT INTO counters VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + ?",
+            (name, amount, amount),
+        )
+
+    def lookup(self, url):
+        """
+        return the cached content of `url`, False if it is known to be unavailable,
+        or None if the cache knows nothing about it
+        """
+        with self.__lock:
+            row = self.__db.execute(
+                "SELECT hash, size, expires FROM media WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            digest, size, expires = row
+            now = time.time()
+            if digest is None:
+                if expires is not None and expires < now:
+                    self.__db.execute("DELETE FROM media WHERE url = ?", (url,))
+                    self.__db.commit()
+                    return None
+                self.hits += 1
+                self.__count("hits")
+                self.__db.commit()
+                return False
+
+            try:
+                with open(self.__blob_path(digest), "rb") as f:
+                    content = f.read()
+            except OSError:
+                self.__db.execute("DELETE FROM media WHERE url = ?", (url,))
+                self.__db.commit()
+                return None
+
+            self.hits += 1
+            self.bytes_saved += size
+            self.__count("hits")
+            self.__count("bytes_saved", size)
+            self.__db.execute(
+                "UPDATE media SET last_access = ? WHERE hash = ?", (now, digest)
+            )
+            self.__db.commit()
+            return content
+
+    def store(self, url, content):
+        """validate and store `content` for `url`. Returns its MIME type, or None if it isn't an image"""
+        mime = sniff_mime(content)
+        if mime is None:
+            self.store_failure(url, NEGATIVE_TTL_INVALID)
+            return None
+
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.__blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+        with self.__lock:
+            self.__db.execute(
+                "INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?, NULL)",
+                (url, digest, mime, len(content), time.time()),
+            )
+            self.__db.commit()
+            self.__evict()
+        return mime
+
+    def store_failure(self, url, ttl):
+        with self.__lock:
+            now = time.time()
+            self.__db.execute(
+                "INSERT OR REPLACE INTO media VALUES (?, NULL, NULL, 0, ?, ?)",
+                (url, now, now + ttl),
+            )
+            self.__db.commit()
+
+    def fetch(self, url, timeout=IMAGE_TIMEOUT):
+        """return the content of `url` from the cache or the network, or None if it can't be loaded"""
+        content = self.lookup(url)
+        if content is not None:
+            return content or None
+
+        with self.__lock:
+            self.misses += 1
+            self.__count("misses")
+            self.__db.commit()
+
+        try:
+            request = requests.get(url, timeout=timeout)
+        except requests.Timeout:
+            # Some websites always timeout and load forever, maybe because it detects that it's a bot
+            logging.info(f"timed out loading media: {url}")
+            self.store_failure(url, NEGATIVE_TTL_TIMEOUT)
+            return None
+        except requests.exceptions.RequestException:
+            logging.info(f"failed to load media: {url}")
+            self.store_failure(url, NEGATIVE_TTL_ERROR)
+            return None
+
+        if request.status_code == 429:
+            raise RateLimited(url)
+        if not request.ok:
+            logging.info(f"failed to load media: {url} ({request.status_code})")
+            # only a missing file is gone for good; anything else may work on the next try
+            gone = request.status_code in (404, 410)
+            self.store_failure(url, NEGATIVE_TTL_INVALID if gone else NEGATIVE_TTL_ERROR)
+            return None
+        if self.store(url, request.content) is None:
+            logging.info(f"not an image: {url}")
+            return None
+        return request.content
+
+    def __total_size(self):
+        (total,) = self.__db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT MAX(size) AS size FROM media WHERE hash IS NOT NULL GROUP BY hash)"
+        ).fetchone()
+        return total
+
+    def __evict(self):
+        total = self.__total_size()
+        if total <= self.budget:
+            return
+
+        lru = self.__db.execute(
+            "SELECT hash, MAX(size) FROM media WHERE hash IS NOT NULL GROUP BY hash ORDER BY MAX(last_access)"
+        ).fetchall()
+        for digest, size in lru:
+            if total <= self.budget:
+                break
+            try:
+                os.remove(self.__blob_path(digest))
+            except OSError:
+                pass
+            self.__db.execute("DELETE FROM media WHERE hash = ?", (digest,))
+            total -= size
+            logging.info(f"evicted {digest} ({size} bytes) from media cache")
+        self.__db.commit()
+
+    def stats(self):
+        with self.__lock:
+            counters = dict(self.__db.execute("SELECT name, value FROM counters"))
+            (entries,) = self.__db.execute(
+                "SELECT COUNT(DISTINCT hash) FROM media WHERE hash IS NOT NULL"
+            ).fetchone()
+            (negative,) = self.__db.execute(
+                "SELECT COUNT(*) FROM media WHERE hash IS NULL"
+            ).fetchone()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes_saved": self.bytes_saved,
+                "total_hits": counters.get("hits", 0),
+                "total_misses": counters.get("misses", 0),
+                "total_bytes_saved": counters.get("bytes_saved", 0),
+                "entries": entries,
+                "negative_entries": negative,
+                "size": self.__total_size(),
+                "budget": self.budget,
+            }
+
+    def clear(self):
+        with self.__lock:
+            for (digest,) in self.__db.execute(
+                "SELECT DISTINCT hash FROM media WHERE hash IS NOT NULL"
+            ).fetchall():
+                try:
+                    os.remove(self.__blob_path(digest))
+                except OSError:
+                    pass
+            self.__db.execute("DELETE FROM media")
+            self.__db.commit()
+
+
+_media_cache = None
+_media_cache_lock = threading.Lock()
+
+
+def media_cache():
+    """the shared on-disk media cache"""
+    global _media_cache
+    with _media_cache_lock:
+        if _media_cache is None:
+            _media_cache = MediaCache()
+        return _media_cache
@@ -0,0 +1,147 @@
+"""`GameModel`: what both displays show, with a signal for each change"""
+from PyQt6.QtCore import QObject, pyqtSignal
+
+import random
+import logging
+
+from jparty.constants import CATEGORY_REVEAL_TIME, QUESTION_REVEAL_TIME, BEFORE_REVEAL_WAIT_TIME
+from jparty.engine import LIGHTS_OFF, LIGHTS_ON, LIGHTS_RUNNING, LIGHTS_TIMED_OUT
+
+
+class GameModel(QObject):
+    """the display side of the engine: one method for each of engine.DISPLAY_EVENTS"""
+
+    game_started = pyqtSignal()
+    game_reset = pyqtSignal()
+
+    round_loaded = pyqtSignal(object)  # the Board
+    card_removed = pyqtSignal(object)  # the Question taken off the board
+    clue_opened = pyqtSignal(object)  # the Question
+    clue_revealed = pyqtSignal()  # a Daily Double or Final Jeopardy clue, after the wagers
+    clue_closed = pyqtSignal()
+    clues_upcoming = pyqtSignal(list)  # Questions left in the round, likeliest next first
+
+    players_changed = pyqtSignal()
+    score_changed = pyqtSignal(object)  # the Player
+    lights_changed = pyqtSignal(object, str)  # the Player and one of LIGHTS_*
+    buzz_hinted = pyqtSignal(object)  # the Player, who buzzed with no clue open
+    buzz_timed = pyqtSignal(object, float, str)  # the Player, seconds, "early", "first" or "late"
+    buzz_cleared = pyqtSignal(object)  # the Player
+    in_control_changed = pyqtSignal(object)  # the Player, or None
+
+    border_lights_changed = pyqtSignal(bool)
+    border_flashed = pyqtSignal()
+
+    final_loaded = pyqtSignal(object)  # the final Question
+    final_judgement_started = pyqtSignal()
+    final_guess_changed = pyqtSignal(str)
+    final_wager_changed = pyqtSignal(str)
+    final_decided = pyqtSignal(list)  # the winning Players
+
+    def __init__(self):
+        super().__init__()
+        self.round = None
+        self.clue = None
+        self.lights = {}  # Player -> LIGHTS_*
+        self.buzz_times = {}  # Player -> (seconds, timing), for the open clue
+        self.in_control = None
+        self.border_lights = False
+        self.__reveal = {}  # (x, y) -> seconds into the board fill
+
+    def start(self, round):
+        self.game_started.emit()
+        self.load_round(round)
+
+    def reset(self):
+        self.round = None
+        self.clue = None
+        self.lights = {}
+        self.buzz_times = {}
+        self.in_control = None
+        self.border_lights = False
+        self.game_reset.emit()
+
+    def load_round(self, round):
+        """show `round` on the board, filling it in the same order on every display"""
+        self.round = round
+        category_delay = BEFORE_REVEAL_WAIT_TIME + 8 * QUESTION_REVEAL_TIME
+        self.__reveal = {}
+        for x in range(len(round.categories)):
+            self.__reveal[(x, 0)] = category_delay + x * CATEGORY_REVEAL_TIME
+            for y in range(1, round.size[1] + 1):
+                self.__reveal[(x, y)] = (
+                    random.randint(0, 5) * QUESTION_REVEAL_TIME + BEFORE_REVEAL_WAIT_TIME
+                )
+        self.round_loaded.emit(round)
+
+    def reveal_time(self, x, y):
+        """when card (x, y) of the current round appears, in seconds into the board fill"""
+        return self.__reveal[(x, y)]
+
+    def load_final(self, question):
+        self.round = None
+        self.clue = question
+        self.final_loaded.emit(question)
+
+    def open_clue(self, question):
+        self.clue = question
+        self.clue_opened.emit(question)
+        self.card_removed.emit(question)
+
+    def reveal_clue(self):
+        self.clue_revealed.emit()
+
+    def close_clue(self):
+        self.clue = None
+        self.clue_closed.emit()
+
+    def preload_clues(self, questions):
+        self.clues_upcoming.emit(questions)
+
+    def players_updated(self):
+        self.players_changed.emit()
+
+    def update_score(self, player):
+        self.score_changed.emit(player)
+
+    def set_lights(self, player, lights):
+        self.lights[player] = lights
+        self.lights_changed.emit(player, lights)
+
+    def hint_buzz(self, player):
+        self.buzz_hinted.emit(player)
+
+    def time_buzz(self, player, delay, timing):
+        self.buzz_times[player] = (delay, timing)
+        self.buzz_timed.emit(player, delay, timing)
+
+    def clear_buzz(self, player):
+        self.buzz_times.pop(player, None)
+        self.buzz_cleared.emit(player)
+
+    def set_in_control(self, player):
+        if player is self.in_control:
+            return
+        self.in_control = player
+        self.in_control_changed.emit(player)
+
+    def set_border_lights(self, val):
+        self.border_lights = val
+        self.border_lights_changed.emit(val)
+
+    def flash_borders(self):
+        self.border_lights = False
+        self.border_flashed.emit()
+
+    def start_final_judgement(self):
+        self.final_judgement_started.emit()
+
+    def set_final_guess(self, text):
+        self.final_guess_changed.emit(text)
+
+    def set_final_wager(self, text):
+        self.final_wager_changed.emit(text)
+
+    def decide_final(self, winners):
+        logging.info(f"winners: {', '.join(p.name for p in winners)}")
+        self.final_decided.emit(winners)
@@ -0,0 +1,164 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+import time
+import queue
+import logging
+import threading
+from itertools import count
+from urllib.parse import urlparse
+
+from jparty.constants import (
+    PACK_IMAGE_SIZE,
+    PREFETCH_WORKERS,
+    PREFETCH_HOST_CONCURRENCY,
+    PREFETCH_HOST_INTERVAL,
+)
+from jparty.media_cache import media_cache, RateLimited
+from jparty.image_cache import image_cache
+from jparty.ingest import ingester
+
+
+def load_image(question):
+    """load the image of `question` through the media cache. Raises `RateLimited` if the host is throttling us"""
+    logging.info(f"pre-loading image: {question.image_link}")
+    return media_cache().fetch(question.image_link)
+
+
+def ingest_image(content):
+    """validate and shrink downloaded `content` for the displays in use"""
+    if not content:
+        return None
+    return ingester().ingest(content, image_cache().largest_target() or PACK_IMAGE_SIZE)
+
+
+RETRY_PRIORITY = (float("inf"),)
+
+
+class HostLimiter(object):
+    """limits how many requests run at once against a host and how often they start"""
+
+    def __init__(self, concurrency=PREFETCH_HOST_CONCURRENCY, interval=PREFETCH_HOST_INTERVAL):
+        self.interval = interval
+        self.__slots = threading.BoundedSemaphore(concurrency)
+        self.__lock = threading.Lock()
+        self.__next_start = 0.0
+
+    def __enter__(self):
+        self.__slots.acquire()
+        with self.__lock:
+            now = time.monotonic()
+            start = max(now, self.__next_start)
+            self.__next_start = start + self.interval
+        time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc):
+        self.__slots.release()
+
+    def backoff(self, seconds):
+        with self.__lock:
+            self.__next_start = max(self.__next_start, time.monotonic() + seconds)
+
+
+class MediaPrefetcher(QObject):
+    """
+    Downloads the images of a whole game in the background, beginning as soon as
+    the game is chosen. Clues are fetched in board order (first round first,
+    top rows first) by a small pool of workers, rate limited per host.
+    """
+
+    progress = pyqtSignal(int, int)  # done, total
+
+    def __init__(self, workers=PREFETCH_WORKERS):
+        super().__init__()
+        self.__queue = queue.PriorityQueue()
+        self.__limiters = {}
+        self.__lock = threading.Lock()
+        self.__seq = count()
+        self.__generation = 0
+        self.__finished = set()
+        self.__total = 0
+
+        for i in range(workers):
+            threading.Thread(target=self.__work, name=f"prefetch{i}", daemon=True).start()
+
+    @staticmethod
+    def priority(i_round, question):
+        col, row = question.index
+        return (i_round, row, col)
+
+    def start(self, data):
+        """cancel any running prefetch and start loading every image in `data`"""
+        with self.__lock:
+            self.__generation += 1
+            self.__finished = set()
+            self.__total = 0
+            for i_round, board in enumerate(data.rounds):
+                for q in board.questions:
+                    if q.image_link is None:
+                        continue
+                    if q.image_content is None:
+                        self.__total += 1
+                        self.__put(self.priority(i_round, q), q)
+                    elif q.image_content != b"Not Found":
+                        # already loaded, e.g. from a game pack
+                        image_cache().prepare(q.image_link, q.image_content)
+            total = self.__total
+        logging.info(f"prefetching {total} images")
+        self.progress.emit(0, total)
+
+    def prioritize(self, question):
+        """move `question` to the front of the queue"""
+        with self.__lock:
+            self.__put((-1,), question)
+
+    def stop(self):
+        with self.__lock:
+            self.__generation += 1
+
+    def __put(self, priority, question, generation=None):
+        if generation is None:
+            generation = self.__generation
+        self.__queue.put((priority, next(self.__seq), generation, question))
+
+    def __limiter(self, url):
+        host = urlparse(url).hostname or ""
+        with self.__lock:
+            if host not in self.__limiters:
+                self.__limiters[host] = HostLimiter()
+            return self.__limiters[host]
+
+    def __work(self):
+        while True:
+            priority, _, generation, question = self.__queue.get()
+            if generation != self.__generation or question.image_content is not None:
+                continue
+
+            content = media_cache().lookup(question.image_link)
+            if content is None:
+                limiter = self.__limiter(question.image_link)
+                try:
+                    with limiter:
+                        if question.image_content is not None:
+                            continue
+                        content = load_image(question)
+                except RateLimited:
+                    if priority != RETRY_PRIORITY:
+                        # slow down and try once more at the end
+                        limiter.backoff(5 * limiter.interval)
+                        with self.__lock:
+                            self.__put(RETRY_PRIORITY, question, generation)
+                        continue
+
+            # Mark images that can't be loaded as "Not Found" to avoid trying to load them again
+            question.image_content = ingest_image(content) or b"Not Found"
+
+            if question.image_content != b"Not Found":
+                image_cache().prepare(question.image_link, question.image_content)
+
+            with self.__lock:
+                if generation != self.__generation:
+                    continue
+                self.__finished.add(id(question))
+                done, total = len(self.__finished), self.__total
+            self.progress.emit(done, total)
@@ -4,25 +4,21 @@ from PyQt6.QtGui import (
     QColor,
     QFont,
     QPixmap,
-    QFontDatabase
 )
-import requests
 import re
 import logging
-import json
 import sys, os
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QSizePolicy
-from PyQt6.QtCore import QUrl
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineSettings
+from PyQt6.QtCore import QTimer
 from PyQt6.QtCore import Qt
 
 from jparty.style import MyLabel, CARDPAL
-from jparty.constants import DEFAULT_CONFIG, VIDEO_PLAY_TIME
+from jparty.constants import IMAGE_DEADLINE
+from jparty.config import config
+from jparty.theme import theme
 from jparty.utils import get_base_path
-import threading
-import time
-from urllib.parse import urlparse, parse_qs
+from jparty.image_cache import image_cache
+from jparty.timers import QuestionTimer
 
 class QuestionWidget(QWidget):
     def __init__(self, question, parent=None):
@@ -31,13 +27,9 @@ class QuestionWidget(QWidget):
         self.setAutoFillBackground(True)
         self.main_layout = QVBoxLayout()
 
-        # Read the config.json file
-        with open('config.json', 'r') as f:
-            self.config = json.load(f)
-
         # Question text
         self.question_label = MyLabel(question.text.upper(), self.startFontSize, self)
-        self.question_label.setFont(QFont(QFontDatabase.applicationFontFamilies(1)))
+        self.question_label.setFont(QFont(theme().question_font))
         self.main_layout.addWidget(self.question_label)
         self.main_layout.setContentsMargins(0, 50, 0, 50)
 
@@ -47,118 +39,110 @@ class QuestionWidget(QWidget):
 
         elif question.image_link is not None:
             logging.info(f"question has image: {question.image_link}")
-            if question.image_content is None:
-                try:
-                    request = requests.get(question.image_link, timeout=1)
-                    question.image_content = request.content
-                    logging.info(f"loaded image: {question.image_link}")
-                except requests.exceptions.RequestException as e:
-                    logging.info(f"failed to load image: {question.image_link}")
-            
-            logging.info(f"question has image content: {question.image_content}")
-            if question.image_content is not None and b"html" in question.image_content.lower():
-                question.image_content = None
-
-            disable_images = self.config.get('showtextwithimages', DEFAULT_CONFIG['showtextwithimages']) == 'Only show text'
-
-            if not disable_images and question.image_content is not None and b"Not Found" not in question.image_content:
-                self.image = QPixmap()
-                self.image.loadFromData(question.image_content)
-                
-                if self.config.get('showtextwithimages', DEFAULT_CONFIG['showtextwithimages']) == 'Show both':
-                    # Show both text and image
-                    self.image = self.image.scaledToHeight(self.height() * 12)
-
-                    # Create a QLabel for the image
+            mode = config().get('showtextwithimages')
+
+            if mode in ('Show both', 'Only show image') and question.image_content != b"Not Found":
+                if mode == 'Show both':
+                    # Create a QLabel for the image, left empty until the image is ready
                     self.image_label = MyLabel("", self.startFontSize, self)
-                    self.image_label.setPixmap(self.image)
                     self.main_layout.addWidget(self.image_label)
-                elif self.config.get('showtextwithimages', DEFAULT_CONFIG['showtextwithimages']) == 'Only show image':
-                    # Show image only
-                    self.image = self.image.scaledToWidth(self.width() * 12)
-                    self.question_label.setPixmap(self.image)
+                self.request_image(parent)
 
         self.setLayout(self.main_layout)
 
         self.setPalette(CARDPAL)
         self.show()
 
+    def request_image(self, parent):
+        """show the clue image as soon as it is ready, without blocking the GUI thread"""
+        self.image_target = parent.image_target_size()
+        image = image_cache().get(self.question.image_link, self.image_target)
+        if image is not None:
+            self.set_image(image)
+            return
+
+        image_cache().ready.connect(self.image_ready)
+        if self.question.image_content is None:
+            parent.game.prefetcher.prioritize(self.question)
+        else:
+            image_cache().request(
+                self.question.image_link, self.question.image_content, self.image_target
+            )
+
+        # give up on the image after a while and leave the clue text-only
+        self.image_timer = QTimer(self)
+        self.image_timer.setSingleShot(True)
+        self.image_timer.timeout.connect(self.image_deadline)
+        self.image_timer.start(int(IMAGE_DEADLINE * 1000))
+
+    def image_ready(self, url):
+        if url != self.question.image_link:
+            return
+        image = image_cache().get(url, self.image_target)
+        if image is None:
+            # scaled for another size, so scale it for this display too
+            if self.question.image_content is not None:
+                image_cache().request(url, self.question.image_content, self.image_target)
+            return
+        image_cache().ready.disconnect(self.image_ready)
+        self.image_timer.stop()
+        self.set_image(image)
+
+    def image_deadline(self):
+        logging.info(f"image not ready in time: {self.question.image_link}")
+        image_cache().ready.disconnect(self.image_ready)
+        if hasattr(self, 'image_label'):
+            self.main_layout.removeWidget(self.image_label)
+            self.image_label.deleteLater()
+            del self.image_label
+
+    def set_image(self, image):
+        self.image = QPixmap.fromImage(image)
+        if hasattr(self, 'image_label'):
+            # Show both text and image
+            self.image_label.setPixmap(self.image)
+        else:
+            # Show image only
+            self.question_label.setPixmap(self.image)
+
     def load_video(self, parent, video_link):
         try:
-            # --- Parse YouTube URL variants robustly ---
-            video_url = None
-            video_length = VIDEO_PLAY_TIME
-            audio_only = False
-
-            u = urlparse(video_link)
-            host = (u.hostname or "").lower()
-            qs = parse_qs(u.query or "")
-
-            yt_id = None
-            # youtu.be/VIDEOID
-            if "youtu.be" in host and u.path:
-                yt_id = u.path.strip("/")
-
-            # youtube.com/watch?v=VIDEOID
-            if (yt_id is None) and ("youtube.com" in host):
-                yt_id = (qs.get("v") or [None])[0]
-
-            # Build video.html URL if we have an ID
-            if yt_id:
-                parts = [f"video.html?v={yt_id}"]
-
-                # start time (?t=123) — only accept pure digits
-                t_val = (qs.get("t") or [None])[0]
-                if t_val and t_val.isdigit():
-                    parts.append(f"t={t_val}")
-
-                # configured play length (?l=123)
-                l_val = (qs.get("l") or [None])[0]
-                if l_val and l_val.isdigit():
-                    video_length = int(l_val)
-
-                # audio-only flag (?a=1)
-                a_val = (qs.get("a") or [None])[0]
-                if a_val == "1":
-                    audio_only = True
-                    parts.append("a=1")
-
-                video_url = "&".join(parts)
-
-            if video_url:
-                if not audio_only or (audio_only and parent.host()):
-                    # Embed youtube clip video
-                    self.web_view = QWebEngineView()
-                    url = f"http://localhost:8081/{video_url}"
-                    logging.info(f"loading url: {url}")
-                    self.web_view.load(QUrl(url))
-                    self.web_view.page().settings().setAttribute(
-                        QWebEngineSettings.WebAttribute.LocalContentCanAccessRemoteUrls, True
-                    )
-
-                    if audio_only or parent.host():
-                        self.web_view.setFixedHeight(self.height() * 5)
-                        self.web_view.setFixedWidth(self.width() * 3)
-                    else:
-                        self.web_view.setFixedHeight(self.height() * 12)
-                        self.web_view.setFixedWidth(self.width() * 7)
-
-                    self.main_layout.addSpacing(self.main_layout.contentsMargins().top())
-                    self.main_layout.addWidget(self.web_view, alignment=Qt.AlignmentFlag.AlignCenter)
-
-                    if not audio_only:
-                        def end_video(main_layout, web_view, video_length):
-                            time.sleep(video_length)
-                            main_layout.removeWidget(web_view)
-                            web_view.deleteLater()
-
-                        thread = threading.Thread(target=end_video, args=(self.main_layout, self.web_view, video_length,))
-                        thread.start()
+            self.video_pool = parent.video_pool
+            video = self.video_pool.acquire(video_link)
+            if video is None:
+                return
+            self.web_view, video_length, audio_only = video
+
+            if audio_only or parent.host():
+                self.web_view.setFixedHeight(self.height() * 5)
+                self.web_view.setFixedWidth(self.width() * 3)
+            else:
+                self.web_view.setFixedHeight(self.height() * 12)
+                self.web_view.setFixedWidth(self.width() * 7)
+
+            self.main_layout.addSpacing(self.main_layout.contentsMargins().top())
+            self.main_layout.addWidget(self.web_view, alignment=Qt.AlignmentFlag.AlignCenter)
+            self.web_view.setVisible(True)
+
+            if not audio_only:
+                self.video_timer = QuestionTimer(video_length, self.release_video)
+                self.video_timer.start()
         except Exception as e:
             exc_type, exc_obj, exc_tb = sys.exc_info()
             fname = os.path.split(exc_tb.tb_frame.f_code.co_filename)[1]
             logging.info(f"error: {exc_type}, {fname}:{exc_tb.tb_lineno}")
 
+    def release_video(self):
+        """stop the video and hand its view back to the pool"""
+        if getattr(self, 'video_timer', None) is not None:
+            self.video_timer.cancel()
+            self.video_timer = None
+        if getattr(self, 'web_view', None) is None:
+            return
+        self.main_layout.removeWidget(self.web_view)
+        self.video_pool.release(self.web_view)
+        self.web_view = None
+
 
     def startFontSize(self):
         return self.width() * 0.05
@@ -172,7 +156,7 @@ class HostQuestionWidget(QuestionWidget):
         self.main_layout.setStretchFactor(self.question_label, 6)
         self.main_layout.addSpacing(self.main_layout.contentsMargins().top())
         self.answer_label = MyLabel(question.answer, self.startFontSize, self)
-        self.answer_label.setFont(QFont(QFontDatabase.applicationFontFamilies(1)))
+        self.answer_label.setFont(QFont(theme().question_font))
         self.main_layout.addWidget(self.answer_label, 1)
 
     def paintEvent(self, event):
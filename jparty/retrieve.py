@@ -3,7 +3,9 @@ from bs4 import BeautifulSoup
 from html import unescape
 import re
 import json
-from jparty.game import Question, Board, FinalBoard, GameData
+from jparty.engine import Question, Board, FinalBoard, GameData
+from jparty.gamepack import is_pack, read_pack
+from jparty.archive import archive_game, clue_index, build_game, parse_query
 import logging
 import csv
 from jparty.constants import MONIES
@@ -93,10 +95,20 @@ def get_Gsheet_game(file_id):
 
 
 def get_game(game_id):
-    if len(str(game_id)) < 7:
-        return get_wayback_jarchive_game(game_id)
+    game_id = str(game_id)
+    if is_pack(game_id):
+        return read_pack(game_id)
+    elif game_id.startswith("?"):
+        query = game_id[1:].strip()
+        return build_game(clue_index(), query, **parse_query(query))
+    elif len(game_id) < 7:
+        data = get_wayback_jarchive_game(game_id)
     else:
-        return get_Gsheet_game(str(game_id))
+        data = get_Gsheet_game(game_id)
+
+    if data is not None and all(b.complete() for b in data.rounds):
+        archive_game(game_id, data)
+    return data
 
 
 def findanswer(clue):
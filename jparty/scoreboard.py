@@ -6,19 +6,19 @@ from PyQt6.QtGui import (
     QColor,
     QIcon,
     QFont,
-    QFontDatabase
 )
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QSizePolicy, QPushButton
 from PyQt6.QtCore import Qt, QSize, QPoint
 
-import time
-from threading import Thread
 from base64 import urlsafe_b64decode
 from functools import partial
 
 from jparty.style import MyLabel
-from jparty.utils import resource_path, add_shadow
-from jparty.constants import DEFAULT_CONFIG
+from jparty.utils import add_shadow
+from jparty.shadow import ShadowLayer
+from jparty.theme import theme, theme_registry, scaled_pixmap
+from jparty.animation import Timeline, animator
+from jparty.model import LIGHTS_ON, LIGHTS_RUNNING, LIGHTS_TIMED_OUT
 
 
 class NameLabel(MyLabel):
@@ -35,7 +35,7 @@ class NameLabel(MyLabel):
         else:
             self.setText(name)
 
-        self.setGraphicsEffect(None)
+        self.set_shadow(None)
         self.setAutosizeMargins(0.05)
 
     def startNameFontSize(self):
@@ -72,15 +72,11 @@ class PlayerWidget(QWidget):
         super().__init__(parent)
         self.player = player
         self.game = game
-        self.__buzz_hint_thread = None
-        self.__flash_thread = None
-        self.__light_thread = None
-        self.__timeout_thread = None
-        self.buzz_delay = None # Holds stats for buzz delay
+        self.__buzz_hint = None
+        self.__lights = None
 
         self.name_label = NameLabel(player.name, self)
         self.score_label = MyLabel("$0", self.startScoreFontSize, self)
-        self.score_label.setFont(QFont(QFontDatabase.applicationFontFamilies(0)))
         self.stats_label = MyLabel("", self.height() * 0.8, self)
         self.dummy_stats_label = MyLabel("", self.height() * 0.8, self)
 
@@ -96,13 +92,14 @@ class PlayerWidget(QWidget):
 
         self.setMouseTracking(True)
 
-        self.main_background = QPixmap(resource_path("player.png"))
-        self.active_background = QPixmap(resource_path("player_active.png"))
-        self.timeout_background = QPixmap(resource_path("player_timed_out.png"))
-        self.lights_backgrounds = [
-            QPixmap(resource_path(f"player_lights{i}.png")) for i in range(1, 6)
-        ]
+        self.main_background = "player.png"
+        self.active_background = "player_active.png"
+        self.timeout_background = "player_timed_out.png"
+        self.lights_backgrounds = [f"player_lights{i}.png" for i in range(1, 6)]
         self.background = self.main_background
+        self.glow = PodiumGlow(self)
+        self.reskin(theme())
+        theme_registry().changed.connect(self.reskin)
 
         self.highlighted = False
 
@@ -120,6 +117,14 @@ class PlayerWidget(QWidget):
 
         self.show()
 
+    def reskin(self, theme):
+        self.score_label.setFont(QFont(theme.board_font))
+        self.update()
+        self.glow.update()
+
+    def __pixmap(self, name):
+        return scaled_pixmap(name, self.size(), self.devicePixelRatioF())
+
     def sizeHint(self):
         h = self.height()
         return QSize(int(h * PlayerWidget.aspect_ratio), h)
@@ -138,14 +143,18 @@ class PlayerWidget(QWidget):
         self.background = self.active_background if val else self.main_background
         self.update()
 
-    def __buzz_hint(self):
-        self.set_lights(True)
-        time.sleep(0.25)
-        self.set_lights(False)
+    def set_glow(self, val):
+        self.glow.set_active(val)
+
+    def set_background(self, background):
+        self.background = background
+        self.update()
 
     def buzz_hint(self):
-        self.__buzz_hint_thread = Thread(target=self.__buzz_hint, name="buzz_hint")
-        self.__buzz_hint_thread.start()
+        self.__stop(self.__buzz_hint)
+        self.__buzz_hint = animator().play(
+            Timeline().at(0.0, self.set_lights, True).then(0.25, self.set_lights, False)
+        )
 
     def update_score(self):
         score = self.player.score
@@ -158,60 +167,45 @@ class PlayerWidget(QWidget):
 
         self.score_label.setText(f"{'-$' if score < 0 else '$'}{abs(score):,}")
 
-    def update_stats(self, delay, timing="early"):
-        if self.buzz_delay is not None or not self.parent().parent().parent().host():
-            return
-        self.buzz_delay = delay
+    def show_buzz_time(self, delay, timing="early"):
         if timing == "early":
-            self.stats_label.setText('{0:.2f}s early'.format(self.buzz_delay))
+            self.stats_label.setText('{0:.2f}s early'.format(delay))
         elif timing == "late":
-            self.stats_label.setText('{0:.2f}s late'.format(self.buzz_delay))
+            self.stats_label.setText('{0:.2f}s late'.format(delay))
         else:
-            self.stats_label.setText('{0:.2f}s first buzz'.format(self.buzz_delay))
-        
-        # Log stats for aggregation
-        self.player.buzz_delays.append({
-            "delay": self.buzz_delay,
-            "timing": timing
-        })
-    
-    def clear_stats(self):
-        self.buzz_delay = None
-        self.player.buzz_time = None
-        self.stats_label.setText('')
-
-    def run_lights(self):
-        self.__light_thread = Thread(target=self.__lights, name="lights")
-        self.__light_thread.start()
+            self.stats_label.setText('{0:.2f}s first buzz'.format(delay))
 
-    def stop_lights(self):
-        self.__light_thread = None
-        self.set_lights(False)
-        self.update()
+    def clear_buzz_time(self):
+        self.stats_label.setText('')
 
-    def __lights(self):
-        for img in self.lights_backgrounds:
-            self.background = img
-            self.update()
-            time.sleep(1.0)
-            if self.__light_thread is None:  # provide stopability
-                return None
+    def show_lights(self, lights):
+        """show one of the LIGHTS_* states of the model"""
+        if lights == LIGHTS_RUNNING:
+            self.run_lights()
+        elif lights == LIGHTS_TIMED_OUT:
+            self.show_timeout_lights()
+        else:
+            self.__stop(self.__lights)
+            self.__lights = None
+            self.set_lights(lights == LIGHTS_ON)
 
-        self.set_lights(True)
-        self.update()
-    
-    def run_timeout_lights(self):
-        self.player.istimedout = True
-        self.__timeout_thread = Thread(target=self.__timeout_lights, name="timeout_lights")
-        self.__timeout_thread.start()
-    
-    def __timeout_lights(self):
-        self.background = self.timeout_background
-        self.update()
-        time.sleep(self.game.config.get('earlybuzztimeout', DEFAULT_CONFIG['earlybuzztimeout']) / 1000)
-        self.player.istimedout = False
-        self.set_lights(False)
-        self.update()
+    def run_lights(self):
+        # scale every frame up front, so the animation only draws
+        for name in self.lights_backgrounds + [self.active_background]:
+            self.__pixmap(name)
+        lights = Timeline()
+        for i, img in enumerate(self.lights_backgrounds):
+            lights.at(i * 1.0, self.set_background, img)
+        lights.then(1.0, self.set_lights, True)
+        self.__stop(self.__lights)
+        self.__lights = animator().play(lights)
+
+    def show_timeout_lights(self):
+        self.set_background(self.timeout_background)
+
+    def __stop(self, animation):
+        if animation is not None:
+            animation.cancel()
 
     def mousePressEvent(self, event):
         if self.game.soliciting_player:
@@ -223,7 +217,7 @@ class PlayerWidget(QWidget):
     def paintEvent(self, event):
         qp = QPainter()
         qp.begin(self)
-        qp.drawPixmap(self.rect(), self.background)
+        qp.drawPixmap(self.rect(), self.__pixmap(self.background))
         qp.end()
 
     def leaveEvent(self, event):
@@ -235,6 +229,21 @@ class PlayerWidget(QWidget):
             self.set_lights(True)
 
 
+class PodiumGlow(ShadowLayer):
+    """the glow around the podium of the player in control, off at first"""
+
+    def __init__(self, player_widget):
+        super().__init__(player_widget, 100, 0, QColor("white"))
+        self.set_active(False)
+
+    def shape_key(self):
+        pw = self.target
+        return ("podium", theme().name, pw.main_background, pw.width(), pw.height())
+
+    def shape(self):
+        return scaled_pixmap(self.target.main_background, self.target.size()).toImage()
+
+
 class HostPlayerWidget(PlayerWidget):
     def __init__(self, game, player, parent=None):
         self.remove_button = None
@@ -242,9 +251,14 @@ class HostPlayerWidget(PlayerWidget):
         self.remove_button = QPushButton("", self)
         # self.remove_button.setStyleSheet("color: red")
         self.remove_button.clicked.connect(partial(self.game.remove_player, player))
-        self.remove_button.setIcon(QIcon(resource_path("close-icon.png")))
+        self.remove_button.setIcon(QIcon(theme().pixmap("close-icon.png")))
         self.remove_button.show()
 
+    def reskin(self, theme):
+        super().reskin(theme)
+        if self.remove_button is not None:
+            self.remove_button.setIcon(QIcon(theme.pixmap("close-icon.png")))
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
         if self.remove_button is not None:
@@ -261,12 +275,39 @@ class ScoreBoard(QWidget):
         self.game = game
 
         self.player_widgets = []
+        self.__widgets = {}  # Player -> PlayerWidget
 
         self.player_layout = QHBoxLayout()
         self.player_layout.addStretch()
         self.setLayout(self.player_layout)
+        theme_registry().changed.connect(self.update)
+        self.connect_model(game.model)
         self.show()
 
+    def connect_model(self, model):
+        model.players_changed.connect(self.refresh_players)
+        model.score_changed.connect(self.update_score)
+        model.lights_changed.connect(self.show_lights)
+        model.buzz_hinted.connect(self.buzz_hint)
+
+    def player_widget(self, player):
+        return self.__widgets.get(player)
+
+    def update_score(self, player):
+        pw = self.player_widget(player)
+        if pw is not None:
+            pw.update_score()
+
+    def show_lights(self, player, lights):
+        pw = self.player_widget(player)
+        if pw is not None:
+            pw.show_lights(lights)
+
+    def buzz_hint(self, player):
+        pw = self.player_widget(player)
+        if pw is not None:
+            pw.buzz_hint()
+
     def minimumHeight(self):
         return 0.2 * self.width()
 
@@ -277,6 +318,7 @@ class ScoreBoard(QWidget):
                 self.player_layout.takeAt(i + 1)  # remove stretch
                 self.player_layout.takeAt(i)
                 self.player_widgets.remove(pw)
+                del self.__widgets[pw.player]
                 pw.deleteLater()
 
         for (i, p) in enumerate(self.game.players):
@@ -285,6 +327,7 @@ class ScoreBoard(QWidget):
                 self.player_layout.insertWidget(2 * i + 1, pw)
                 self.player_layout.insertStretch(2 * i + 2)
                 self.player_widgets.append(pw)
+                self.__widgets[p] = pw
 
         self.update()
 
@@ -294,11 +337,33 @@ class ScoreBoard(QWidget):
     def paintEvent(self, event):
         qp = QPainter()
         qp.begin(self)
-        qp.drawPixmap(self.rect(), QPixmap(resource_path("podium.png")))
+        qp.drawPixmap(
+            self.rect(), scaled_pixmap("podium.png", self.size(), self.devicePixelRatioF())
+        )
         qp.end()
 
 
 class HostScoreBoard(ScoreBoard):
+    def connect_model(self, model):
+        super().connect_model(model)
+        model.buzz_timed.connect(self.show_buzz_time)
+        model.buzz_cleared.connect(self.clear_buzz_time)
+        model.in_control_changed.connect(self.set_in_control)
+
+    def show_buzz_time(self, player, delay, timing):
+        pw = self.player_widget(player)
+        if pw is not None:
+            pw.show_buzz_time(delay, timing)
+
+    def clear_buzz_time(self, player):
+        pw = self.player_widget(player)
+        if pw is not None:
+            pw.clear_buzz_time()
+
+    def set_in_control(self, player):
+        for pw in self.player_widgets:
+            pw.set_glow(pw.player is player)
+
     def create_player_widget(self, player):
         return HostPlayerWidget(self.game, player, self)
 
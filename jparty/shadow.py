@@ -0,0 +1,174 @@
+"""drop shadows and glows blurred once and cached, instead of graphics effects"""
+from PyQt6.QtGui import QColor, QImage, QPainter, QPixmap
+from PyQt6.QtWidgets import (
+    QWidget,
+    QGraphicsScene,
+    QGraphicsPixmapItem,
+    QGraphicsBlurEffect,
+)
+from PyQt6.QtCore import Qt, QEvent, QRectF
+
+import math
+import logging
+import threading
+from collections import OrderedDict
+
+from jparty.constants import SHADOW_CACHE_ENTRIES
+
+
+def shadow_margin(radius):
+    """how far a shadow blurred by `radius` reaches beyond its shape"""
+    return int(math.ceil(radius))
+
+
+def bake_shadow(mask, radius, color):
+    """
+    the shadow of the opaque pixels of `mask`, in `color`, blurred by `radius`
+    and padded by shadow_margin(radius) on every side
+    """
+    margin = shadow_margin(radius)
+    shape = QImage(mask.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    shape.fill(Qt.GlobalColor.transparent)
+    qp = QPainter(shape)
+    qp.drawImage(0, 0, mask)
+    qp.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
+    qp.fillRect(shape.rect(), color)
+    qp.end()
+
+    shadow = QImage(
+        mask.width() + 2 * margin,
+        mask.height() + 2 * margin,
+        QImage.Format.Format_ARGB32_Premultiplied,
+    )
+    shadow.fill(Qt.GlobalColor.transparent)
+    if radius < 1:
+        qp = QPainter(shadow)
+        qp.drawImage(margin, margin, shape)
+        qp.end()
+        return QPixmap.fromImage(shadow)
+
+    item = QGraphicsPixmapItem(QPixmap.fromImage(shape))
+    blur = QGraphicsBlurEffect()
+    blur.setBlurRadius(radius)
+    item.setGraphicsEffect(blur)
+    scene = QGraphicsScene()
+    scene.addItem(item)
+    qp = QPainter(shadow)
+    scene.render(
+        qp,
+        QRectF(shadow.rect()),
+        QRectF(-margin, -margin, shadow.width(), shadow.height()),
+    )
+    qp.end()
+    return QPixmap.fromImage(shadow)
+
+
+class ShadowCache(object):
+    """baked shadows, keyed by what they are the shadow of. GUI thread only"""
+
+    def __init__(self, max_entries=SHADOW_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.__shadows = OrderedDict()  # least recently used first
+
+    def get(self, key, mask, radius, color):
+        """the shadow for `key`, baked from `mask()` if it isn't cached"""
+        key = (key, radius, QColor(color).rgba())
+        shadow = self.__shadows.get(key)
+        if shadow is not None:
+            self.hits += 1
+            self.__shadows.move_to_end(key)
+            return shadow
+
+        self.misses += 1
+        shadow = bake_shadow(mask(), radius, color)
+        self.__shadows[key] = shadow
+        while len(self.__shadows) > self.max_entries:
+            self.__shadows.popitem(last=False)
+        return shadow
+
+    def report(self):
+        logging.info(
+            f"shadow cache: {self.hits} hits, {self.misses} misses, {len(self.__shadows)} shadows"
+        )
+
+
+_shadow_cache = None
+_shadow_cache_lock = threading.Lock()
+
+
+def shadow_cache():
+    """the shared cache of baked shadows"""
+    global _shadow_cache
+    with _shadow_cache_lock:
+        if _shadow_cache is None:
+            _shadow_cache = ShadowCache()
+        return _shadow_cache
+
+
+class ShadowLayer(QWidget):
+    """
+    a baked shadow painted behind `target` by a sibling widget, which follows
+    it around. The shadow is of the whole rect of `target`; subclasses can
+    override `shape_key` and `shape` for other outlines
+    """
+
+    def __init__(self, target, radius, offset=0, color=QColor("black")):
+        super().__init__(target.parentWidget())
+        self.target = target
+        self.radius = radius
+        self.offset = offset
+        self.color = QColor(color)
+        self.active = True
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        target.installEventFilter(self)
+        target.destroyed.connect(self.deleteLater)
+        self.follow()
+
+    def shape_key(self):
+        return ("rect", self.target.width(), self.target.height())
+
+    def shape(self):
+        mask = QImage(self.target.size(), QImage.Format.Format_ARGB32_Premultiplied)
+        mask.fill(Qt.GlobalColor.black)
+        return mask
+
+    def set_active(self, active):
+        self.active = active
+        self.follow()
+
+    def eventFilter(self, obj, event):
+        if event.type() in (
+            QEvent.Type.Move,
+            QEvent.Type.Resize,
+            QEvent.Type.Show,
+            QEvent.Type.Hide,
+            QEvent.Type.ParentChange,
+        ):
+            self.follow()
+        return False
+
+    def follow(self):
+        parent = self.target.parentWidget()
+        if parent is None:
+            self.hide()
+            return
+        if self.parentWidget() is not parent:
+            self.setParent(parent)
+        margin = shadow_margin(self.radius)
+        self.setGeometry(
+            self.target.geometry()
+            .translated(self.offset, self.offset)
+            .adjusted(-margin, -margin, margin, margin)
+        )
+        self.stackUnder(self.target)
+        self.setVisible(
+            self.active and self.target.isVisibleTo(parent) and not self.target.size().isEmpty()
+        )
+
+    def paintEvent(self, event):
+        shadow = shadow_cache().get(self.shape_key(), self.shape, self.radius, self.color)
+        qp = QPainter(self)
+        qp.drawPixmap(0, 0, shadow)
+        qp.end()
@@ -18,150 +18,394 @@ from PyQt6.QtWidgets import (
     QDialog,
     QComboBox,
     QPushButton,
-    QTableWidget,
+    QTableView,
     QHeaderView,
+    QGridLayout,
 )
-from PyQt6.QtCore import Qt, QSize, pyqtSignal, QObject
+from PyQt6.QtCore import Qt, QSize, pyqtSignal, QObject, QAbstractTableModel, QModelIndex
 
 import qrcode
 import time
 from threading import Thread
 import logging
-import json
 import os
 import sys
+from base64 import urlsafe_b64decode
 
-from jparty.constants import DEFAULT_CONFIG
-from jparty.scoreboard import NameLabel
-
-stats_labels = [
-    "Players",
-    "Awards",
-    "First buzzes",
-    "Early buzzes",
-    "Late buzzes",
-    "Fastest buzz",
-    "Correct",
-    "Incorrect",
-    "Total revenue",
-    "Total losses",
+from jparty.media_cache import media_cache
+from jparty.history import is_signature
+
+def _seconds(t):
+    return "N/A" if t is None else f"{t:.3f}s"
+
+
+def signature_pixmap(name, height):
+    i = QImage()
+    i.loadFromData(urlsafe_b64decode(name[22:]), "PNG")
+    return QPixmap.fromImage(i).scaledToHeight(height, Qt.TransformationMode.SmoothTransformation)
+
+
+# each row of the stats box, and how to show it for a player and their PlayerStats
+stats_rows = [
+    ("Players", None),
+    ("Awards", None),
+    ("First buzzes", lambda player, stats: str(stats.count("first"))),
+    ("Early buzzes", lambda player, stats: str(stats.count("early"))),
+    ("Late buzzes", lambda player, stats: str(stats.count("late"))),
+    ("Fastest buzz", lambda player, stats: _seconds(stats.fastest)),
+    ("Mean reaction", lambda player, stats: _seconds(stats.mean())),
+    ("Median reaction", lambda player, stats: _seconds(stats.percentile(50))),
+    ("90th percentile reaction", lambda player, stats: _seconds(stats.percentile(90))),
+    ("Correct", lambda player, stats: str(player.stats["correct"])),
+    ("Incorrect", lambda player, stats: str(player.stats["incorrect"])),
+    ("Total revenue", lambda player, stats: f"${player.stats['revenue']:,}"),
+    ("Total losses", lambda player, stats: f"${player.stats['losses']:,}"),
 ]
 
+# each award, what it is won on, and whether the lowest wins it rather than the highest
+awards = [
+    ("Most Correct", lambda player, stats: player.stats["correct"], False),
+    ("Most Wrong", lambda player, stats: player.stats["incorrect"], False),
+    ("Most Revenue", lambda player, stats: player.stats["revenue"], False),
+    ("Quickest Buzzer", lambda player, stats: stats.fastest, True),
+    ("Most buzz-ins", lambda player, stats: stats.count("first"), False),
+]
+
+NAME_ROW_HEIGHT = 100
+
+
+class StatsModel(QAbstractTableModel):
+    """the stats box's table: a row per statistic, with a column of labels and then one per player"""
+
+    def __init__(self, game, parent=None):
+        super().__init__(parent)
+        self.game = game
+        self.__signatures = {}  # Player -> their signed name, scaled for the name row
+        self.__awards = None  # column -> awards won, worked out again after any change
+
+        self.__label_font = QFont()
+        self.__label_font.setBold(True)
+        self.__name_font = QFont()
+        self.__name_font.setPointSize(28)
+
+        game.buzz_stats.subscribe(self.__changed)
+
+    def __changed(self, player):
+        self.__awards = None
+        if player is None or player not in self.game.players:
+            self.beginResetModel()
+            self.endResetModel()
+            return
+        col = self.game.players.index(player) + 1
+        last_col = self.columnCount() - 1
+        self.dataChanged.emit(self.index(1, 1), self.index(1, last_col))
+        self.dataChanged.emit(self.index(2, col), self.index(len(stats_rows) - 1, col))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(stats_rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.game.players) + 1
+
+    def __signature(self, player):
+        if player not in self.__signatures:
+            self.__signatures[player] = signature_pixmap(player.name, NAME_ROW_HEIGHT)
+        return self.__signatures[player]
+
+    def __award_text(self, col):
+        if self.__awards is None:
+            self.__awards = {}
+            buzz_stats = self.game.buzz_stats
+            for award, value, lowest in awards:
+                best_col, best = None, None
+                for i, player in enumerate(self.game.players):
+                    v = value(player, buzz_stats.get(player))
+                    # nobody wins for nothing
+                    if v is None or (not lowest and v <= 0):
+                        continue
+                    if best is None or (v < best if lowest else v > best):
+                        best_col, best = i + 1, v
+                if best_col is not None:
+                    self.__awards.setdefault(best_col, []).append(award)
+        won = self.__awards.get(col)
+        return "🏆 " + ", ".join(won) if won else ""
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        row, col = index.row(), index.column()
+        if col == 0:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return stats_rows[row][0] + ":"
+            if role == Qt.ItemDataRole.FontRole:
+                return self.__label_font
+            return None
+
+        player = self.game.players[col - 1]
+        if row == 0:
+            signed = is_signature(player.name)
+            if role == Qt.ItemDataRole.DisplayRole and not signed:
+                return player.name
+            if role == Qt.ItemDataRole.DecorationRole and signed:
+                return self.__signature(player)
+            if role == Qt.ItemDataRole.FontRole:
+                return self.__name_font
+            if role == Qt.ItemDataRole.SizeHintRole:
+                return QSize(0, NAME_ROW_HEIGHT)
+            return None
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if row == 1:
+            return self.__award_text(col)
+        return stats_rows[row][1](player, self.game.buzz_stats.get(player))
+
 
 class StatsBox(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        # Read the current theme from the configuration file
-        with open('config.json', 'r') as f:
-            config = json.load(f)
-        current_earlybuzztimeout = config.get('earlybuzztimeout', DEFAULT_CONFIG['earlybuzztimeout'])
-
         self.setWindowTitle("Buzz Stats")
         self.resize(1250, 600)
         layout = QVBoxLayout()
 
-        game = parent.game
-
-        table = QTableWidget()
-        table.setColumnCount(len(game.players)+1)
-        table.setRowCount(len(stats_labels))
+        # the model follows the game, so the table is up to date whenever the box is shown
+        self.model = StatsModel(parent.game, self)
 
+        table = QTableView()
         font = QFont()
         font.setPointSize(16)
         table.setFont(font)
-
-        # Set the first column to be the stats labels
-        for i, label in enumerate(stats_labels):
-            label_widget = QLabel(label + ":")
-            font = label_widget.font()
-            font.setBold(True)
-            font.setPointSize(16)
-            label_widget.setFont(font)
-            table.setCellWidget(i, 0, label_widget)
-        
-        awards = {
-            "Most Correct": [None, 0],
-            "Most Wrong": [None, 0],
-            "Most Revenue": [None, 0],
-            "Quickest Buzzer": [None, 0],
-            "Most buzz-ins": [None, 0],
-        }
-
-        for i, player in enumerate(game.players):
-            name_label = NameLabel(player.name, self)
-            table.setCellWidget(0, i+1, name_label)
-            table.setCellWidget(1, i+1, QLabel(""))
-            table.cellWidget(1, i+1).setWordWrap(True)
-            # Allow above cell to take up more height if words wrap
-            table.verticalHeader().setSectionResizeMode(i+1, QHeaderView.ResizeMode.ResizeToContents)
-
-            # Show first, early, and late buzz stats
-            first_buzzes = 0
-            early_buzzes = 0
-            late_buzzes = 0
-            fastest_buzz = None
-            for buzz in player.buzz_delays:
-                if buzz["timing"] == "first":
-                    first_buzzes += 1
-                    if fastest_buzz is None or buzz["delay"] < fastest_buzz:
-                        fastest_buzz = buzz["delay"]
-                elif buzz["timing"] == "early":
-                    early_buzzes += 1
-                elif buzz["timing"] == "late":
-                    late_buzzes += 1
-            table.setCellWidget(2, i+1, QLabel(str(first_buzzes)))
-            table.setCellWidget(3, i+1, QLabel(str(early_buzzes)))
-            table.setCellWidget(4, i+1, QLabel(str(late_buzzes)))
-            if fastest_buzz is not None:
-                table.setCellWidget(5, i+1, QLabel(f"{fastest_buzz:.3f}s"))
-            else:
-                table.setCellWidget(5, i+1, QLabel("N/A"))
-            
-            # Other stats which are already prerecorded
-            table.setCellWidget(6, i+1, QLabel(str(player.stats["correct"])))
-            table.setCellWidget(7, i+1, QLabel(str(player.stats["incorrect"])))
-            table.setCellWidget(8, i+1, QLabel(f"${player.stats['revenue']:,}"))
-            table.setCellWidget(9, i+1, QLabel(f"${player.stats['losses']:,}"))
-
-            self.update_awards(i+1, player, awards, first_buzzes, fastest_buzz)
-
-        # Display awards
-        for award in awards:
-            if awards[award][0] is not None:
-                # Get existing text in cell
-                text = table.cellWidget(1, awards[award][0]).text()
-                if text == "":
-                    text = " "
-                else:
-                    text += ", "
-                logging.info(f"col: {awards[award][0]}")
-                table.cellWidget(1, awards[award][0]).setText("🏆" + text + award)
+        table.setModel(self.model)
+        table.setWordWrap(True)
+        table.horizontalHeader().hide()
+        table.verticalHeader().hide()
 
         # Set the table width to match the window width
         table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-
-        # Set first row height to 100 pixels
-        table.setRowHeight(0, 100)
+        self.model.modelReset.connect(table.resizeRowsToContents)
+        self.table = table
 
         layout.addWidget(table)
         self.setLayout(layout)
-    
-    def update_awards(self, col, player, awards, first_buzzes, fastest_buzz):
-        for award in awards:
-            if award == "Most Correct":
-                if player.stats["correct"] > awards[award][1]:
-                    awards[award] = [col, player.stats["correct"]]
-            elif award == "Most Wrong":
-                if player.stats["incorrect"] > awards[award][1]:
-                    awards[award] = [col, player.stats["incorrect"]]
-            elif award == "Most Revenue":
-                if player.stats["revenue"] > awards[award][1]:
-                    awards[award] = [col, player.stats["revenue"]]
-            elif award == "Quickest Buzzer":
-                if fastest_buzz is not None:
-                    if fastest_buzz < awards[award][1]:
-                        awards[award] = [col, fastest_buzz]
-            elif award == "Most buzz-ins":
-                if first_buzzes > awards[award][1]:
-                    awards[award] = [col, first_buzzes]
\ No newline at end of file
+
+    def showEvent(self, event):
+        # Allow the awards to take up more height if words wrap. Sized here rather than on
+        # every change, which would measure every cell of the table on every buzz
+        self.table.resizeRowsToContents()
+        super().showEvent(event)
+
+
+def _percent(right, wrong):
+    judged = (right or 0) + (wrong or 0)
+    return f"{100 * right / judged:.0f}%" if judged else "N/A"
+
+
+def _money(n):
+    if n is None:
+        return ""
+    return f"{'-$' if n < 0 else '$'}{abs(n):,}"
+
+
+# (header, how to show a row) for each column of the history box's tables
+leaderboard_columns = [
+    ("Player", lambda row: "" if is_signature(row["name"]) else row["name"]),
+    ("Games", lambda row: str(row["games"])),
+    ("Wins", lambda row: str(row["wins"])),
+    ("Best score", lambda row: _money(row["best"])),
+    ("Correct", lambda row: str(row["correct"] or 0)),
+    ("Incorrect", lambda row: str(row["incorrect"] or 0)),
+    ("Accuracy", lambda row: _percent(row["correct"], row["incorrect"])),
+    ("Revenue", lambda row: _money(row["revenue"] or 0)),
+    ("First buzzes", lambda row: str(row["first"] or 0)),
+    ("Mean reaction", lambda row: _seconds(row["reaction"])),
+    ("Fastest buzz", lambda row: _seconds(row["fastest"])),
+]
+player_game_columns = [
+    ("Night", lambda row: row["night"]),
+    ("Game", lambda row: row["episode"] or ""),
+    ("Score", lambda row: _money(row["score"])),
+    ("Won", lambda row: "🏆" if row["won"] else ""),
+    ("Correct", lambda row: str(row["correct"] or 0)),
+    ("Incorrect", lambda row: str(row["incorrect"] or 0)),
+    ("Mean reaction", lambda row: _seconds(row["reaction"])),
+]
+player_category_columns = [
+    ("Category", lambda row: row["category"] or ""),
+    ("Correct", lambda row: str(row["correct"])),
+    ("Incorrect", lambda row: str(row["incorrect"])),
+    ("Accuracy", lambda row: _percent(row["correct"], row["incorrect"])),
+]
+
+# how far back each choice of the history box's season goes, in days, or None for all time
+seasons = {
+    "All time": None,
+    "Last 365 days": 365,
+    "Last 90 days": 90,
+    "Last 30 days": 30,
+}
+
+SIGNATURE_HEIGHT = 32
+
+
+class RowsModel(QAbstractTableModel):
+    """a read-only table of query rows, shown through `columns`"""
+
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.rows = []
+        self.__signatures = {}  # name -> pixmap, for players who signed
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.columns[section][0]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        row = self.rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.columns[index.column()][1](row)
+        if role == Qt.ItemDataRole.DecorationRole and index.column() == 0 and is_signature(row.get("name", "")):
+            name = row["name"]
+            if name not in self.__signatures:
+                self.__signatures[name] = signature_pixmap(name, SIGNATURE_HEIGHT)
+            return self.__signatures[name]
+        return None
+
+
+class HistoryBox(QDialog):
+    """the leaderboard over a season of games, and the games and categories of the player picked from it"""
+
+    def __init__(self, history, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.setWindowTitle("Leaderboard")
+        self.resize(1250, 800)
+        layout = QVBoxLayout()
+
+        self.season_combobox = QComboBox(self)
+        self.season_combobox.addItems(list(seasons))
+        self.season_combobox.currentTextChanged.connect(self.refresh)
+        season_layout = QHBoxLayout()
+        season_layout.addWidget(QLabel("Season:", self))
+        season_layout.addWidget(self.season_combobox)
+        season_layout.addStretch(1)
+        layout.addLayout(season_layout)
+
+        self.leaderboard = RowsModel(leaderboard_columns, self)
+        self.games = RowsModel(player_game_columns, self)
+        self.categories = RowsModel(player_category_columns, self)
+
+        self.leaderboard_view = self.__table(self.leaderboard)
+        self.leaderboard_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.leaderboard_view.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.leaderboard_view.selectionModel().currentRowChanged.connect(self.show_player)
+        layout.addWidget(self.leaderboard_view, 3)
+
+        player_layout = QHBoxLayout()
+        player_layout.addWidget(self.__table(self.games), 3)
+        player_layout.addWidget(self.__table(self.categories), 2)
+        layout.addLayout(player_layout, 2)
+
+        self.setLayout(layout)
+        self.refresh()
+
+    def __table(self, model):
+        table = QTableView(self)
+        table.setModel(model)
+        table.verticalHeader().hide()
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        return table
+
+    def refresh(self):
+        days = seasons[self.season_combobox.currentText()]
+        since = "" if days is None else time.strftime("%Y-%m-%d", time.localtime(time.time() - days * 86400))
+        start = time.perf_counter()
+        self.leaderboard.set_rows(self.history.leaderboard(since))
+        logging.info(f"leaderboard of {len(self.leaderboard.rows)} players in {(time.perf_counter() - start) * 1000:.1f} ms")
+        self.games.set_rows([])
+        self.categories.set_rows([])
+        if self.leaderboard.rows:
+            self.leaderboard_view.selectRow(0)
+
+    def show_player(self, current, previous):
+        if not current.isValid():
+            return
+        player = self.leaderboard.rows[current.row()]["id"]
+        self.games.set_rows(self.history.player_games(player))
+        self.categories.set_rows(self.history.player_categories(player))
+
+
+def format_bytes(n):
+    for unit in ["B", "KB", "MB"]:
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+class CacheStatsBox(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Media Cache")
+
+        layout = QVBoxLayout()
+        self.grid = QGridLayout()
+        layout.addLayout(self.grid)
+
+        clear_button = QPushButton("Clear cache", self)
+        clear_button.clicked.connect(self.clear)
+        layout.addWidget(clear_button, alignment=Qt.AlignmentFlag.AlignHCenter)
+
+        self.setLayout(layout)
+        self.refresh()
+
+    def refresh(self):
+        while self.grid.count() > 0:
+            self.grid.takeAt(0).widget().deleteLater()
+
+        stats = media_cache().stats()
+
+        def hit_rate(hits, misses):
+            lookups = hits + misses
+            return f"{100 * hits / lookups:.0f}%" if lookups > 0 else "N/A"
+
+        rows = [
+            ("", "This session", "All time"),
+            ("Hits", str(stats["hits"]), str(stats["total_hits"])),
+            ("Misses", str(stats["misses"]), str(stats["total_misses"])),
+            (
+                "Hit rate",
+                hit_rate(stats["hits"], stats["misses"]),
+                hit_rate(stats["total_hits"], stats["total_misses"]),
+            ),
+            (
+                "Downloads saved",
+                format_bytes(stats["bytes_saved"]),
+                format_bytes(stats["total_bytes_saved"]),
+            ),
+            ("Cached images", str(stats["entries"]), ""),
+            ("Known missing", str(stats["negative_entries"]), ""),
+            ("Size", f"{format_bytes(stats['size'])} of {format_bytes(stats['budget'])}", ""),
+        ]
+        for i, row in enumerate(rows):
+            for j, text in enumerate(row):
+                label = QLabel(text, self)
+                if i == 0 or j == 0:
+                    font = label.font()
+                    font.setBold(True)
+                    label.setFont(font)
+                self.grid.addWidget(label, i, j)
+
+    def clear(self):
+        media_cache().clear()
+        self.refresh()
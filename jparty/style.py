@@ -2,10 +2,10 @@ from PyQt6.QtWidgets import QStyle, QCommonStyle
 from PyQt6.QtGui import QPalette, QColor
 from PyQt6.QtCore import Qt
 
-import json
 import logging
 
-from jparty.utils import DynamicLabel, add_shadow, resource_path
+from jparty.utils import DynamicLabel, add_shadow
+from jparty.theme import theme, theme_registry
 
 
 class JPartyStyle(QCommonStyle):
@@ -56,45 +56,31 @@ WINDOWPAL.setColor(
     QPalette.ColorGroup.Disabled, QPalette.ColorRole.ButtonText, QColor("#d0d0d0")
 )
 
-# Try to load theme colors from theme_config.json so styles match Game's theme.
-# theme_config.json is expected to contain hex strings for 'boardTileColor' and
-# 'boardTileHighlightedColor'.
-try:
-    with open(resource_path('theme_config.json'), 'r') as _f:
-        _theme = json.load(_f)
-except Exception:
-    _theme = {}
-
-_colors = _theme.get('colors', _theme)
-
-def _ensure_hash(s):
-    if s is None:
-        return None
-    if isinstance(s, str) and s.startswith('#'):
-        return s
-    if isinstance(s, str):
-        return f'#{s}'
-    return None
-
-_board_tile_hex = _ensure_hash(_colors.get('boardTileColor')) or '#1010a1'
-_board_tile_highlighted_hex = _ensure_hash(_colors.get('boardTileHighlightedColor')) or '#0b0b74'
-_board_text_hex = _ensure_hash(_colors.get('boardTextColor')) or '#ffcc00'
-
-# Provide both constant-style names and snake_case names so callers can use either.
-BOARD_TILE_COLOR = QColor(_board_tile_hex)
-BOARD_TILE_HIGHLIGHTED_COLOR = QColor(_board_tile_highlighted_hex)
+# Theme colors. These objects are shared by every widget that imports them, so
+# apply_theme() updates them in place when the theme changes; widgets that
+# copied them into their own palette re-apply them from ThemeRegistry.changed.
+BOARD_TILE_COLOR = QColor()
+BOARD_TILE_HIGHLIGHTED_COLOR = QColor()
 
 # Board text color used for money / clue text on the board
-BOARD_TEXT_COLOR = QColor(_board_text_hex)
+BOARD_TEXT_COLOR = QColor()
 
-# Convenience lowercase names requested: board_tile_color, board_tile_highlighted_color
+# lowercase aliases of the same objects, as board_widget.py imports them
 board_text_color = BOARD_TEXT_COLOR
-
-# Convenience lowercase names requested: board_tile_color, board_tile_highlighted_color
 board_tile_color = BOARD_TILE_COLOR
 board_tile_highlighted_color = BOARD_TILE_HIGHLIGHTED_COLOR
 
 CARDPAL = QPalette()
-CARDPAL.setColor(QPalette.ColorRole.Window, BOARD_TILE_COLOR)
-CARDPAL.setColor(QPalette.ColorRole.WindowText, QColor('#ffffff'))
-logging.info(f"Style colors - BOARD_TILE_COLOR: {_board_tile_hex}, BOARD_TILE_HIGHLIGHTED_COLOR: {_board_tile_highlighted_hex}, BOARD_TEXT_COLOR: {_board_text_hex}")
+
+
+def apply_theme(theme):
+    BOARD_TILE_COLOR.setRgba(theme.color('boardTileColor').rgba())
+    BOARD_TILE_HIGHLIGHTED_COLOR.setRgba(theme.color('boardTileHighlightedColor').rgba())
+    BOARD_TEXT_COLOR.setRgba(theme.color('boardTextColor').rgba())
+    CARDPAL.setColor(QPalette.ColorRole.Window, BOARD_TILE_COLOR)
+    CARDPAL.setColor(QPalette.ColorRole.WindowText, QColor('#ffffff'))
+    logging.info(f"Style colors - BOARD_TILE_COLOR: {BOARD_TILE_COLOR.name()}, BOARD_TILE_HIGHLIGHTED_COLOR: {BOARD_TILE_HIGHLIGHTED_COLOR.name()}, BOARD_TEXT_COLOR: {BOARD_TEXT_COLOR.name()}")
+
+
+apply_theme(theme())
+theme_registry().changed.connect(apply_theme)
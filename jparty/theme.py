@@ -0,0 +1,241 @@
+"""every theme loaded into shared caches, so switching theme re-skins widgets in place"""
+from PyQt6.QtGui import QColor, QPixmap, QImageReader, QFontDatabase
+from PyQt6.QtCore import Qt, QObject, pyqtSignal
+
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+from jparty.config import config
+from jparty.utils import resource_path
+from jparty.audio import audio_bank
+from jparty.constants import PIXMAP_CACHE_ENTRIES
+
+THEMES = ["Default", "Christmas", "Halloween", "EightiesSynthwave", "BibleBonkers"]
+
+IMAGES = [
+    "icon.png",
+    "podium.png",
+    "player.png",
+    "player_active.png",
+    "player_timed_out.png",
+    "player_lights1.png",
+    "player_lights2.png",
+    "player_lights3.png",
+    "player_lights4.png",
+    "player_lights5.png",
+    "close-icon.png",
+    "space.png",
+    "left-arrow.png",
+    "right-arrow.png",
+]
+
+DEFAULT_COLORS = {
+    'boardTileColor': '#1010a1',
+    'boardTileHighlightedColor': '#0b0b74',
+    'boardTextColor': '#ffcc00',
+    'nameLabelColor': '#1010a1',
+}
+
+
+def _ensure_hash(s):
+    if s is None:
+        return None
+    if isinstance(s, str) and s.startswith('#'):
+        return s
+    if isinstance(s, str):
+        return f'#{s}'
+    return None
+
+
+def read_colors(name):
+    """the colors of theme `name` from its theme_config.json, as hex strings"""
+    try:
+        with open(resource_path('theme_config.json', name), 'r') as f:
+            data = json.load(f)
+    except Exception:
+        data = {}
+    block = data.get('colors', data)
+    colors = dict(DEFAULT_COLORS)
+    for key in DEFAULT_COLORS:
+        colors[key] = _ensure_hash(block.get(key)) or DEFAULT_COLORS[key]
+    return colors
+
+
+class Theme(object):
+    def __init__(self, name):
+        self.name = name
+        self.colors = read_colors(name)
+        self.__lock = threading.Lock()
+        self.__images = {}
+        self.__pixmaps = {}
+        self.__fonts = None
+
+    def color(self, key):
+        return QColor(self.colors[key])
+
+    def preload(self):
+        """decode every image of the theme. Safe to call from any thread"""
+        for name in IMAGES:
+            self.__image(name)
+
+    def __image(self, name):
+        with self.__lock:
+            image = self.__images.get(name)
+        if image is None:
+            image = QImageReader(resource_path(name, self.name)).read()
+            with self.__lock:
+                self.__images[name] = image
+        return image
+
+    def pixmap(self, name):
+        """the shared pixmap of image `name`. GUI thread only"""
+        pixmap = self.__pixmaps.get(name)
+        if pixmap is None:
+            pixmap = QPixmap.fromImage(self.__image(name))
+            self.__pixmaps[name] = pixmap
+        return pixmap
+
+    def load_fonts(self):
+        """register the fonts of the theme with Qt, once. GUI thread only"""
+        if self.__fonts is not None:
+            return
+        fonts = []
+        for filename in ("board_font.ttf", "question_font.ttf"):
+            font_id = QFontDatabase.addApplicationFont(resource_path(filename, self.name))
+            families = QFontDatabase.applicationFontFamilies(font_id)
+            if families:
+                logging.info(f"Loaded {self.name} font family name: {families[0]}")
+            else:
+                logging.info(f"Could not retrieve {self.name} font family name for {filename}")
+            fonts.append(families)
+        self.__fonts = fonts
+
+    @property
+    def board_font(self):
+        """font families for the board and scores"""
+        self.load_fonts()
+        return self.__fonts[0]
+
+    @property
+    def question_font(self):
+        """font families for clues and answers"""
+        self.load_fonts()
+        return self.__fonts[1]
+
+
+class PixmapCache(object):
+    """
+    theme images scaled for drawing, keyed by (image, theme, size, device
+    pixel ratio). GUI thread only
+    """
+
+    def __init__(self, max_entries=PIXMAP_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.__pixmaps = OrderedDict()  # least recently used first
+
+    def get(self, theme, name, size, dpr=1.0, aspect=Qt.AspectRatioMode.IgnoreAspectRatio):
+        if size.isEmpty():
+            return QPixmap()
+        key = (name, theme.name, size.width(), size.height(), dpr, aspect)
+        pixmap = self.__pixmaps.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            self.__pixmaps.move_to_end(key)
+            return pixmap
+
+        self.misses += 1
+        pixmap = theme.pixmap(name).scaled(
+            size * dpr, aspect, Qt.TransformationMode.SmoothTransformation
+        )
+        pixmap.setDevicePixelRatio(dpr)
+        self.__pixmaps[key] = pixmap
+        while len(self.__pixmaps) > self.max_entries:
+            self.__pixmaps.popitem(last=False)
+        return pixmap
+
+    def retain(self, theme_name):
+        """drop every pixmap that doesn't belong to theme `theme_name`"""
+        for key in [k for k in self.__pixmaps if k[1] != theme_name]:
+            del self.__pixmaps[key]
+
+    def report(self):
+        logging.info(
+            f"pixmap cache: {self.hits} hits, {self.misses} misses, {len(self.__pixmaps)} pixmaps"
+        )
+
+
+class ThemeRegistry(QObject):
+    changed = pyqtSignal(object)  # the new Theme
+
+    def __init__(self):
+        super().__init__()
+        self.__lock = threading.Lock()
+        self.__themes = {}
+        self.pixmaps = PixmapCache()
+        self.current = self.get(config().get('theme'))
+        config().changed.connect(self.__config_changed)
+
+    def get(self, name):
+        with self.__lock:
+            if name not in self.__themes:
+                self.__themes[name] = Theme(name)
+            return self.__themes[name]
+
+    def preload(self):
+        """decode the images and sounds of every theme in the background, current theme first"""
+
+        def run():
+            start = time.perf_counter()
+            names = [self.current.name] + [n for n in THEMES if n != self.current.name]
+            for name in names:
+                self.get(name).preload()
+                audio_bank().preload(name)
+            logging.info(
+                f"preloaded {len(names)} themes in {(time.perf_counter() - start) * 1000:.0f} ms"
+            )
+
+        threading.Thread(target=run, name="theme preload", daemon=True).start()
+
+    def switch(self, name):
+        if name == self.current.name:
+            return
+        start = time.perf_counter()
+        theme = self.get(name)
+        audio_bank().load(name)
+        self.current = theme
+        self.pixmaps.retain(name)
+        self.changed.emit(theme)
+        logging.info(f"switched to theme {name} in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def __config_changed(self, key, value):
+        if key == 'theme':
+            self.switch(value)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def theme_registry():
+    """the shared theme registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ThemeRegistry()
+        return _registry
+
+
+def theme():
+    """the current theme"""
+    return theme_registry().current
+
+
+def scaled_pixmap(name, size, dpr=1.0, aspect=Qt.AspectRatioMode.IgnoreAspectRatio):
+    """image `name` of the current theme, scaled to fill `size` at device pixel ratio `dpr`"""
+    registry = theme_registry()
+    return registry.pixmaps.get(registry.current, name, size, dpr, aspect)
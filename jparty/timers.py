@@ -0,0 +1,89 @@
+"""game countdowns, as deadlines on one monotonic `TimerService` that wakes the GUI thread"""
+from PyQt6.QtCore import Qt, QObject, QTimer, pyqtSignal
+
+import math
+import time
+import logging
+import threading
+
+from jparty.engine import Clock, Countdown
+
+
+class TimerService(QObject, Clock):
+    """a Clock on monotonic time, whose callbacks a QTimer runs on the GUI thread"""
+
+    __rearm_requested = pyqtSignal()
+
+    def __init__(self):
+        QObject.__init__(self)
+        Clock.__init__(self)
+        self.__timer = QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.__timer.timeout.connect(self.__fire)
+        # queued when a deadline is added off the GUI thread
+        self.__rearm_requested.connect(self.__rearm)
+
+        # how late deadlines fired, in seconds
+        self.fired = 0
+        self.total_drift = 0.0
+        self.max_drift = 0.0
+
+    def now(self):
+        return time.monotonic()
+
+    def _scheduled(self):
+        self.__rearm_requested.emit()
+
+    def __rearm(self):
+        deadline = self.next_deadline()
+        if deadline is None:
+            self.__timer.stop()
+            return
+        # round up: firing a little late is measured, firing early is not allowed
+        delay = max(0.0, deadline - time.monotonic())
+        self.__timer.start(math.ceil(delay * 1000))
+
+    def __fire(self):
+        now = time.monotonic()
+        while True:
+            entry = self._pop_due(now)
+            if entry is None:
+                break
+            drift = now - entry.deadline
+            self.fired += 1
+            self.total_drift += drift
+            self.max_drift = max(self.max_drift, drift)
+            try:
+                entry.callback()
+            except Exception:
+                logging.exception("timer callback failed")
+        self.__rearm()
+
+    def report(self):
+        if self.fired == 0:
+            return
+        logging.info(
+            f"fired {self.fired} timers, drift mean {self.total_drift / self.fired * 1000:.3f} ms, "
+            f"max {self.max_drift * 1000:.3f} ms"
+        )
+
+
+_timer_service = None
+_timer_service_lock = threading.Lock()
+
+
+def timer_service():
+    """the shared timer service. Create it on the GUI thread first"""
+    global _timer_service
+    with _timer_service_lock:
+        if _timer_service is None:
+            _timer_service = TimerService()
+        return _timer_service
+
+
+class QuestionTimer(Countdown):
+    """a countdown of `interval` seconds on the timer service that can be paused, calling `f` when it runs out"""
+
+    def __init__(self, interval, f, *args, **kwargs):
+        super().__init__(timer_service(), interval, f, *args, **kwargs)
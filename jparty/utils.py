@@ -1,14 +1,15 @@
-import simpleaudio as sa
-
-from threading import Thread
 import re
 import os
 import sys
-import json
+from functools import lru_cache
+
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QImage, QPainter
+from PyQt6.QtWidgets import QLabel, QPushButton, QSizePolicy
+from PyQt6.QtCore import Qt, QSize, QRect
 
-from PyQt6.QtGui import QColor, QFontMetrics
-from PyQt6.QtWidgets import QGraphicsDropShadowEffect, QLabel, QPushButton, QSizePolicy
-from PyQt6.QtCore import Qt, QSize
+from jparty.config import config
+from jparty.constants import AUTOFIT_CACHE_ENTRIES
+from jparty.shadow import ShadowLayer, shadow_cache, shadow_margin
 
 def get_base_path(file=None):
     path = ""
@@ -21,14 +22,16 @@ def get_base_path(file=None):
         return path
     return os.path.join(path, file)
 
-def resource_path(relative_path):
-    base_path = get_base_path()
+def resource_path(relative_path, theme=None):
+    if theme is None:
+        theme = config().get('theme')
+    # theme directories are lower case ("Christmas" lives in data/christmas)
+    return _resolve_resource(relative_path, theme.lower())
 
-    # Read the current theme from the configuration file
-    with open('config.json', 'r') as f:
-        config = json.load(f)
 
-    theme = config.get('theme', 'default')
+@lru_cache(maxsize=None)
+def _resolve_resource(relative_path, theme):
+    base_path = get_base_path()
 
     resolved_file = os.path.join(base_path, "data", theme, relative_path)
     if os.path.isfile(resolved_file):
@@ -38,79 +41,16 @@ def resource_path(relative_path):
     return default_file
 
 
-class SongPlayer(object):
-    def __init__(self):
-        super().__init__()
-        self.__wave_obj = sa.WaveObject.from_wave_file(resource_path("intro.wav"))
-        self.__final = sa.WaveObject.from_wave_file(resource_path("final.wav"))
-        self.__play_obj = None
-        self.__repeating = False
-        self.__repeat_thread = None
-
-    def play(self, repeat=False):
-        self.__repeating = repeat
-        self.__play_obj = self.__wave_obj.play()
-        if repeat:
-            self.__repeat_thread = Thread(target=self.__repeat)
-            self.__repeat_thread.start()
-
-    def final(self, repeat=False):
-        self.__repeating = repeat
-        self.__play_obj = self.__final.play()
-        if repeat:
-            self.__repeat_thread = Thread(target=self.__repeat)
-            self.__repeat_thread.start()
-
-    def stop(self):
-        self.__repeating = False
-        self.__play_obj.stop()
-
-    def __repeat(self):
-        while True:
-            self.__play_obj.wait_done()
-            if not self.__repeating:
-                break
-            self.__play_obj = self.__wave_obj.play()
-
-
-class CompoundObject(object):
-    def __init__(self, *objs):
-        self.__objs = list(objs)
-
-    def __setattr__(self, name, value):
-        if name[0] == "_":
-            self.__dict__[name] = value
-        else:
-            for obj in self.__objs:
-                setattr(obj, name, value)
-
-    def __getattr__(self, name):
-        ret = CompoundObject(*[getattr(obj, name) for obj in self.__objs])
-        return ret
-
-    def __iadd__(self, display):
-        self.__objs.append(display)
-        return self
-
-    def __call__(self, *args, **kwargs):
-        return CompoundObject(*[obj(*args, **kwargs) for obj in self.__objs])
-
-    def __repr__(self):
-        return "CompoundObject(" + ", ".join([repr(o) for o in self.__objs]) + ")"
-
-
-"""add shadow to widget. Radius is proportion of widget height"""
+"""add a baked drop shadow to widget. Radius is in pixels, the widget height by default"""
 
 
 def add_shadow(widget, radius=None, offset=3):
-    shadow = QGraphicsDropShadowEffect(widget)
-    if radius is not None:
-        shadow.setBlurRadius(radius)
+    if radius is None:
+        radius = widget.height()
+    if isinstance(widget, DynamicLabel):
+        widget.set_shadow(radius, offset)
     else:
-        shadow.setBlurRadius(widget.height())
-    shadow.setColor(QColor("black"))
-    shadow.setOffset(offset)
-    widget.setGraphicsEffect(shadow)
+        ShadowLayer(widget, radius, offset)
 
 
 class AutosizeWidget(object):
@@ -139,11 +79,15 @@ class AutosizeWidget(object):
 
         fontsize = self.autofitsize()
         font = self.font()
+        if font.pixelSize() == fontsize:
+            return None
         font.setPixelSize(fontsize)
         self.setFont(font)
 
     def plaintext(self):
         text = self.text()
+        if "<" not in text:
+            return text
         text = re.sub("<br>", "\n", text)
         text = re.sub("<[^>]*>", "", text)
         return text
@@ -165,8 +109,7 @@ class AutosizeWidget(object):
         else:
             raise Exception("Need 1, 2, or 4 arguments")
 
-    def autofitsize(self, stepsize=1):
-
+    def autofitsize(self):
         font = self.font()
 
         ml, mt, mr, md = self.autosize_margins
@@ -174,35 +117,95 @@ class AutosizeWidget(object):
             int(self.width() * ml),
             int(self.height() * mt),
             int(-self.width() * mr),
-            int(-self.height() * mt),
+            int(-self.height() * md),
         )
 
-        text = self.plaintext()
-
         font.setPixelSize(int(self.initialSize()))
-        size = font.pixelSize()
+        return fit_pixel_size(
+            self.plaintext(), font.toString(), self.flags(), rect.width(), rect.height()
+        )
+
 
-        def fullrect(font):
-            fm = QFontMetrics(font)
-            return fm.boundingRect(rect, self.flags(), text)
+@lru_cache(maxsize=AUTOFIT_CACHE_ENTRIES)
+def fit_pixel_size(text, font_description, flags, width, height):
+    """
+    the largest pixel size, up to that of the font described by
+    `font_description`, at which `text` fits in a `width` x `height` rect.
+    Memoized, so every widget on both displays shares the results
+    """
+    font = QFont()
+    font.fromString(font_description)
+    rect = QRect(0, 0, width, height)
 
-        newrect = fullrect(font)
-        if not rect.contains(newrect):
-            while size > 2:
-                size -= stepsize
-                font.setPixelSize(size)
-                newrect = fullrect(font)
-                if rect.contains(newrect):
-                    return font.pixelSize()
+    def fits(size):
+        font.setPixelSize(size)
+        return rect.contains(QFontMetrics(font).boundingRect(rect, flags, text))
 
+    size = font.pixelSize()
+    if fits(size):
         return size
 
+    # binary search for the largest size that fits, bottoming out at 2
+    best = 2
+    low, high = 3, size - 1
+    while low <= high:
+        mid = (low + high) // 2
+        if fits(mid):
+            best = mid
+            low = mid + 1
+        else:
+            high = mid - 1
+    return min(best, size)
+
 
 class DynamicLabel(QLabel, AutosizeWidget):
     def __init__(self, text, initialSize, parent=None):
         self.__initialSize = initialSize
+        self.__shadow = None
         super().__init__(text, parent)
 
+    def set_shadow(self, radius, offset=3, color=QColor("black")):
+        """draw a baked shadow under the text (or pixmap), or none if `radius` is None"""
+        self.__shadow = None if radius is None else (radius, offset, QColor(color))
+        self.update()
+
+    def __shadow_key(self):
+        return (
+            "label",
+            self.plaintext(),
+            self.pixmap().cacheKey(),
+            self.font().key(),
+            self.flags(),
+            self.margin(),
+            self.width(),
+            self.height(),
+        )
+
+    def __shadow_mask(self):
+        mask = QImage(self.size(), QImage.Format.Format_ARGB32_Premultiplied)
+        mask.fill(Qt.GlobalColor.transparent)
+        qp = QPainter(mask)
+        m = self.margin()
+        rect = self.contentsRect().adjusted(m, m, -m, -m)
+        if not self.pixmap().isNull():
+            self.style().drawItemPixmap(qp, rect, self.alignment(), self.pixmap())
+        else:
+            qp.setFont(self.font())
+            qp.setPen(Qt.GlobalColor.black)
+            qp.drawText(rect, self.flags(), self.plaintext())
+        qp.end()
+        return mask
+
+    def paintEvent(self, event):
+        if self.__shadow is not None and (self.text() or not self.pixmap().isNull()):
+            radius, offset, color = self.__shadow
+            shadow = shadow_cache().get(self.__shadow_key(), self.__shadow_mask, radius, color)
+            margin = shadow_margin(radius)
+            qp = QPainter(self)
+            qp.drawPixmap(offset - margin, offset - margin, shadow)
+            qp.end()
+        super().paintEvent(event)
+
     def flags(self):
         flags = 0
         if self.wordWrap():
@@ -0,0 +1,165 @@
+"""a pool of hidden, already initialized web views for video clues"""
+from PyQt6.QtCore import QObject, QTimer, QUrl
+from PyQt6.QtWebEngineWidgets import QWebEngineView
+from PyQt6.QtWebEngineCore import QWebEngineSettings
+
+import logging
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs
+
+from jparty.constants import VIDEO_PORT, VIDEO_PLAY_TIME, VIDEO_POOL_SIZE
+
+
+def parse_video_link(video_link):
+    """
+    turn a YouTube link into (video.html URL, play length, audio only), or None
+    if it isn't a link we can play
+    """
+    video_length = VIDEO_PLAY_TIME
+    audio_only = False
+
+    u = urlparse(video_link)
+    host = (u.hostname or "").lower()
+    qs = parse_qs(u.query or "")
+
+    yt_id = None
+    # youtu.be/VIDEOID
+    if "youtu.be" in host and u.path:
+        yt_id = u.path.strip("/")
+
+    # youtube.com/watch?v=VIDEOID
+    if (yt_id is None) and ("youtube.com" in host):
+        yt_id = (qs.get("v") or [None])[0]
+
+    if not yt_id:
+        return None
+
+    parts = [f"video.html?v={yt_id}"]
+
+    # start time (?t=123) — only accept pure digits
+    t_val = (qs.get("t") or [None])[0]
+    if t_val and t_val.isdigit():
+        parts.append(f"t={t_val}")
+
+    # configured play length (?l=123)
+    l_val = (qs.get("l") or [None])[0]
+    if l_val and l_val.isdigit():
+        video_length = int(l_val)
+
+    # audio-only flag (?a=1)
+    a_val = (qs.get("a") or [None])[0]
+    if a_val == "1":
+        audio_only = True
+        parts.append("a=1")
+
+    url = f"http://localhost:{VIDEO_PORT}/" + "&".join(parts)
+    return url, video_length, audio_only
+
+
+class WebViewPool(QObject):
+    def __init__(self, window, size=VIDEO_POOL_SIZE):
+        super().__init__(window)
+        self.window = window
+        self.size = size
+        self.__count = 0
+        self.__free = []
+        self.__preloaded = OrderedDict()  # video link -> view, oldest first
+
+        # warm up once the event loop runs, so start-up isn't delayed
+        QTimer.singleShot(0, self.__warm)
+
+    def __warm(self):
+        while self.__count < self.size:
+            self.__free.append(self.__create())
+
+    def __create(self):
+        self.__count += 1
+        view = QWebEngineView(self.window)
+        settings = view.page().settings()
+        settings.setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessRemoteUrls, True)
+        # preloaded clues are started from script, not by a click
+        settings.setAttribute(QWebEngineSettings.WebAttribute.PlaybackRequiresUserGesture, False)
+        view.setVisible(False)
+        view.load(QUrl("about:blank"))
+        return view
+
+    def __take(self):
+        if self.__free:
+            return self.__free.pop()
+        if self.__count < self.size:
+            return self.__create()
+        if self.__preloaded:
+            # reuse the view preloaded longest ago
+            link, view = self.__preloaded.popitem(last=False)
+            logging.info(f"{self.window.windowTitle()}: dropped preloaded video {link}")
+            return view
+        return self.__create()
+
+    def __playable(self, video_link):
+        parsed = parse_video_link(video_link)
+        if parsed is None:
+            return None
+        # audio-only clues are only played on the host display
+        if parsed[2] and not self.window.host():
+            return None
+        return parsed
+
+    def preload(self, questions):
+        """load the videos of upcoming `questions` paused into spare views"""
+        links = []
+        for q in questions:
+            if q.video_link is not None and self.__playable(q.video_link) is not None:
+                links.append(q.video_link)
+        links = links[: self.size - 1]  # always keep a view free for other clues
+
+        for link in list(self.__preloaded):
+            if link not in links:
+                self.release(self.__preloaded.pop(link))
+
+        for link in links:
+            if link in self.__preloaded or not (self.__free or self.__count < self.size):
+                continue
+            url = self.__playable(link)[0]
+            view = self.__take()
+            view.load(QUrl(f"{url}&p=1"))
+            self.__preloaded[link] = view
+            logging.info(f"{self.window.windowTitle()}: preloading video {url}")
+
+    def acquire(self, video_link):
+        """
+        a view playing `video_link`, with its play length and whether it is
+        audio only, or None if it can't be played on this display
+        """
+        parsed = self.__playable(video_link)
+        if parsed is None:
+            return None
+        url, video_length, audio_only = parsed
+
+        view = self.__preloaded.pop(video_link, None)
+        if view is not None:
+            logging.info(f"{self.window.windowTitle()}: playing preloaded video {url}")
+            if not audio_only:
+                view.page().runJavaScript("play()")
+        else:
+            view = self.__take()
+            logging.info(f"loading url: {url}")
+            view.load(QUrl(url))
+        return view, video_length, audio_only
+
+    def release(self, view):
+        """stop `view` and return it to the pool"""
+        view.setVisible(False)
+        view.setParent(self.window)
+        view.setMinimumSize(0, 0)
+        view.setMaximumSize(16777215, 16777215)
+        if len(self.__free) + len(self.__preloaded) >= self.size:
+            self.__count -= 1
+            view.deleteLater()
+            return
+        view.load(QUrl("about:blank"))
+        self.__free.append(view)
+
+    def clear(self):
+        """drop every preloaded video, e.g. when a game is closed"""
+        for link in list(self.__preloaded):
+            self.release(self.__preloaded.pop(link))
@@ -18,6 +18,8 @@ from PyQt6.QtWidgets import (
     QDialog,
     QComboBox,
     QPushButton,
+    QFileDialog,
+    QSpinBox,
 )
 from PyQt6.QtCore import Qt, QSize, pyqtSignal
 
@@ -25,51 +27,46 @@ import qrcode
 import time
 from threading import Thread
 import logging
-import json
 import os
-import sys
+from functools import lru_cache
 
 from jparty.version import version
 from jparty.retrieve import get_game, get_random_game
-from jparty.utils import resource_path, add_shadow, DynamicLabel, DynamicButton
+from jparty.gamepack import write_pack
+from jparty.utils import add_shadow, DynamicLabel, DynamicButton
 from jparty.helpmsg import helpmsg
 from jparty.style import WINDOWPAL
-from jparty.constants import DEFAULT_CONFIG
-
-
-class Image(qrcode.image.base.BaseImage):
-    """QR code image widget"""
-
-    def __init__(self, border, width, box_size):
-        self.border = border
-        self.width = width
-        self.box_size = box_size
-        size = (width + border * 2) * box_size
-        self._image = QImage(size, size, QImage.Format.Format_RGB16)
-        self._image.fill(WINDOWPAL.color(QPalette.ColorRole.Window))
-
-    def pixmap(self):
-        return QPixmap.fromImage(self._image)
-
-    def drawrect(self, row, col):
-        painter = QPainter(self._image)
-        painter.fillRect(
-            (col + self.border) * self.box_size,
-            (row + self.border) * self.box_size,
-            self.box_size,
-            self.box_size,
-            Qt.GlobalColor.black,
-        )
-
-    def save(self, stream, kind=None):
-        pass
+from jparty.constants import PACK_EXTENSION, MIN_MEDIA_CACHE_SIZE, MAX_MEDIA_CACHE_SIZE
+from jparty.config import config
+from jparty.theme import theme_registry, scaled_pixmap, THEMES
+from jparty.stats import CacheStatsBox, HistoryBox
+
+
+@lru_cache(maxsize=8)
+def qr_image(url):
+    """the QR code for `url`, one pixel per module, quiet zone included"""
+    qr = qrcode.QRCode()
+    qr.add_data(url)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+
+    size = len(matrix)
+    image = QImage(size, size, QImage.Format.Format_RGB16)
+    image.fill(WINDOWPAL.color(QPalette.ColorRole.Window))
+    painter = QPainter(image)
+    for row, modules in enumerate(matrix):
+        for col, dark in enumerate(modules):
+            if dark:
+                painter.fillRect(col, row, 1, 1, Qt.GlobalColor.black)
+    painter.end()
+    return image
 
 
 class StartWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.icon = QPixmap(resource_path("icon.png"))
         self.icon_label = DynamicLabel("", 0, self)
+        theme_registry().changed.connect(self.reskin)
 
         add_shadow(self, radius=0.2)
         self.setPalette(WINDOWPAL)
@@ -85,13 +82,17 @@ class StartWidget(QWidget):
         qp.setBrush(QBrush(WINDOWPAL.color(QPalette.ColorRole.Window)))
         qp.drawRect(self.rect())
 
+    def reskin(self, theme):
+        self.update_icon()
+
     def resizeEvent(self, event):
+        self.update_icon()
+
+    def update_icon(self):
         icon_size = self.icon_label.height()
         self.icon_label.setPixmap(
-            self.icon.scaled(
-                icon_size,
-                icon_size,
-                transformMode=Qt.TransformationMode.SmoothTransformation,
+            scaled_pixmap(
+                "icon.png", QSize(icon_size, icon_size), self.devicePixelRatioF()
             )
         )
         self.icon_label.setMaximumWidth(icon_size)
@@ -124,7 +125,7 @@ class Welcome(StartWidget):
         select_layout = QHBoxLayout()
 
         template_url = "https://docs.google.com/spreadsheets/d/1_vBBsWn-EVc7npamLnOKHs34Mc2iAmd9hOGSzxHQX0Y/edit#gid=0"
-        gameid_text = f'Game ID (from J-Archive URL)<br>or <a href="{template_url}">GSheet ID for custom game</a>'
+        gameid_text = f'Game ID (from J-Archive URL),<br><a href="{template_url}">GSheet ID for custom game</a><br>or game pack file'
         self.gameid_label = DynamicLabel(gameid_text, lambda: self.height() * 0.1, self)
         self.gameid_label.setAlignment(
             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
@@ -144,9 +145,21 @@ class Welcome(StartWidget):
         self.rand_button = DynamicButton("Random", self)
         self.rand_button.clicked.connect(self.random)
 
+        self.pack_button = DynamicButton("Save pack", self)
+        self.pack_button.clicked.connect(self.save_pack)
+        self.pack_button.setEnabled(False)
+
+        self.resume_button = DynamicButton("Resume", self)
+        self.resume_button.clicked.connect(self.resume)
+        self.resume_button.setEnabled(self.game.resumable() is not None)
+
         button_layout.addWidget(self.start_button, 10)
         button_layout.addStretch(1)
         button_layout.addWidget(self.rand_button, 10)
+        button_layout.addStretch(1)
+        button_layout.addWidget(self.pack_button, 10)
+        button_layout.addStretch(1)
+        button_layout.addWidget(self.resume_button, 10)
 
         select_layout.addStretch(5)
         select_layout.addWidget(self.gameid_label, 40)
@@ -163,6 +176,10 @@ class Welcome(StartWidget):
             QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum
         )
 
+        self.prefetch_label = DynamicLabel("", lambda: self.height() * 0.03, self)
+        self.prefetch_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.prefetch_label.setStyleSheet("QLabel { color : grey}")
+
         self.quit_button = DynamicButton("Quit", self)
         self.quit_button.clicked.connect(self.game.close)
 
@@ -172,12 +189,17 @@ class Welcome(StartWidget):
         self.settings_button = DynamicButton("Settings", self)
         self.settings_button.clicked.connect(self.show_settings)
 
+        self.history_button = DynamicButton("Leaderboard", self)
+        self.history_button.clicked.connect(self.show_history)
+
         footer_layout = QHBoxLayout()
         footer_layout.addStretch(5)
         footer_layout.addWidget(self.quit_button, 3)
         footer_layout.addStretch(1)
         footer_layout.addWidget(self.help_button, 3)
         footer_layout.addStretch(1)
+        footer_layout.addWidget(self.history_button, 3)
+        footer_layout.addStretch(1)
         footer_layout.addWidget(self.settings_button, 3)
         footer_layout.addStretch(5)
 
@@ -189,14 +211,19 @@ class Welcome(StartWidget):
         main_layout.addLayout(select_layout, 5)
         main_layout.addStretch(1)
         main_layout.addWidget(self.summary_label, 5)
+        main_layout.addWidget(self.prefetch_label, 1)
         main_layout.addLayout(footer_layout, 3)
         main_layout.addStretch(3)
 
         self.gameid_trigger.connect(self.set_gameid)
         self.summary_trigger.connect(self.set_summary)
+        self.game.prefetcher.progress.connect(self.set_prefetch_progress)
 
         self.setLayout(main_layout)
 
+        if self.game.resumable() is not None:
+            self.summary_label.setText(self.game.resumable().summary())
+
         self.show()
 
     def show_help(self):
@@ -215,6 +242,11 @@ class Welcome(StartWidget):
         settings_menu = SettingsMenu(self)
         settings_menu.exec()
 
+    def show_history(self):
+        logging.info("Showing leaderboard")
+        history_box = HistoryBox(self.game.history, self)
+        history_box.exec()
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
 
@@ -234,6 +266,8 @@ class Welcome(StartWidget):
             else:
                 time.sleep(0.25)
 
+        self.game.prefetch()
+
         self.gameid_trigger.emit(str(game_id))
         self.summary_trigger.emit(self.game.data.date + "\n" + self.game.data.comments)
 
@@ -243,10 +277,11 @@ class Welcome(StartWidget):
         t.start()
 
     def __show_summary(self):
-        game_id = self.textbox.text()
+        game_id = self.textbox.text().strip().strip('"')
         try:
             self.game.data = get_game(game_id)
             if self.game.valid_game():
+                self.game.prefetch()
                 self.summary_trigger.emit(
                     self.game.data.date + "\n" + self.game.data.comments
                 )
@@ -261,6 +296,14 @@ class Welcome(StartWidget):
     def set_summary(self, text):
         self.summary_label.setText(text)
 
+    def set_prefetch_progress(self, done, total):
+        if total == 0:
+            self.prefetch_label.setText("")
+        elif done < total:
+            self.prefetch_label.setText(f"Loading images: {done}/{total}")
+        else:
+            self.prefetch_label.setText(f"All {total} images loaded")
+
     def set_gameid(self, text):
         self.textbox.setText(text)
 
@@ -276,6 +319,33 @@ class Welcome(StartWidget):
             self.start_button.setEnabled(True)
         else:
             self.start_button.setEnabled(False)
+        self.pack_button.setEnabled(self.game.valid_game())
+        self.resume_button.setEnabled(self.game.resumable() is not None)
+
+    def resume(self, checked):
+        logging.info("resuming the last game")
+        self.game.resume_game()
+
+    def __save_pack(self, data, path):
+        try:
+            write_pack(data, path)
+            self.summary_trigger.emit(f"Saved game pack to {os.path.basename(path)}")
+        except Exception:
+            logging.error(f"Cannot save game pack {path}", exc_info=True)
+            self.summary_trigger.emit("Cannot save game pack")
+
+    def save_pack(self, checked):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save game pack", "", f"JParty game pack (*{PACK_EXTENSION})"
+        )
+        if path == "":
+            return
+        if not path.lower().endswith(PACK_EXTENSION):
+            path += PACK_EXTENSION
+
+        self.summary_trigger.emit("Saving pack...")
+        t = Thread(target=self.__save_pack, args=(self.game.data, path))
+        t.start()
 
     def restart(self):
         self.show_summary(self)
@@ -318,11 +388,17 @@ class QRWidget(StartWidget):
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        self.qrlabel.setPixmap(
-            qrcode.make(
-                self.url, image_factory=Image, box_size=max(self.height() / 50, 1)
-            ).pixmap()
-        )
+        # whole pixels per module, so the code stays sharp
+        image = qr_image(self.url)
+        box_size = max(self.height() // 50, 1)
+        if self.qrlabel.pixmap().width() != image.width() * box_size:
+            self.qrlabel.setPixmap(
+                QPixmap.fromImage(image).scaled(
+                    image.width() * box_size,
+                    image.height() * box_size,
+                    transformMode=Qt.TransformationMode.FastTransformation,
+                )
+            )
 
     def restart(self):
         pass
@@ -331,22 +407,19 @@ class SettingsMenu(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        # Read the current theme from the configuration file
-        with open('config.json', 'r') as f:
-            config = json.load(f)
-
-        current_theme = config.get('theme', DEFAULT_CONFIG['theme'])
-        current_showtextwithimages = config.get('showtextwithimages', DEFAULT_CONFIG['showtextwithimages'])
-        current_earlybuzztimeout = config.get('earlybuzztimeout', DEFAULT_CONFIG['earlybuzztimeout'])
-        current_allownegative = config.get('allownegative', DEFAULT_CONFIG['allownegative'])
-        current_allownegativeinfinal = config.get('allownegativeinfinal', DEFAULT_CONFIG['allownegativeinfinal'])
+        current_theme = config().get('theme')
+        current_showtextwithimages = config().get('showtextwithimages')
+        current_earlybuzztimeout = config().get('earlybuzztimeout')
+        current_allownegative = config().get('allownegative')
+        current_allownegativeinfinal = config().get('allownegativeinfinal')
+        current_mediacachesize = config().get('mediacachesize')
 
         self.setWindowTitle("Settings")
-        self.setFixedSize(400, 400)
+        self.setFixedSize(400, 480)
         layout = QVBoxLayout()
 
-        # Add info about theme change auto-restarting the game
-        settings_info = QLabel("Theme change auto-restarts the game.", self)
+        # Add info about theme changes applying immediately
+        settings_info = QLabel("Theme changes apply immediately.", self)
         settings_info.setAlignment(Qt.AlignmentFlag.AlignCenter)
         settings_info.setFixedWidth(self.width())
         palette = settings_info.palette()
@@ -359,11 +432,7 @@ class SettingsMenu(QDialog):
 
         # Add a combo box for theme selection
         self.theme_combobox = QComboBox(self)
-        self.theme_combobox.addItem("Default")
-        self.theme_combobox.addItem("Christmas")
-        self.theme_combobox.addItem("Halloween")
-        self.theme_combobox.addItem("EightiesSynthwave")
-        self.theme_combobox.addItem("BibleBonkers")
+        self.theme_combobox.addItems(THEMES)
         self.theme_combobox.setCurrentText(current_theme)
 
         # Set the font to bold and text color to white
@@ -481,6 +550,25 @@ class SettingsMenu(QDialog):
         allownegativeinfinal_layout.addWidget(allownegativeinfinal_label)
         allownegativeinfinal_layout.addWidget(self.allownegativeinfinal_combobox)
 
+        # Add a label for the "mediacachesize" section
+        mediacachesize_label = QLabel("Media cache size (MB):", self)
+
+        self.mediacachesize_spinbox = QSpinBox(self)
+        self.mediacachesize_spinbox.setRange(MIN_MEDIA_CACHE_SIZE, MAX_MEDIA_CACHE_SIZE)
+        self.mediacachesize_spinbox.setValue(int(current_mediacachesize))
+
+        font = self.mediacachesize_spinbox.font()
+        font.setBold(True)
+        self.mediacachesize_spinbox.setFont(font)
+
+        self.mediacache_button = QPushButton("Stats", self)
+        self.mediacache_button.clicked.connect(self.show_cache_stats)
+
+        mediacachesize_layout = QHBoxLayout()
+        mediacachesize_layout.addWidget(mediacachesize_label)
+        mediacachesize_layout.addWidget(self.mediacachesize_spinbox)
+        mediacachesize_layout.addWidget(self.mediacache_button)
+
         # Add the horizontal layouts to the main layout
         layout.addLayout(settings_info_layout)
         layout.addSpacing(20)
@@ -489,6 +577,7 @@ class SettingsMenu(QDialog):
         layout.addLayout(earlybuzztimeout_layout)
         layout.addLayout(allownegative_layout)
         layout.addLayout(allownegativeinfinal_layout)
+        layout.addLayout(mediacachesize_layout)
 
         # Add space before the Apply button
         layout.addSpacing(10)
@@ -514,19 +603,14 @@ class SettingsMenu(QDialog):
 
         self.setLayout(layout)
 
+    def show_cache_stats(self):
+        cache_stats = CacheStatsBox(self)
+        cache_stats.exec()
+
     def save_settings(self):
         logging.info("save_settings method called")  # Debugging line
-        new_settings = {}
-        requires_restart = False
-
-        with open('config.json', 'r') as f:
-            config = json.load(f)
-        
-        # Theme setting
-        old_theme = config.get('theme', 'default')
-        theme = self.theme_combobox.currentText()
-        if theme != old_theme:
-            requires_restart = True
+        # Theme setting, applied by the theme registry as soon as it is saved
+        theme_name = self.theme_combobox.currentText()
 
         # Show text with images setting
         showtextwithimages = self.showtextwithimages_combobox.currentText()
@@ -540,18 +624,17 @@ class SettingsMenu(QDialog):
         # Show allow negative in final setting
         allownegativeinfinal = self.allownegativeinfinal_combobox.currentText()
 
+        # Media cache size setting
+        mediacachesize = self.mediacachesize_spinbox.value()
+
         # Save config
         logging.info("Saving settings...")
-        with open('config.json', 'w') as f:
-            json.dump({
-                'theme': theme,
-                'showtextwithimages': showtextwithimages,
-                'earlybuzztimeout': earlybuzztimeout,
-                'allownegative': allownegative,
-                'allownegativeinfinal': allownegativeinfinal
-            }, f)
-
-        if requires_restart:
-            # Restart the application
-            os.execv(sys.executable, ['python'] + sys.argv)
+        config().update(
+            theme=theme_name,
+            showtextwithimages=showtextwithimages,
+            earlybuzztimeout=earlybuzztimeout,
+            allownegative=allownegative,
+            allownegativeinfinal=allownegativeinfinal,
+            mediacachesize=mediacachesize,
+        )
         self.accept()  # Close the dialog
\ No newline at end of file
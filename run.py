@@ -1,19 +1,25 @@
-from jparty.main import main
-import time
-import os
-import json
-import subprocess
-import signal
-from jparty.constants import DEFAULT_CONFIG
-
-# Check if config.json exists
-if not os.path.exists('config.json'):
-    # If not, create it with a default settings
-    with open('config.json', 'w') as f:
-        data = DEFAULT_CONFIG
-        json.dump(data, f)
+import multiprocessing
 
 if __name__ == "__main__":
+    # media ingest runs in worker processes, which frozen builds must bootstrap. Spawned
+    # workers import this file too, so everything else is imported only when run
+    multiprocessing.freeze_support()
+
+    import time
+    import os
+    import json
+    import subprocess
+    import signal
+    from jparty.main import main
+    from jparty.constants import DEFAULT_CONFIG
+
+    # Check if config.json exists
+    if not os.path.exists('config.json'):
+        # If not, create it with a default settings
+        with open('config.json', 'w') as f:
+            data = DEFAULT_CONFIG
+            json.dump(data, f)
+
     print(os.getcwd())
     # Start the process and get the process object
     process = subprocess.Popen(["python", "..\\physicalbuzzers\\physicalbuzzers.py"])
@@ -28,4 +34,4 @@ if __name__ == "__main__":
             process.wait(timeout=0.2)
         except subprocess.TimeoutExpired:
             # Force kill if process did not terminate
-            os.kill(process.pid, signal.SIGKILL)
\ No newline at end of file
+            os.kill(process.pid, signal.SIGKILL)
@@ -0,0 +1,39 @@
+import os
+
+from jparty.archive import ClueIndex, build_game, parse_query
+from jparty.gamepack import write_pack
+from jparty.constants import PACK_EXTENSION
+
+from tests.test_engine import make_data
+
+GAMES = 5
+
+
+def archive(directory):
+    for n in range(GAMES):
+        data = make_data()
+        data.rounds[0].get_question(0, 0).image_link = f"http://example.com/{n}.jpg"
+        data.rounds[1].get_question(0, 0).video_link = f"http://example.com/{n}.mp4"
+        write_pack(data, os.path.join(directory, f"game{n}{PACK_EXTENSION}"), include_media=False)
+    index = ClueIndex(directory)
+    index.refresh()
+    return index
+
+
+def test_media_clue(tmp_path):
+    index = archive(tmp_path)
+    image = index.texts.index("clue 0 0")  # the first game's first round
+    q = index.question(image, (2, 3), 800)
+    assert (q.image_link, q.video_link) == ("http://example.com/0.jpg", None)
+    video = index.texts.index("clue 0 0", image + 1)  # and its second
+    assert index.question(video, (0, 0), 400).video_link == "http://example.com/0.mp4"
+
+
+def test_build_game_in_value_range(tmp_path):
+    index = archive(tmp_path)
+    for query in ("value:200-1000", "value:400-1200", "value:2000"):
+        data = build_game(index, query, **parse_query(query))
+        assert data is not None, query
+        assert all(board.complete() for board in data.rounds)
+
+    assert build_game(index, "value:5000", **parse_query("value:5000")) is None
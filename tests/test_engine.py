@@ -0,0 +1,256 @@
+import pytest
+
+from jparty.engine import (
+    Engine,
+    ManualClock,
+    Question,
+    Board,
+    FinalBoard,
+    GameData,
+    Player,
+    LIGHTS_TIMED_OUT,
+    KEY_LEFT,
+    KEY_RIGHT,
+    KEY_SPACE,
+    KEY_F5,
+)
+from jparty.constants import MONIES, QUESTIONTIME, FJTIME, DEFAULT_CONFIG
+
+DD = {0: (5, 4), 1: (5, 4)}  # the Daily Double of each round, out of the way of the clues played
+
+
+def make_data():
+    rounds = []
+    for r in range(2):
+        questions = [
+            Question((c, row), f"clue {c} {row}", f"answer {c} {row}", f"CATEGORY {c}",
+                     value=MONIES[r][row], dd=(c, row) == DD[r])
+            for c in range(6)
+            for row in range(5)
+        ]
+        rounds.append(Board([f"CATEGORY {c}" for c in range(6)], questions, dj=r == 1))
+    final = Question((0, 0), "final clue", "final answer", "FINAL CATEGORY")
+    rounds.append(FinalBoard("FINAL CATEGORY", final))
+    return GameData(rounds, "January 1, 2000", "test")
+
+
+class Game(object):
+    """an engine on a ManualClock, with three players and the events it emitted"""
+
+    def __init__(self, subscribe=None, resume=None, **config):
+        self.clock = ManualClock()
+        self.engine = Engine(self.clock, {**DEFAULT_CONFIG, **config})
+        self.events = []
+        self.engine.subscribe(lambda name, *args: self.events.append((name, *args)))
+        if subscribe is not None:
+            subscribe(self.engine)
+        if resume is not None:
+            # pick up where the game `resume` was cut short, with the same players
+            self.players = resume.players
+            data = resume.engine.data
+            self.engine.resume(data, list(self.players), data.rounds.index(resume.engine.current_round))
+            return
+        self.players = [Player(name, None, None) for name in ("alice", "bob", "carol")]
+        self.engine.data = make_data()
+        self.engine.set_players(list(self.players))
+        self.engine.start_game()
+
+    def emitted(self, name):
+        return [args for event, *args in self.events if event == name]
+
+    def open_clue(self, i, j):
+        """pick clue (i, j), read it and open responses"""
+        q = self.engine.current_round.get_question(i, j)
+        self.engine.load_question(q)
+        self.clock.advance(2)
+        self.engine.press(KEY_SPACE)
+        return q
+
+
+@pytest.fixture
+def game():
+    return Game()
+
+
+def test_correct_answer(game):
+    engine, alice = game.engine, game.players[0]
+    q = game.open_clue(0, 1)
+    game.clock.advance(0.3)
+    engine.buzz(alice)
+    assert engine.answering_player is alice
+    engine.press(KEY_LEFT)
+
+    assert alice.score == 400
+    assert alice.stats["correct"] == 1
+    assert engine.player_in_control is alice
+    assert q.complete and engine.active_question is None
+    assert game.emitted("answer_judged") == [[alice, q, True, 400]]
+    assert game.emitted("time_buzz") == [[alice, pytest.approx(0.3), "first"]]
+
+
+@pytest.mark.parametrize("allownegative, score", [("True", -400), ("False", 0)])
+def test_incorrect_answer(allownegative, score):
+    game = Game(allownegative=allownegative)
+    engine, alice, bob = game.engine, *game.players[:2]
+    q = game.open_clue(0, 1)
+    engine.buzz(alice)
+    engine.press(KEY_RIGHT)
+
+    assert alice.score == score
+    assert alice.stats["incorrect"] == 1
+    assert game.emitted("answer_judged") == [[alice, q, False, 400]]
+    # responses open again, to everyone else
+    assert engine.accepting_responses
+    engine.buzz(alice)
+    assert engine.answering_player is None
+    engine.buzz(bob)
+    assert engine.answering_player is bob
+
+
+def test_max_dd_wager(game):
+    engine, alice = game.engine, game.players[0]
+    assert engine.max_dd_wager(alice) == 1000
+    engine.set_score(alice, 3000)
+    assert engine.max_dd_wager(alice) == 3000
+
+    engine.press(KEY_F5)
+    engine.set_score(alice, -500)
+    assert engine.max_dd_wager(alice) == 2000
+    engine.set_score(alice, 5000)
+    assert engine.max_dd_wager(alice) == 5000
+
+
+def test_daily_double(game):
+    engine, alice = game.engine, game.players[0]
+    q = engine.current_round.get_question(*DD[0])
+    engine.load_question(q)
+    assert engine.soliciting_player
+    engine.set_dd_wager(alice, engine.max_dd_wager(alice))
+    engine.press(KEY_RIGHT)
+
+    assert alice.score == -1000
+    assert q.complete and engine.active_question is None
+
+
+def test_early_buzz_lockout(game):
+    engine, alice = game.engine, game.players[0]
+    q = engine.current_round.get_question(0, 0)
+    engine.load_question(q)
+    engine.buzz(alice)  # before responses open
+    assert alice.istimedout
+    assert game.emitted("set_lights")[-1] == [alice, LIGHTS_TIMED_OUT]
+
+    engine.press(KEY_SPACE)
+    engine.buzz(alice)
+    assert engine.answering_player is None
+
+    # DEFAULT_CONFIG locks out for 500 ms
+    game.clock.advance(0.49)
+    assert alice.istimedout
+    game.clock.advance(0.02)
+    assert not alice.istimedout
+    engine.buzz(alice)
+    assert engine.answering_player is alice
+
+
+def test_timeout(game):
+    engine = game.engine
+    q = game.open_clue(0, 0)
+    game.clock.advance(QUESTIONTIME - 0.01)
+    assert engine.accepting_responses
+    game.clock.advance(0.02)
+
+    assert not engine.accepting_responses
+    assert ["stumped.wav"] in game.emitted("play_sound")
+    assert "BACK_TO_BOARD" in engine.keystroke_manager.active()
+    engine.press(KEY_SPACE)
+    assert q.complete and engine.active_question is None
+    assert game.emitted("close_clue") == [[]]
+
+
+def test_timer_paused_while_answering(game):
+    engine, alice = game.engine, game.players[0]
+    game.open_clue(0, 0)
+    game.clock.advance(1)
+    engine.buzz(alice)
+    game.clock.advance(QUESTIONTIME)  # the host takes their time
+    assert "BACK_TO_BOARD" not in engine.keystroke_manager.active()
+    engine.press(KEY_RIGHT)
+    game.clock.advance(QUESTIONTIME - 1.01)
+    assert engine.accepting_responses
+    game.clock.advance(0.02)
+    assert "BACK_TO_BOARD" in engine.keystroke_manager.active()
+
+
+def test_admin_skip_round(game):
+    engine = game.engine
+    alice, bob, carol = game.players
+    engine.set_score(alice, 1000)
+    engine.set_score(carol, 400)
+
+    engine.press(KEY_F5)
+    assert engine.current_round is engine.data.rounds[1]
+    assert game.emitted("load_round") == [[engine.current_round]]
+    assert engine.player_in_control is bob  # the least money
+
+    engine.press(KEY_F5)
+    assert isinstance(engine.current_round, FinalBoard)
+    assert engine.player_in_control is None
+    assert game.emitted("wagers_opened") == [[game.players]]
+
+    engine.press(KEY_F5)  # nothing to skip to
+    assert isinstance(engine.current_round, FinalBoard)
+
+
+def play_final(game, scores, wagers, correct):
+    """play Final Jeopardy from `scores`; the order the players were judged in and the winners"""
+    engine = game.engine
+    for player, score in zip(game.players, scores):
+        engine.set_score(player, score)
+    engine.press(KEY_F5)
+    engine.press(KEY_F5)
+
+    for player, wager in zip(game.players, wagers):
+        assert "OPEN_FINAL" not in engine.keystroke_manager.active()
+        engine.wager(player, wager)
+    engine.press(KEY_SPACE)  # the clue
+    engine.press(KEY_SPACE)  # responses
+    for player in game.players:
+        engine.answer(player, "what is something")
+    game.clock.advance(FJTIME)
+    assert game.emitted("too_late") == [[]]
+
+    judged = []
+    for _ in game.players:
+        engine.press(KEY_SPACE)  # next player
+        judged.append(engine.answering_player)
+        engine.press(KEY_SPACE)  # their answer
+        engine.press(KEY_LEFT if correct[game.players.index(engine.answering_player)] else KEY_RIGHT)
+    engine.press(KEY_SPACE)
+    assert "CLOSE_GAME" in engine.keystroke_manager.active()
+    (winners,) = game.emitted("decide_final")[0]
+    return judged, winners
+
+
+def test_final_winner(game):
+    alice, bob, carol = game.players
+    judged, winners = play_final(game, (3000, 1000, 2000), (1000, 1000, 2000), (False, True, True))
+
+    assert judged == [bob, carol, alice]  # lowest score first
+    assert [p.score for p in game.players] == [2000, 2000, 4000]
+    assert winners == [carol]
+    assert [args[0] for args in game.emitted("final_judged")] == judged
+
+
+def test_final_tie(game):
+    judged, winners = play_final(game, (3000, 1000, 2000), (1000, 1000, 0), (False, True, True))
+
+    assert [p.score for p in game.players] == [2000, 2000, 2000]
+    assert winners == game.players
+
+
+def test_close_game(game):
+    play_final(game, (0, 0, 0), (0, 0, 0), (True, True, True))
+    game.engine.press(KEY_SPACE)
+    assert game.engine.players == [] and game.engine.data is None
+    assert game.emitted("game_closed") == [[]]
@@ -0,0 +1,75 @@
+from jparty.engine import Player, KEY_LEFT
+from jparty.history import GameHistory, identity
+
+from tests.test_engine import Game, play_final
+
+SIGNATURES = ["data:image/png;base64,iVBORw0KGgo" + "A" * n for n in range(1, 4)]
+
+
+def play(path, names, colors, scores):
+    histories = []
+    game = Game(lambda engine: histories.append(GameHistory(engine, path, flush_interval=0)))
+    (history,) = histories
+    for player, name, color in zip(game.players, names, colors):
+        player.name, player.buzzercolor = name, color
+    play_final(game, scores, (0, 0, 0), (True, True, True))
+    history.close()
+    return history
+
+
+def test_identity():
+    signed = [Player(name, "#ff0000", None) for name in SIGNATURES[:2]]
+    assert identity(signed[0]) == identity(signed[1])
+    assert identity(Player(SIGNATURES[0], "#00ff00", None)) != identity(signed[0])
+
+    typed = [Player("Alice ", None, None), Player("alice", "#ff0000", None)]
+    assert identity(typed[0]) == identity(typed[1])
+    assert identity(Player("bob", None, None)) != identity(typed[0])
+
+
+def test_signing_player_has_one_row(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    colors = ("#ff0000", "#00ff00", None)
+    play(path, (SIGNATURES[0], "bob", "carol"), colors, (3000, 1000, 2000))
+    history = play(path, (SIGNATURES[1], "Bob", "carol"), colors, (1000, 3000, 2000))
+
+    board = history.leaderboard()
+    assert len(board) == 3
+    signer = next(row for row in board if row["color"] == "#ff0000")
+    assert signer["name"] == SIGNATURES[1]
+    assert (signer["games"], signer["wins"], signer["total"]) == (2, 1, 4000)
+    assert [g["score"] for g in history.player_games(signer["id"])] == [1000, 3000]
+
+
+def test_resumed_game_is_one_game(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    histories = []
+
+    def record(engine):
+        histories.append(GameHistory(engine, path, flush_interval=0))
+
+    cut = Game(record)
+    alice = cut.players[0]
+    cut.open_clue(0, 0)
+    cut.engine.buzz(alice)
+    cut.engine.press(KEY_LEFT)
+    histories[-1].close()  # JParty crashes
+
+    def resume(engine):
+        record(engine)
+        histories[-1].resume()
+
+    resumed = Game(resume, resume=cut)
+    resumed.open_clue(0, 1)
+    resumed.engine.buzz(alice)
+    resumed.engine.press(KEY_LEFT)
+    play_final(resumed, (600, 0, 0), (0, 0, 0), (True, True, True))
+    history = histories[-1]
+    history.close()
+
+    board = history.leaderboard()
+    assert len(board) == 3
+    row = next(row for row in board if row["name"] == "alice")
+    assert (row["games"], row["wins"], row["correct"], row["revenue"]) == (1, 1, 3, 600)
+    (game,) = history.player_games(row["id"])
+    assert (game["score"], game["correct"]) == (600, 3)